@@ -60,8 +60,15 @@ export async function put<T extends keyof PutAPIInputs>(
 interface GetAPIParams {
   balance_sheet: FiltersConversionInterval;
   account_report: FiltersConversionInterval & { a: string; r: string };
+  account_journal: Filters & {
+    a: string;
+    offset?: string;
+    limit?: string;
+    date?: string;
+  };
   changed: undefined;
   commodities: Filters;
+  completions: { kind: CompletionKind; prefix: string; limit?: string };
   context: { entry_hash: string };
   documents: Filters;
   errors: undefined;
@@ -101,6 +108,25 @@ export async function get<T extends keyof GetAPIParams>(
   throw new InvalidResponseDataError(res.error);
 }
 
+/** The kinds of attributes that can be completed by the server. */
+export type CompletionKind = "accounts" | "payees" | "tags" | "links";
+
+/**
+ * Complete a prefix of an account, payee, tag or link.
+ *
+ * The ledger data only contains the highest ranked payees, tags and links,
+ * so the server is asked for completions to find the others.
+ * @param kind - the kind of attribute to complete.
+ * @param prefix - the prefix of (a word of) the attribute.
+ * @returns the highest ranked completions.
+ */
+export async function complete(
+  kind: CompletionKind,
+  prefix: string,
+): Promise<readonly string[]> {
+  return get("completions", { kind, prefix });
+}
+
 interface DeleteAPIParams {
   document: { filename: string };
   source_slice: { entry_hash: string; sha256sum: string };
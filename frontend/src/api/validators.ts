@@ -175,12 +175,22 @@ export const getAPIValidators = {
   account_report: object({
     charts: unknown,
     journal: optional(string),
+    offset: optional(number),
+    limit: optional(number),
+    total: optional(number),
     dates: optional(array(date_range)),
     interval_balances: optional(array(account_hierarchy_validator)),
     budgets: optional(record(array(account_budget))),
   }),
+  account_journal: object({
+    journal: string,
+    offset: number,
+    limit: number,
+    total: number,
+  }),
   changed: boolean,
   commodities,
+  completions: array(string),
   context,
   documents: array(Document.validator),
   errors: array(error_validator),
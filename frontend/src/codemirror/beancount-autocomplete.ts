@@ -6,6 +6,8 @@ import type {
 import { syntaxTree } from "@codemirror/language";
 import { get as store_get } from "svelte/store";
 
+import type { CompletionKind } from "../api";
+import { complete } from "../api";
 import { accounts, currencies, links, payees, tags } from "../stores";
 import { beancountSnippets } from "./beancount-snippets";
 
@@ -35,11 +37,34 @@ const res = (s: readonly string[], from: number): CompletionResult => ({
   from,
 });
 
-export const beancountCompletion: CompletionSource = (context) => {
+/**
+ * Add the completions of the server for a prefix to the given strings.
+ *
+ * The ledger data only contains the highest ranked payees, tags and links.
+ */
+async function withCompletions(
+  s: readonly string[],
+  kind: CompletionKind,
+  prefix: string,
+): Promise<readonly string[]> {
+  if (!prefix) {
+    return s;
+  }
+  try {
+    const completions = await complete(kind, prefix);
+    return [...new Set([...s, ...completions])];
+  } catch {
+    return s;
+  }
+}
+
+export const beancountCompletion: CompletionSource = async (context) => {
   const tag = context.matchBefore(/#[A-Za-z0-9\-_/.]*/);
   if (tag) {
     return {
-      options: opts(store_get(tags)),
+      options: opts(
+        await withCompletions(store_get(tags), "tags", tag.text.slice(1)),
+      ),
       from: tag.from + 1,
       validFor: /\S+/,
     };
@@ -48,7 +73,9 @@ export const beancountCompletion: CompletionSource = (context) => {
   const link = context.matchBefore(/\^[A-Za-z0-9\-_/.]*/);
   if (link) {
     return {
-      options: opts(store_get(links)),
+      options: opts(
+        await withCompletions(store_get(links), "links", link.text.slice(1)),
+      ),
       from: link.from + 1,
       validFor: /\S+/,
     };
@@ -99,7 +126,11 @@ export const beancountCompletion: CompletionSource = (context) => {
 
   // complete payee after transaction flag.
   if (match("string", "flag")) {
-    return res(store_get(payees), before.from + 1);
+    const prefix = context.state.sliceDoc(before.from + 1, context.pos);
+    return res(
+      await withCompletions(store_get(payees), "payees", prefix),
+      before.from + 1,
+    );
   }
 
   // complete directive names after a date.
@@ -29,10 +29,13 @@ import { ledgerDataValidator } from "./api/validators";
 import { CopyableText } from "./clipboard";
 import { BeancountTextarea } from "./codemirror/setup";
 import { handleExtensionPageLoad } from "./extensions";
+import { urlForRaw } from "./helpers";
 import { _ } from "./i18n";
 import { FavaJournal } from "./journal";
 import { initGlobalKeyboardShortcuts } from "./keyboard-shortcuts";
 import { getScriptTagValue } from "./lib/dom";
+import { parseJSON } from "./lib/json";
+import { number, object, string } from "./lib/validation";
 import { log_error } from "./log";
 import { notify, notify_err } from "./notifications";
 import { frontend_routes } from "./reports/routes";
@@ -42,7 +45,7 @@ import { has_changes, updatePageTitle } from "./sidebar/page-title";
 import { SortableTable } from "./sort/sortable-table";
 import { errors, ledgerData } from "./stores";
 import { auto_reload } from "./stores/fava_options";
-import { ledger_mtime, read_mtime } from "./stores/mtime";
+import { ledger_mtime, read_mtime, set_mtime } from "./stores/mtime";
 import { SvelteCustomElement } from "./svelte-custom-elements";
 import { TreeTableCustomElement } from "./tree-table/tree-table-custom-element";
 
@@ -104,6 +107,38 @@ function pollForChanges(): void {
   get("changed").catch(log_error);
 }
 
+const changeEventValidator = object({ generation: number, mtime: string });
+
+/**
+ * Listen to the `changes` Server-Sent Events endpoint.
+ *
+ * The server pushes an event with the generation and mtime of the ledger whenever a
+ * new generation has been loaded, which fires the same events as the updates of the
+ * mtime by polling. If the browser does not support Server-Sent Events or the server
+ * refuses the stream (it only allows a limited number of them), poll for changes.
+ */
+function listenForChanges(): void {
+  if (typeof EventSource === "undefined") {
+    setInterval(pollForChanges, 5000);
+    return;
+  }
+  const source = new EventSource(store_get(urlForRaw)("api/changes"));
+  source.addEventListener("changed", (event: MessageEvent<string>) => {
+    const res = parseJSON(event.data).and_then(changeEventValidator);
+    if (res.is_ok) {
+      set_mtime(res.value.mtime);
+    } else {
+      log_error(res.error);
+    }
+  });
+  source.addEventListener("error", () => {
+    // The browser reconnects on its own unless the connection failed.
+    if (source.readyState === EventSource.CLOSED) {
+      setInterval(pollForChanges, 5000);
+    }
+  });
+}
+
 function init(): void {
   const initial = getScriptTagValue("#ledger-data", ledgerDataValidator);
   if (initial.is_ok) {
@@ -129,7 +164,7 @@ function init(): void {
   initSidebar();
   initGlobalKeyboardShortcuts();
   defineCustomElements();
-  setInterval(pollForChanges, 5000);
+  listenForChanges();
 
   ledgerData.subscribe((val) => {
     errors.set(val.errors);
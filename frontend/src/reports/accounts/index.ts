@@ -16,6 +16,9 @@ export interface AccountReportProps {
   report_type: AccountReportType;
   charts: unknown;
   journal: string | null;
+  offset: number | null;
+  limit: number | null;
+  total: number | null;
   interval_balances: AccountTreeNode[] | null;
   dates: { begin: Date; end: Date }[] | null;
   budgets: Record<string, AccountBudget[]> | null;
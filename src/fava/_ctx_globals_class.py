@@ -26,6 +26,8 @@ class Context:
     ledger: FavaLedger
     #: The current extension, if this is an extension endpoint
     extension: FavaExtensionBase | None
+    #: The start time of the request (for the request duration metrics)
+    request_start: float
 
     @cached_property
     def conversion(self) -> str:
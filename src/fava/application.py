@@ -14,6 +14,8 @@ from __future__ import annotations
 
 import logging
 import mimetypes
+import os
+import time
 from datetime import date
 
 from fava.pqc.proxy_awareness import get_pqc_status_from_config
@@ -23,11 +25,17 @@ from fava.pqc.configuration_validator import detect_available_python_pqc_kems
 from fava.pqc.app_startup import initialize_backend_crypto_service # Added for PQC
 from fava.pqc.exceptions import ApplicationStartupError as PQCApplicationStartupError # Added for PQC
 from datetime import datetime
+from concurrent.futures import as_completed
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timezone
 from functools import lru_cache
 from io import BytesIO
+from multiprocessing import get_context
 from pathlib import Path
+from threading import BoundedSemaphore
+from threading import Condition
 from threading import Lock
+from threading import Thread
 from typing import TYPE_CHECKING
 from urllib.parse import parse_qsl
 from urllib.parse import urlencode
@@ -55,16 +63,23 @@ from fava import LOCALES
 from fava import template_filters
 from fava._ctx_globals_class import Context
 from fava.beans import funcs
+from fava.beans.load import load_ledger_file
 from fava.context import g
 from fava.core import conversion
 from fava.core import FavaLedger
+from fava.core.ledger_main import DEFAULT_FILTER_CACHE_SIZE
 from fava.core.charts import FavaJSONProvider
 from fava.core.documents import is_document_or_import_file
+from fava.core.reload import BackgroundReloader
+from fava.core.watcher import WatchfilesWatcher
 from fava.help import HELP_PAGES
 from fava.helpers import FavaAPIError
 from fava.internal_api import ChartApi
 from fava.internal_api import get_ledger_data
+from fava.json_api import DEFAULT_MAX_CHANGE_STREAMS
 from fava.json_api import json_api
+from fava.metrics import metrics_text
+from fava.metrics import record_request
 from fava.util import next_key
 from fava.util import send_file_inline
 from fava.util import setup_logging
@@ -72,12 +87,15 @@ from fava.util import slugify
 from fava.util.excel import HAVE_EXCEL
 
 if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
     from collections.abc import ItemsView
     from collections.abc import Iterable
 
     from flask.wrappers import Response
     from werkzeug import Response as WerkzeugResponse
 
+    from fava.beans.types import LoaderResult
+
 
 setup_logging()
 
@@ -128,63 +146,242 @@ class _LedgerSlugLoader:
         *,
         load: bool = False,
         poll_watcher: bool = False,
+        watch_files: bool = False,
+        cache_dir: str | None = None,
+        background_reload: bool = False,
+        parallel_load: bool = False,
+        filter_cache_size: int | None = None,
+        reload_quiet_window: float = 0.0,
     ) -> None:
         self.fava_app = fava_app
         self.poll_watcher = poll_watcher
+        self.watch_files = watch_files
+        self.reload_quiet_window = reload_quiet_window
+        self.cache_dir = cache_dir
+        self.parallel_load = parallel_load
+        self.filter_cache_size = filter_cache_size
+        self.reloader = (
+            BackgroundReloader(self._swap) if background_reload else None
+        )
 
         self._lock = Lock()
+        self._loaded = Condition(self._lock)
 
         # The loaded ledgers - lazily loaded unless load=True
-        self._ledgers = None
+        self._ledgers: list[FavaLedger] | None = None
+        # For parallel loading, the ledgers that have already been loaded
+        self._slots: list[FavaLedger | None] | None = None
+        # For parallel loading, the error if loading a ledger failed
+        self._load_error: Exception | None = None
         # The titles of the ledgers - used to check whether the ledgers_by_slug
         # below needs to be re-computed
         self._titles: list[str] | None = None
-        # Cache the dict of ledgers by their slugs
+        # Cache the dict of ledgers by their slugs (and the list it is for)
         self._ledgers_by_slug: dict[str, FavaLedger] | None = None
+        self._ledgers_by_slug_for: list[FavaLedger] | None = None
 
         if load:
-            with self._lock:
-                self._ledgers = self._load()
+            _ = self.ledgers
+
+    def _ledger(
+        self, path: str, preloaded: LoaderResult | None = None
+    ) -> FavaLedger:
+        return FavaLedger(
+            path,
+            poll_watcher=(
+                WatchfilesWatcher(quiet_window=self.reload_quiet_window)
+                if self.watch_files and not self.poll_watcher
+                else None
+            ),
+            cache_dir=self.cache_dir,
+            reloader=self.reloader,
+            preloaded=preloaded,
+            filter_cache_size=(
+                self.filter_cache_size
+                if self.filter_cache_size is not None
+                else DEFAULT_FILTER_CACHE_SIZE
+            ),
+            reload_quiet_window=self.reload_quiet_window,
+        )
+
+    def _start_loading(self) -> None:
+        """Start loading the ledgers (must hold the lock)."""
+        if self._ledgers is not None or self._slots is not None:
+            return
+        files = self.fava_app.config["BEANCOUNT_FILES"]
+        if not self.parallel_load or len(files) < 2:  # noqa: PLR2004
+            self._ledgers = [self._ledger(path) for path in files]
+            return
+        self._slots = [None] * len(files)
+        Thread(
+            target=self._load_parallel,
+            args=(files,),
+            name="fava-load",
+            daemon=True,
+        ).start()
+
+    def _load_parallel(self, files: list[str]) -> None:
+        """Parse the ledgers in a process pool.
+
+        The ledgers are added as soon as each one is finished, so requests
+        for one ledger do not have to wait for all other ones. If creating
+        a ledger fails, the error is raised to the waiting requests.
+        """
+        start = time.perf_counter()
+        try:
+            self._load_in_workers(files)
+        except Exception as error:
+            log.exception("Loading the ledgers failed")
+            with self._loaded:
+                self._load_error = error
+                self._loaded.notify_all()
+            return
+        log.info(
+            "Loaded %s ledgers in %.3fs",
+            len(files),
+            time.perf_counter() - start,
+        )
+
+    def _load_in_workers(self, files: list[str]) -> None:
+        """Load the ledgers, loading any that the workers fail on directly."""
+        workers = min(len(files), os.cpu_count() or 1)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=get_context("spawn")
+            ) as pool:
+                futures = {
+                    pool.submit(load_ledger_file, path, self.cache_dir): index
+                    for index, path in enumerate(files)
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        preloaded = future.result()
+                    except Exception:  # noqa: BLE001
+                        log.warning(
+                            "Loading %s in a worker failed",
+                            files[index],
+                            exc_info=True,
+                        )
+                        preloaded = None
+                    ledger = self._ledger(files[index], preloaded)
+                    self._add_loaded(index, ledger)
+        finally:
+            # Load anything that is still missing directly.
+            for index, path in enumerate(files):
+                if self._slots is not None and self._slots[index] is None:
+                    self._add_loaded(index, self._ledger(path))
+
+    def _add_loaded(self, index: int, ledger: FavaLedger) -> None:
+        with self._loaded:
+            assert self._slots is not None  # noqa: S101
+            self._slots[index] = ledger
+            if all(slot is not None for slot in self._slots):
+                self._ledgers = list(self._slots)  # type: ignore[arg-type]
+            self._loaded.notify_all()
+
+    def _swap(self, old: FavaLedger, new: FavaLedger) -> None:
+        """Replace a ledger by a newly loaded generation of it."""
+        with self._lock:
+            if self._slots is not None:
+                self._slots = [
+                    new if ledger is old else ledger for ledger in self._slots
+                ]
+            if self._ledgers is None or not any(
+                ledger is old for ledger in self._ledgers
+            ):
+                return
+            self._ledgers = [
+                new if ledger is old else ledger for ledger in self._ledgers
+            ]
+
+    def _wait_for(self, predicate: Callable[[], bool]) -> None:
+        """Start loading and wait until predicate holds or all are loaded.
 
-    def _load(self) -> list[FavaLedger]:
-        return [
-            FavaLedger(path, poll_watcher=self.poll_watcher)
-            for path in self.fava_app.config["BEANCOUNT_FILES"]
-        ]
+        Raises:
+            Exception: The error of loading the ledgers in parallel if it
+                failed before the predicate held.
+        """
+        with self._lock:
+            self._start_loading()
+            self._loaded.wait_for(
+                lambda: (
+                    self._ledgers is not None
+                    or self._load_error is not None
+                    or predicate()
+                )
+            )
+            if self._ledgers is None and not predicate():
+                assert self._load_error is not None  # noqa: S101
+                raise self._load_error
 
     @property
     def ledgers(self) -> list[FavaLedger]:
         """Return the list of loaded ledgers (loading it if not yet done)."""
-        if self._ledgers is None:
-            with self._lock:
-                # avoid loading it already loaded while waiting for the lock
-                if self._ledgers is None:  # pragma: no cover
-                    self._ledgers = self._load()
-        return self._ledgers
+        ledgers = self._ledgers
+        if ledgers is None:
+            self._wait_for(lambda: False)
+            ledgers = self._ledgers
+            assert ledgers is not None  # noqa: S101
+        return ledgers
 
     @property
     def ledgers_by_slug(self) -> dict[str, FavaLedger]:
         """A dict mapping slugs to the loaded ledgers."""
         ledgers = self.ledgers
         titles = [ledger.options["title"] for ledger in ledgers]
-        if self._ledgers_by_slug is None or self._titles != titles:
-            by_slug: dict[str, FavaLedger] = {}
+        by_slug = self._ledgers_by_slug
+        if (
+            by_slug is None
+            or self._titles != titles
+            or self._ledgers_by_slug_for is not ledgers
+        ):
+            by_slug = {}
             for ledger in ledgers:
                 by_slug[next_key(_slug(ledger), by_slug)] = ledger
             self._ledgers_by_slug = by_slug
+            self._ledgers_by_slug_for = ledgers
             self._titles = titles
-        return self._ledgers_by_slug
+        return by_slug
+
+    def first(self) -> FavaLedger:
+        """Get the first ledger, without waiting for the other ones."""
+        if self._ledgers is None:
+            self._wait_for(
+                lambda: self._slots is not None and self._slots[0] is not None
+            )
+            if self._ledgers is None and self._slots is not None:
+                first = self._slots[0]
+                if first is not None:
+                    return first
+        return self.ledgers[0]
 
     def first_slug(self) -> str:
         """Get the slug of the first ledger."""
-        return _slug(self.ledgers[0])
+        return _slug(self.first())
+
+    def _loaded_by_slug(self, slug: str) -> FavaLedger | None:
+        """Get an already loaded ledger by slug while others still load."""
+        for ledger in self._slots or []:
+            if ledger is not None and _slug(ledger) == slug:
+                return ledger
+        return None
 
     def items(self) -> ItemsView[str, FavaLedger]:
         """Get an items view of all the ledgers by slug."""
         return self.ledgers_by_slug.items()
 
     def __getitem__(self, slug: str) -> FavaLedger:
-        """Get the ledger for the given slug."""
+        """Get the ledger for the given slug.
+
+        While the ledgers are loaded in parallel, this only waits until a
+        ledger with this slug has been loaded.
+        """
+        if self._ledgers is None:
+            self._wait_for(lambda: self._loaded_by_slug(slug) is not None)
+            ledger = self._loaded_by_slug(slug)
+            if ledger is not None and self._ledgers is None:
+                return ledger
         return self.ledgers_by_slug[slug]
 
 
@@ -264,6 +461,35 @@ def _setup_template_config(fava_app: Flask, *, incognito: bool) -> None:
         return {"ledger": g.ledger, "chart_api": ChartApi}
 
 
+def _setup_metrics(fava_app: Flask) -> None:
+    """Record the durations of requests and serve the metrics."""
+
+    @fava_app.before_request
+    def _start_timer() -> None:
+        g.request_start = time.perf_counter()
+
+    @fava_app.after_request
+    def _record_duration(response: Response) -> Response:
+        start = getattr(g, "request_start", None)
+        # Only record matched endpoints to keep the number of labels bounded.
+        if start is not None and request.endpoint is not None:
+            record_request(
+                request.endpoint,
+                request.method,
+                time.perf_counter() - start,
+            )
+        return response
+
+    @fava_app.route("/metrics")
+    def metrics() -> Response:
+        """Get the metrics in the Prometheus text format."""
+        ledgers: _LedgerSlugLoader = fava_app.config["LEDGERS"]
+        return fava_app.response_class(
+            metrics_text(ledgers.ledgers),
+            mimetype="text/plain; version=0.0.4",
+        )
+
+
 def _setup_filters(
     fava_app: Flask,
     *,
@@ -504,6 +730,13 @@ def create_app(
     incognito: bool = False,
     read_only: bool = False,
     poll_watcher: bool = False,
+    watch_files: bool = False,
+    cache_dir: str | None = None,
+    background_reload: bool = False,
+    parallel_load: bool = False,
+    filter_cache_size: int | None = None,
+    reload_quiet_window: float = 0.0,
+    max_change_streams: int = DEFAULT_MAX_CHANGE_STREAMS,
     assume_pqc_tls_proxy_enabled: bool = False,
     pqc_tls_embedded_server_kems: list[str] | None = None,
     verbose_logging: bool = False, # Add for PQC verbose logging
@@ -516,6 +749,20 @@ def create_app(
         incognito: Whether to run in incognito mode.
         read_only: Whether to run in read-only mode.
         poll_watcher: Whether to use old poll watcher
+        watch_files: Whether to watch the files with watchfiles, which
+            notices changes right away, instead of polling them on requests.
+        cache_dir: A directory to cache parsed ledgers in.
+        background_reload: Whether to reload changed ledgers in a
+            background thread.
+        parallel_load: Whether to load multiple ledgers in parallel in
+            worker processes.
+        filter_cache_size: The total number of filtered entries to cache
+            per ledger (0 to disable the cache).
+        reload_quiet_window: Only reload changed files once they have not
+            changed for this many seconds.
+        max_change_streams: The maximal number of concurrent streams of
+            change notifications - each one occupies a server thread, so
+            further clients have to poll for changes.
     """
     fava_app = Flask("fava")
     fava_app.register_blueprint(json_api, url_prefix="/<bfile>/api")
@@ -523,6 +770,7 @@ def create_app(
     fava_app.app_ctx_globals_class = Context  # type: ignore[assignment]
     _setup_template_config(fava_app, incognito=incognito)
     _setup_babel(fava_app)
+    _setup_metrics(fava_app)
     _setup_filters(fava_app, read_only=read_only)
     _setup_routes(fava_app)
 
@@ -530,8 +778,17 @@ def create_app(
     fava_app.config["BEANCOUNT_FILES"] = [str(f) for f in files]
     fava_app.config["INCOGNITO"] = incognito
     fava_app.config["LEDGERS"] = _LedgerSlugLoader(
-        fava_app, load=load, poll_watcher=poll_watcher
+        fava_app,
+        load=load,
+        poll_watcher=poll_watcher,
+        watch_files=watch_files,
+        cache_dir=cache_dir,
+        background_reload=background_reload,
+        parallel_load=parallel_load,
+        filter_cache_size=filter_cache_size,
+        reload_quiet_window=reload_quiet_window,
     )
+    fava_app.config["CHANGE_STREAMS"] = BoundedSemaphore(max_change_streams)
     fava_app.config["ASSUME_PQC_TLS_PROXY_ENABLED"] = assume_pqc_tls_proxy_enabled
     fava_app.config["PQC_TLS_EMBEDDED_SERVER_KEMS"] = pqc_tls_embedded_server_kems or []
     fava_app.config["PQC_TLS_EMBEDDED_SERVER_KEMS"] = pqc_tls_embedded_server_kems or []
@@ -543,8 +800,8 @@ def create_app(
     # and the path is taken from the first ledger's configuration.
     # A more sophisticated setup might involve per-ledger crypto settings or a global Fava app config for the path.
     crypto_settings_file_path = None
-    if fava_app.config["LEDGERS"].ledgers: # Check if ledgers are loaded/available
-        first_ledger = fava_app.config["LEDGERS"].ledgers[0]
+    if fava_app.config["BEANCOUNT_FILES"]: # Check if ledgers are available
+        first_ledger = fava_app.config["LEDGERS"].first()
         crypto_settings_file_path = first_ledger.fava_options.fava_crypto_settings_file
         log.info(f"PQC Crypto Settings File from FavaOptions: {crypto_settings_file_path}")
 
@@ -0,0 +1,232 @@
+"""A persistent on-disk cache for loaded Beancount ledgers."""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import importlib.util
+import logging
+import os
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import beancount
+from beancount.utils import encryption
+
+from fava import __version__ as fava_version
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable
+    from typing import Any
+
+    from fava.beans.types import LoaderResult
+
+
+log = logging.getLogger(__name__)
+
+#: Bump this if the format of the pickled data changes.
+_CACHE_FORMAT = 2
+
+
+def _versions() -> tuple[Any, ...]:
+    return (
+        _CACHE_FORMAT,
+        fava_version,
+        beancount.__version__,
+        sys.version_info[:2],
+    )
+
+
+def _file_digest(path: str) -> str | None:
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _expand_globs(patterns: Iterable[str]) -> dict[str, list[str]]:
+    """The files matching each of the include patterns."""
+    return {
+        pattern: sorted(glob.glob(pattern, recursive=True))  # noqa: PTH207
+        for pattern in patterns
+    }
+
+
+def _list_documents(filename: str, folders: Iterable[str]) -> dict[str, Any]:
+    """List the files in the documents folders (relative to the main file).
+
+    Beancount creates Document entries for these files when loading.
+    """
+    base = Path(filename).parent
+    listing: dict[str, Any] = {}
+    for folder in folders:
+        path = base / folder
+        listing[folder] = sorted(
+            str(Path(dirpath) / name)
+            for dirpath, _, filenames in os.walk(path)
+            for name in filenames
+        )
+    return listing
+
+
+def _plugin_fingerprint(plugins: list[tuple[str, Any]]) -> list[Any]:
+    """Fingerprint the plugins by their name, config and module file.
+
+    The modules are located but not imported, so a changed plugin module
+    invalidates the cache as well.
+    """
+    fingerprint: list[Any] = []
+    for name, config in plugins:
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            spec = None
+        origin = spec.origin if spec is not None else None
+        stat = None
+        if origin is not None and Path(origin).is_file():
+            stat_result = Path(origin).stat()
+            stat = (stat_result.st_mtime_ns, stat_result.st_size)
+        fingerprint.append((name, config, origin, stat))
+    return fingerprint
+
+
+def _stale_reason(filename: str, header: dict[str, Any]) -> str | None:
+    """Why the cache entry with the given header is stale, if it is."""
+    if header["versions"] != _versions():
+        return "versions changed"
+    for source, digest in header["sources"].items():
+        if _file_digest(source) != digest:
+            return f"{source} changed"
+    if _expand_globs(header["includes"]) != header["includes"]:
+        return "included files changed"
+    if _list_documents(filename, header["documents"]) != header["documents"]:
+        return "documents changed"
+    if _plugin_fingerprint(header["plugins"]) != header["plugin_fingerprint"]:
+        return "plugins changed"
+    return None
+
+
+class ParseCache:
+    """Cache the result of loading a Beancount ledger on disk.
+
+    For each main file, the loaded (booked and validated) entries, the
+    errors and the options are pickled to a file in the cache directory.
+    The cache is only used if the contents of all source files, the files
+    matched by the include patterns and in the documents folders, the
+    plugins and the Fava and Beancount versions match those of the cached
+    load.
+
+    Ledgers containing encrypted files are never cached. Only point this at
+    a directory that is not writable by others, since the cached data is
+    unpickled.
+    """
+
+    def __init__(self, cache_dir: str | Path) -> None:
+        self.cache_dir = Path(cache_dir)
+        #: The number of cache hits and misses.
+        self.hits = 0
+        self.misses = 0
+
+    def _cache_path(self, filename: str) -> Path:
+        name = hashlib.sha256(filename.encode("utf-8")).hexdigest()[:24]
+        return self.cache_dir / f"{name}.pickle"
+
+    def _miss(self, filename: str, reason: str) -> None:
+        self.misses += 1
+        log.info("Parse cache miss for %s: %s.", filename, reason)
+
+    def get(self, filename: str) -> LoaderResult | None:
+        """Get the cached result for the given main file.
+
+        Returns:
+            The entries, errors and options or None if there is no valid
+            cache entry for the file.
+        """
+        start = time.perf_counter()
+        path = self._cache_path(filename)
+        try:
+            with path.open("rb") as cache_file:
+                header = pickle.load(cache_file)  # noqa: S301
+                reason = _stale_reason(filename, header)
+                if reason is not None:
+                    self._miss(filename, reason)
+                    return None
+                result: LoaderResult = pickle.load(cache_file)  # noqa: S301
+        except FileNotFoundError:
+            self._miss(filename, "not cached yet")
+            return None
+        except Exception:  # noqa: BLE001
+            log.warning("Could not read parse cache file %s", path)
+            self._miss(filename, "invalid cache file")
+            return None
+        self.hits += 1
+        log.info(
+            "Parse cache hit for %s, loaded in %.3fs.",
+            filename,
+            time.perf_counter() - start,
+        )
+        return result
+
+    def put(
+        self,
+        filename: str,
+        result: LoaderResult,
+        *,
+        include_globs: Iterable[str] = (),
+    ) -> None:
+        """Store the result of loading the given main file.
+
+        Args:
+            filename: The main file.
+            result: The entries, errors and options of loading it.
+            include_globs: The (absolute) include patterns of all source
+                files - a file that newly matches one of them invalidates
+                the cache.
+        """
+        start = time.perf_counter()
+        _entries, _errors, options_map = result
+        sources = {}
+        for source in options_map["include"]:
+            if encryption.is_encrypted_file(source):  # pragma: no cover
+                # Never write the decrypted contents to disk.
+                return
+            digest = _file_digest(source)
+            if digest is None:
+                return
+            sources[source] = digest
+        plugins = list(options_map["plugin"])
+        header = {
+            "versions": _versions(),
+            "sources": sources,
+            "includes": _expand_globs(include_globs),
+            "documents": _list_documents(
+                filename, options_map.get("documents", [])
+            ),
+            "plugins": plugins,
+            "plugin_fingerprint": _plugin_fingerprint(plugins),
+        }
+        path = self._cache_path(filename)
+        tmp_name = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=self.cache_dir, suffix=".tmp", delete=False
+            ) as tmp:
+                tmp_name = tmp.name
+                pickle.dump(header, tmp, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(result, tmp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, path)  # noqa: PTH105
+        except Exception:  # noqa: BLE001
+            log.warning("Could not write parse cache file %s", path)
+            if tmp_name is not None:
+                Path(tmp_name).unlink(missing_ok=True)
+            return
+        log.debug(
+            "Wrote parse cache for %s in %.3fs.",
+            filename,
+            time.perf_counter() - start,
+        )
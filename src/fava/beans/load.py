@@ -2,14 +2,37 @@
 
 from __future__ import annotations
 
+import copy
+import glob
+import hashlib
+import heapq
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import NamedTuple
 from typing import TYPE_CHECKING
 
 from beancount import loader
+from beancount.core import data
+from beancount.ops import validation
+from beancount.parser import booking
+from beancount.parser import options
+from beancount.parser import parser
+from beancount.utils import encryption
+
+from fava.beans.cache import ParseCache
 
 if TYPE_CHECKING:  # pragma: no cover
+    from typing import Any
+
     from fava.beans.types import LoaderResult
 
 
+log = logging.getLogger(__name__)
+
+
 def load_string(value: str) -> LoaderResult:
     """Load a Beancoun string."""
     return loader.load_string(value)  # type: ignore[return-value]
@@ -30,3 +53,264 @@ def load_uncached(
         None,
         None,
     )
+
+
+class _ParsedSource(NamedTuple):
+    """The parse result for a single source file."""
+
+    #: SHA256 of the file contents.
+    digest: str
+    #: (mtime_ns, size) of the file when it was read, None for strings.
+    stat: tuple[int, int] | None
+    entries: list[Any]
+    errors: list[Any]
+    options_map: dict[str, Any]
+
+
+def _load_error(message: str) -> loader.LoadError:
+    return loader.LoadError(data.new_metadata("<load>", 0), message)
+
+
+def _include_pattern(path: str, include: str) -> str:
+    """The include pattern of a file, relative to its directory."""
+    if os.path.isabs(include):  # noqa: PTH117
+        return include
+    return os.path.join(os.path.dirname(path), include)  # noqa: PTH118,PTH120
+
+
+def _copy_entry(entry: Any) -> Any:
+    """Copy a parsed entry so that booking and plugins cannot change it.
+
+    The metadata dicts (and the list of postings) are copied as well, since
+    plugins commonly modify them in place.
+    """
+    postings = getattr(entry, "postings", None)
+    if postings is None:
+        return entry._replace(meta=entry.meta.copy())
+    return entry._replace(
+        meta=entry.meta.copy(),
+        postings=[
+            posting._replace(meta=posting.meta.copy())
+            if posting.meta is not None
+            else posting
+            for posting in postings
+        ],
+    )
+
+
+class IncrementalLoader:
+    """Load a Beancount ledger, only re-parsing changed source files.
+
+    The parsed (but not yet booked) directives are kept for each source
+    file. On a reload, files whose contents did not change are not parsed
+    again - the directives of the changed files are spliced into the sorted
+    list of previously parsed directives and then booking, plugins and
+    validation are run on the whole ledger as usual. Since the parsed
+    directives are reused, they are copied (with their metadata) before
+    booking, so that plugins which modify them do not change the cache.
+    """
+
+    def __init__(self) -> None:
+        self._sources: dict[str, _ParsedSource] = {}
+        self._entries: list[Any] = []
+        #: The files that had to be parsed on the last load.
+        self.reparsed: list[str] = []
+        #: The durations (in seconds) of the stages of the last load.
+        self.timings: dict[str, float] = {}
+
+    def clear(self) -> None:
+        """Drop all cached parse results."""
+        self._sources = {}
+        self._entries = []
+
+    @property
+    def include_globs(self) -> list[str]:
+        """The absolute include patterns of the files of the last load."""
+        return [
+            _include_pattern(path, include)
+            for path, result in self._sources.items()
+            for include in result.options_map["include"]
+        ]
+
+    def _parse(self, filename: str, source: str | None) -> _ParsedSource:
+        cached = self._sources.get(filename)
+        stat = None
+        if source is not None:
+            contents: str | bytes = source
+            digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        else:
+            stat_result = Path(filename).stat()
+            stat = (stat_result.st_mtime_ns, stat_result.st_size)
+            if cached is not None and cached.stat == stat:
+                return cached
+            if encryption.is_encrypted_file(filename):  # pragma: no cover
+                contents = encryption.read_encrypted_file(filename)
+                digest = hashlib.sha256(contents.encode("utf-8")).hexdigest()
+            else:
+                contents = Path(filename).read_bytes()
+                digest = hashlib.sha256(contents).hexdigest()
+        if cached is not None and cached.digest == digest:
+            return cached._replace(stat=stat)
+
+        self.reparsed.append(filename)
+        entries, errors, options_map = parser.parse_string(contents, filename)
+        return _ParsedSource(digest, stat, entries, errors, options_map)
+
+    def _parse_recursive(
+        self, filename: str, source: str | None
+    ) -> tuple[dict[str, _ParsedSource], list[Any]]:
+        """Parse the main file and all includes, reusing cached results.
+
+        This mirrors :func:`beancount.loader._parse_recursive`.
+        """
+        parsed: dict[str, _ParsedSource] = {}
+        errors: list[Any] = []
+        stack: list[tuple[str, str | None]] = [(filename, source)]
+        while stack:
+            path, path_source = stack.pop(0)
+            path = os.path.normpath(path)
+            if path in parsed:
+                msg = f'Duplicate filename parsed: "{path}"'
+                errors.append(_load_error(msg))
+                continue
+            if path_source is None and not Path(path).exists():
+                errors.append(_load_error(f'File "{path}" does not exist'))
+                continue
+            result = self._parse(path, path_source)
+            parsed[path] = result
+
+            for include in result.options_map["include"]:
+                pattern = _include_pattern(path, include)
+                matches = glob.glob(pattern, recursive=True)  # noqa: PTH207
+                if not matches:
+                    errors.append(
+                        _load_error(
+                            f'File glob "{include}" does not match any files'
+                        )
+                    )
+                stack.extend((match, None) for match in matches)
+        return parsed, errors
+
+    def _splice(self, parsed: dict[str, _ParsedSource]) -> list[Any]:
+        """Get the sorted list of parsed entries for all sources."""
+        old = self._sources
+        changed = [
+            path
+            for path, result in parsed.items()
+            if path not in old or old[path].entries is not result.entries
+        ]
+        removed = [path for path in old if path not in parsed]
+        if not old:
+            entries = [e for res in parsed.values() for e in res.entries]
+            entries.sort(key=data.entry_sortkey)
+            return entries
+        if not changed and not removed:
+            return self._entries
+
+        stale = {
+            id(entry)
+            for path in (*changed, *removed)
+            if path in old
+            for entry in old[path].entries
+        }
+        kept = [entry for entry in self._entries if id(entry) not in stale]
+        fresh = sorted(
+            (entry for path in changed for entry in parsed[path].entries),
+            key=data.entry_sortkey,
+        )
+        return list(heapq.merge(kept, fresh, key=data.entry_sortkey))
+
+    def load(self, filename: str, source: str | None = None) -> LoaderResult:
+        """Load the ledger.
+
+        Args:
+            filename: The absolute path of the main file.
+            source: The contents of the main file, if it has already been
+                read (for example after decrypting it).
+
+        Returns:
+            The entries, errors and options, just like Beancount's loader.
+        """
+        start = time.perf_counter()
+        self.reparsed = []
+        self.timings = {}
+        parsed, parse_errors = self._parse_recursive(filename, source)
+        entries = self._splice(parsed)
+        self._sources = parsed
+        self._entries = entries
+        if not parsed:
+            defaults = options.OPTIONS_DEFAULTS.copy()
+            return [], parse_errors, defaults  # type: ignore[return-value]
+
+        results = iter(parsed.values())
+        main = next(results)
+        for result in parsed.values():
+            parse_errors.extend(result.errors)
+
+        # The display context of the main file is updated in place by
+        # aggregate_options_map, so make sure to not touch the cached one.
+        options_map = copy.copy(main.options_map)
+        options_map["dcontext"] = copy.deepcopy(main.options_map["dcontext"])
+        options_map["include"] = sorted(parsed)
+        options_map = loader.aggregate_options_map(
+            options_map, [result.options_map for result in results]
+        )
+        parse_time = time.perf_counter() - start
+        self.timings["parse"] = parse_time
+
+        stage_start = time.perf_counter()
+        booked, balance_errors = booking.book(
+            [_copy_entry(entry) for entry in entries], options_map
+        )
+        parse_errors.extend(balance_errors)
+        self.timings["booking"] = time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        saved_pythonpath = list(sys.path)
+        try:
+            if "pythonpath" in options_map:
+                sys.path[0:0] = options_map["pythonpath"]
+            booked, errors = loader.run_transformations(
+                booked, parse_errors, options_map, None
+            )
+        finally:
+            sys.path[:] = saved_pythonpath
+        self.timings["plugins"] = time.perf_counter() - stage_start
+
+        stage_start = time.perf_counter()
+        errors.extend(validation.validate(booked, options_map, None, None))
+        self.timings["validation"] = time.perf_counter() - stage_start
+        options_map["input_hash"] = loader.compute_input_hash(
+            options_map["include"]
+        )
+        log.debug(
+            "Parsed %s of %s source files in %.3fs, loaded in %.3fs.",
+            len(self.reparsed),
+            len(parsed),
+            parse_time,
+            time.perf_counter() - start,
+        )
+        return booked, errors, options_map  # type: ignore[return-value]
+
+
+def load_ledger_file(
+    filename: str, cache_dir: str | None = None
+) -> LoaderResult:
+    """Load a ledger, using the parse cache in the given directory if any.
+
+    This is a plain function so that it can be run in a worker process,
+    for example to load multiple ledgers in parallel.
+    """
+    filename = str(Path(filename).absolute())
+    cache = ParseCache(cache_dir) if cache_dir is not None else None
+    if cache is not None:
+        cached = cache.get(filename)
+        if cached is not None:
+            return cached
+    incremental_loader = IncrementalLoader()
+    result = incremental_loader.load(filename)
+    if cache is not None:
+        cache.put(
+            filename, result, include_globs=incremental_loader.include_globs
+        )
+    return result
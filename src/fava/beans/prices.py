@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import datetime
 from bisect import bisect
+from bisect import bisect_left
 from collections import Counter
 from collections import defaultdict
 from decimal import Decimal
@@ -22,23 +23,11 @@ if TYPE_CHECKING:  # pragma: no cover
 ZERO = Decimal()
 ONE = Decimal(1)
 
+#: The maximum number of memoised conversion rates.
+RATE_CACHE_SIZE = 65536
 
-class DateKeyWrapper(list[datetime.date]):
-    """A class wrapping a list of prices for bisect.
-
-    This is needed before Python 3.10, which adds the key argument.
-    """
-
-    __slots__ = ("inner",)
-
-    def __init__(self, inner: list[PricePoint]) -> None:
-        self.inner = inner
-
-    def __len__(self) -> int:
-        return len(self.inner)
-
-    def __getitem__(self, k: int) -> datetime.date:  # type: ignore[override]
-        return self.inner[k][0]
+_SAME_CURRENCY = (ONE,)
+_MISSING = object()
 
 
 def _keep_last_per_day(
@@ -69,6 +58,13 @@ class FavaPriceMap:
     for each currency pair and then merges the inverse rates. We just create
     both the lists in tandem and count the directions that prices occur in.
 
+    For each pair, the dates and the rates are also kept in separate lists,
+    so looking up a price is a bisection of a list of dates. The rates
+    used to convert between two currencies (directly or through the cost
+    currency) are memoised per date, since the same conversions are done
+    for many positions and tree nodes. The rates needed for a series of
+    dates (like for a chart) can be looked up in one batch beforehand.
+
     Args:
         price_entries: A sorted list of price entries.
     """
@@ -94,6 +90,16 @@ class FavaPriceMap:
         self._map = {
             k: list(_keep_last_per_day(rates)) for k, rates in raw_map.items()
         }
+        self._dates = {
+            k: [date for date, _ in rates] for k, rates in self._map.items()
+        }
+        self._rates = {
+            k: [rate for _, rate in rates] for k, rates in self._map.items()
+        }
+        self._rate_cache: dict[
+            tuple[str, str, str | None, datetime.date | None],
+            tuple[Decimal, ...] | None,
+        ] = {}
 
     def commodity_pairs(
         self,
@@ -120,6 +126,30 @@ class FavaPriceMap:
         """Get all prices for the given currency pair."""
         return self._map.get(base_quote)
 
+    def slice_prices(
+        self,
+        base_quote: BaseQuote,
+        begin: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> list[PricePoint]:
+        """Get the prices for the given currency pair in a date range.
+
+        Args:
+            base_quote: The currency pair.
+            begin: Only include prices on or after this date.
+            end: Only include prices before this date.
+
+        Returns:
+            The price points - an empty list if there are none.
+        """
+        price_list = self._map.get(base_quote)
+        if price_list is None:
+            return []
+        dates = self._dates[base_quote]
+        start = bisect_left(dates, begin) if begin is not None else 0
+        stop = bisect_left(dates, end) if end is not None else len(dates)
+        return price_list[start:stop]
+
     def get_price(
         self,
         base_quote: BaseQuote,
@@ -145,7 +175,142 @@ class FavaPriceMap:
         if date is None:
             return price_list[-1]
 
-        index = bisect(DateKeyWrapper(price_list), date)
+        index = bisect(self._dates[base_quote], date)
         if index == 0:
             return (None, None)
         return price_list[index - 1]
+
+    def get_prices(
+        self,
+        pairs: Iterable[BaseQuote],
+        dates: Sequence[datetime.date | None],
+    ) -> dict[BaseQuote, list[Decimal | None]]:
+        """Get the prices of several currency pairs at several dates.
+
+        Args:
+            pairs: Currency pairs.
+            dates: The dates to get the prices at (None for the latest).
+
+        Returns:
+            For each pair, the price at each of the dates.
+        """
+        result: dict[BaseQuote, list[Decimal | None]] = {}
+        for base_quote in pairs:
+            base, quote = base_quote
+            if base == quote:
+                result[base_quote] = [ONE] * len(dates)
+                continue
+            price_dates = self._dates.get(base_quote)
+            if price_dates is None:
+                result[base_quote] = [None] * len(dates)
+                continue
+            rates = self._rates[base_quote]
+            last = rates[-1]
+            prices: list[Decimal | None] = []
+            for date in dates:
+                if date is None:
+                    prices.append(last)
+                    continue
+                index = bisect(price_dates, date)
+                prices.append(rates[index - 1] if index else None)
+            result[base_quote] = prices
+        return result
+
+    def prefetch_conversion_rates(
+        self,
+        conversions: Iterable[tuple[BaseQuote, str | None]],
+        dates: Sequence[datetime.date | None],
+    ) -> None:
+        """Memoise the conversion rates for several pairs and dates.
+
+        All the prices that are needed for rates which are not memoised
+        yet are looked up with a single call of :meth:`get_prices`, so
+        the following calls of :meth:`get_conversion_rates` for these
+        pairs and dates are cache hits.
+
+        Args:
+            conversions: Pairs of a currency pair and the currency to
+                triangulate through (or None) as for get_conversion_rates.
+            dates: The dates to convert at (None for the latest prices).
+        """
+        cache = self._rate_cache
+        missing = {
+            (base_quote, via)
+            for base_quote, via in conversions
+            if base_quote[0] != base_quote[1]
+            and any((*base_quote, via, date) not in cache for date in dates)
+        }
+        if not missing:
+            return
+        pairs: set[BaseQuote] = set()
+        for (base, quote), via in missing:
+            pairs.add((base, quote))
+            if via is not None and via != quote:
+                pairs.add((base, via))
+                pairs.add((via, quote))
+        prices = self.get_prices(pairs, dates)
+        if len(cache) + len(missing) * len(dates) > RATE_CACHE_SIZE:
+            cache.clear()
+        for (base, quote), via in missing:
+            direct = prices[base, quote]
+            if via is not None and via != quote:
+                to_via = prices[base, via]
+                from_via = prices[via, quote]
+            else:
+                to_via = from_via = [None] * len(dates)
+            for index, date in enumerate(dates):
+                price = direct[index]
+                rates: tuple[Decimal, ...] | None = None
+                if price is not None:
+                    rates = (price,)
+                else:
+                    rate1 = to_via[index]
+                    rate2 = from_via[index]
+                    if rate1 is not None and rate2 is not None:
+                        rates = (rate1, rate2)
+                cache[base, quote, via, date] = rates
+
+    def get_conversion_rates(
+        self,
+        base_quote: BaseQuote,
+        date: datetime.date | None = None,
+        via: str | None = None,
+    ) -> tuple[Decimal, ...] | None:
+        """Get the rates to convert between two currencies.
+
+        This is the price of the pair if there is one. Otherwise, if a
+        currency to go `via` is given (like the cost currency of a
+        position), it is the pair of the rates from the base currency to
+        it and from it to the quote currency. The result is memoised.
+
+        Args:
+            base_quote: The currency pair.
+            date: The date to convert at (None for the latest prices).
+            via: A currency to triangulate the rate through.
+
+        Returns:
+            The rates to multiply with (one or two) or None if there are
+            no prices to convert with.
+        """
+        base, quote = base_quote
+        if base == quote:
+            return _SAME_CURRENCY
+        key = (base, quote, via, date)
+        cache = self._rate_cache
+        cached = cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached  # type: ignore[return-value]
+        rates: tuple[Decimal, ...] | None = None
+        price = self.get_price(base_quote, date)
+        if price is not None:
+            rates = (price,)
+        elif via is not None and via != quote:
+            rate1 = self.get_price((base, via), date)
+            if rate1 is not None:
+                rate2 = self.get_price((via, quote), date)
+                if rate2 is not None:
+                    rates = (rate1, rate2)
+        if len(cache) >= RATE_CACHE_SIZE:
+            cache.clear()
+        cache[key] = rates
+        return rates
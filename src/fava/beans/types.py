@@ -30,6 +30,7 @@ class BeancountOptions(TypedDict):
     operating_currency: Sequence[str]
     documents: Sequence[str]
     include: Sequence[str]
+    plugin: Sequence[tuple[str, str | None]]
     dcontext: DisplayContext
 
 
@@ -14,9 +14,13 @@ from werkzeug.middleware.profiler import ProfilerMiddleware
 
 from fava import __version__
 from fava.application import create_app
+from fava.json_api import DEFAULT_MAX_CHANGE_STREAMS
 from fava.util import setup_debug_logging
 from fava.util import simple_wsgi
 
+#: The number of server threads for requests other than change streams.
+SERVER_THREADS = 10
+
 
 class AddressInUse(click.ClickException):  # noqa: D101
     def __init__(self, port: int) -> None:  # pragma: no cover
@@ -109,6 +113,49 @@ def cli() -> None:
 @click.option(
     "--poll-watcher", is_flag=True, help="Use old polling-based watcher."
 )
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    help="Directory to cache parsed ledgers in to speed up startup.",
+)
+@click.option(
+    "--background-reload",
+    is_flag=True,
+    help=(
+        "Reload changed files in the background and keep serving the old "
+        "data until the reload is done."
+    ),
+)
+@click.option(
+    "--parallel-load",
+    is_flag=True,
+    help="Load multiple Beancount files in parallel on startup.",
+)
+@click.option(
+    "--filter-cache-size",
+    type=click.IntRange(min=0),
+    metavar="<entries>",
+    help="Maximum number of filtered entries to cache per file (0 disables).",
+)
+@click.option(
+    "--reload-quiet-window",
+    type=click.FloatRange(min=0),
+    default=0.2,
+    show_default=True,
+    metavar="<seconds>",
+    help="Only reload changed files once they have been quiet for this long.",
+)
+@click.option(
+    "--max-change-streams",
+    type=click.IntRange(min=0),
+    default=DEFAULT_MAX_CHANGE_STREAMS,
+    show_default=True,
+    metavar="<streams>",
+    help=(
+        "Maximum number of browser tabs to push changes to, further ones "
+        "poll for changes. Each one uses a server thread."
+    ),
+)
 def start(  # noqa: PLR0913
     *,
     filenames: tuple[str, ...] = (),
@@ -121,6 +168,12 @@ def start(  # noqa: PLR0913
     profile: bool = False,
     profile_dir: str | None = None,
     poll_watcher: bool = False,
+    cache_dir: str | None = None,
+    background_reload: bool = False,
+    parallel_load: bool = False,
+    filter_cache_size: int | None = None,
+    reload_quiet_window: float = 0.2,
+    max_change_streams: int = DEFAULT_MAX_CHANGE_STREAMS,
 ) -> None:  # pragma: no cover
     """Start Fava for FILENAMES on http://<host>:<port>.
 
@@ -142,6 +195,13 @@ def start(  # noqa: PLR0913
         incognito=incognito,
         read_only=read_only,
         poll_watcher=poll_watcher,
+        watch_files=not poll_watcher,
+        cache_dir=cache_dir,
+        background_reload=background_reload,
+        parallel_load=parallel_load,
+        filter_cache_size=filter_cache_size,
+        reload_quiet_window=reload_quiet_window,
+        max_change_streams=max_change_streams,
     )
 
     if prefix:
@@ -157,7 +217,12 @@ def start(  # noqa: PLR0913
 
     click.secho(f"Starting Fava on http://{host}:{port}", fg="green")
     if not debug:
-        server = Server((host, port), app)
+        # The change streams each occupy one of the threads of the server.
+        server = Server(
+            (host, port),
+            app,
+            numthreads=SERVER_THREADS + max_change_streams,
+        )
         try:
             server.start()
         except KeyboardInterrupt:
@@ -11,10 +11,8 @@ from fava.beans.abc import Close
 from fava.beans.flags import FLAG_UNREALIZED
 from fava.beans.funcs import hash_entry
 from fava.core.conversion import units
-from fava.core.group_entries import group_entries_by_account
 from fava.core.group_entries import TransactionPosting
 from fava.core.module_base import FavaModule
-from fava.core.tree import Tree
 from fava.util.date import local_today
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -113,6 +111,7 @@ class AccountDict(FavaModule, dict[str, AccountData]):
     """Account info dictionary."""
 
     EMPTY = AccountData()
+    dependencies = ("postings",)
 
     def __missing__(self, key: str) -> AccountData:
         return self.EMPTY
@@ -129,8 +128,8 @@ class AccountDict(FavaModule, dict[str, AccountData]):
 
     def load_file(self) -> None:  # noqa: D102
         self.clear()
-        entries_by_account = group_entries_by_account(self.ledger.all_entries)
-        tree = Tree(self.ledger.all_entries)
+        entries_by_account = self.ledger.analysis.entries_by_account
+        tree = self.ledger.postings.tree(self.ledger.all_entries)
         for open_entry in self.ledger.all_entries_by_type.Open:
             meta = open_entry.meta
             account_data = self.setdefault(open_entry.account)
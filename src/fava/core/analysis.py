@@ -0,0 +1,117 @@
+"""A single pass over the entries of the ledger on load."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from fava.beans import abc
+from fava.beans.account import get_entry_accounts
+from fava.core.group_entries import EntriesByType
+from fava.core.group_entries import TransactionPosting
+from fava.util.ranking import ExponentialDecayRanker
+
+if TYPE_CHECKING:  # pragma: no cover
+    import datetime
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+
+
+class LedgerAnalysis:
+    """The data of the entries that the modules need on load.
+
+    Several modules used to go through all entries on each load of the
+    ledger. Instead, the entries are grouped by type and account and the
+    inputs for the ranking of the attributes are collected here in a
+    single pass, which the modules then read from in their ``load_file``.
+
+    Args:
+        entries: The sorted entries of the ledger.
+    """
+
+    def __init__(self, entries: Sequence[abc.Directive]) -> None:
+        by_type: dict[str, list[abc.Directive]] = {
+            name: [] for name in EntriesByType._fields
+        }
+        by_account: dict[
+            str, list[abc.Directive | TransactionPosting]
+        ] = defaultdict(list)
+        dates: list[datetime.date] = []
+        account_ranker = ExponentialDecayRanker()
+        currency_ranker = ExponentialDecayRanker()
+        payee_ranker = ExponentialDecayRanker()
+        tag_ranker = ExponentialDecayRanker()
+        link_ranker = ExponentialDecayRanker()
+        payee_transactions: dict[str, list[abc.Transaction]] = {}
+        payee_account_rankers: dict[str, ExponentialDecayRanker] = {}
+
+        last_date = None
+        for entry in entries:
+            date = entry.date
+            if date != last_date:
+                dates.append(date)
+                last_date = date
+            group = by_type.get(entry.__class__.__name__)
+            if group is not None:
+                group.append(entry)
+            tags = getattr(entry, "tags", None)
+            if tags:
+                for tag in tags:
+                    tag_ranker.update(tag, date)
+            links = getattr(entry, "links", None)
+            if links:
+                for link in links:
+                    link_ranker.update(link, date)
+
+            if not isinstance(entry, abc.Transaction):
+                for account in get_entry_accounts(entry):
+                    by_account[account].append(entry)
+                continue
+
+            payee = entry.payee
+            payee_account_ranker = None
+            if payee is not None:
+                if payee:
+                    payee_ranker.update(payee, date)
+                payee_transactions.setdefault(payee, []).append(entry)
+                payee_account_ranker = payee_account_rankers.get(payee)
+                if payee_account_ranker is None:
+                    payee_account_ranker = ExponentialDecayRanker()
+                    payee_account_rankers[payee] = payee_account_ranker
+            for posting in entry.postings:
+                account = posting.account
+                by_account[account].append(TransactionPosting(entry, posting))
+                account_ranker.update(account, date)
+                if payee_account_ranker is not None:
+                    payee_account_ranker.update(account, date)
+                currency_ranker.update(posting.units.currency, date)
+                cost = posting.cost
+                if cost and cost.currency is not None:
+                    currency_ranker.update(cost.currency, date)
+
+        #: The entries grouped by the name of their type.
+        self.entries_by_type: Mapping[str, Sequence[abc.Directive]] = by_type
+        #: The entries (postings for transactions) of each account.
+        self.entries_by_account: Mapping[
+            str, Sequence[abc.Directive | TransactionPosting]
+        ] = dict(sorted(by_account.items()))
+        #: The distinct dates of the entries, in order.
+        self.dates: Sequence[datetime.date] = dates
+        #: Scores of the accounts, by the dates of their postings.
+        self.account_ranker = account_ranker
+        #: Scores of the currencies, by the dates of their postings.
+        self.currency_ranker = currency_ranker
+        #: Scores of the payees, by the dates of their transactions.
+        self.payee_ranker = payee_ranker
+        #: Scores of the tags, by the dates of the entries with them.
+        self.tag_ranker = tag_ranker
+        #: Scores of the links, by the dates of the entries with them.
+        self.link_ranker = link_ranker
+        #: The transactions of each payee.
+        self.payee_transactions: Mapping[
+            str, Sequence[abc.Transaction]
+        ] = payee_transactions
+        #: Scores of the accounts in the transactions of each payee.
+        self.payee_account_rankers: Mapping[str, ExponentialDecayRanker] = (
+            payee_account_rankers
+        )
@@ -6,15 +6,23 @@ from typing import TYPE_CHECKING
 
 from fava.core.module_base import FavaModule
 from fava.util.date import END_OF_YEAR
-from fava.util.ranking import ExponentialDecayRanker
+from fava.util.ranking import PrefixIndex
 
 if TYPE_CHECKING:  # pragma: no cover
+    import datetime
+    from collections.abc import Iterable
+    from collections.abc import Mapping
     from collections.abc import Sequence
 
     from fava.beans.abc import Directive
     from fava.beans.abc import Transaction
     from fava.core import FavaLedger
     from fava.util.date import FiscalYearEnd
+    from fava.util.ranking import ExponentialDecayRanker
+
+
+#: The kinds of attributes that can be completed.
+COMPLETION_KINDS = ("accounts", "payees", "tags", "links")
 
 
 def get_active_years(
@@ -31,11 +39,19 @@ def get_active_years(
         A reverse sorted list of years or fiscal years that occur in the
         entries.
     """
+    return _active_years((entry.date for entry in entries), fye)
+
+
+def _active_years(
+    dates: Iterable[datetime.date],
+    fye: FiscalYearEnd,
+) -> list[str]:
+    """Return the active (fiscal) years for a sorted iterable of dates."""
     years = []
     if fye == END_OF_YEAR:
         prev_year = None
-        for entry in entries:
-            year = entry.date.year
+        for date in dates:
+            year = date.year
             if year != prev_year:
                 prev_year = year
                 years.append(year)
@@ -43,12 +59,11 @@ def get_active_years(
     month = fye.month
     day = fye.day
     prev_year = None
-    for entry in entries:
-        date = entry.date
+    for date in dates:
         year = (
-            entry.date.year + 1
+            date.year + 1
             if date.month > month or (date.month == month and date.day > day)
-            else entry.date.year
+            else date.year
         )
         if year != prev_year:
             prev_year = year
@@ -57,7 +72,17 @@ def get_active_years(
 
 
 class AttributesModule(FavaModule):
-    """Some attributes of the ledger (mostly for auto-completion)."""
+    """Some attributes of the ledger (mostly for auto-completion).
+
+    The attributes are ranked with the scores collected in the
+    :class:`~fava.core.analysis.LedgerAnalysis` of the ledger. The ranked
+    accounts of a payee are computed on the first lookup and cached until
+    the next load. For each kind of
+    attribute, a prefix index of the ranked values is built on load to
+    complete them.
+    """
+
+    dependencies = ("accounts",)
 
     def __init__(self, ledger: FavaLedger) -> None:
         super().__init__(ledger)
@@ -67,60 +92,68 @@ class AttributesModule(FavaModule):
         self.links: Sequence[str] = []
         self.tags: Sequence[str] = []
         self.years: Sequence[str] = []
+        self._payee_transactions: Mapping[str, Sequence[Transaction]] = {}
+        self._payee_account_rankers: Mapping[str, ExponentialDecayRanker] = {}
+        self._payee_accounts: dict[str, Sequence[str]] = {}
+        self._completions: dict[str, PrefixIndex] = {}
 
     def load_file(self) -> None:  # noqa: D102
-        all_entries = self.ledger.all_entries
-
-        all_links = set()
-        all_tags = set()
-        for entry in all_entries:
-            links = getattr(entry, "links", None)
-            if links is not None:
-                all_links.update(links)
-            tags = getattr(entry, "tags", None)
-            if tags is not None:
-                all_tags.update(tags)
-        self.links = sorted(all_links)
-        self.tags = sorted(all_tags)
-
-        self.years = get_active_years(
-            all_entries,
+        analysis = self.ledger.analysis
+        tag_ranker = analysis.tag_ranker
+        link_ranker = analysis.link_ranker
+        self.links = sorted(link_ranker.scores)
+        self.tags = sorted(tag_ranker.scores)
+
+        self.years = _active_years(
+            analysis.dates,
             self.ledger.fava_options.fiscal_year_end,
         )
 
-        account_ranker = ExponentialDecayRanker(
+        account_ranker = analysis.account_ranker
+        self.accounts = sorted(
             sorted(self.ledger.accounts.keys()),
+            key=account_ranker.get,
+            reverse=True,
         )
-        currency_ranker = ExponentialDecayRanker()
-        payee_ranker = ExponentialDecayRanker()
-
-        for txn in self.ledger.all_entries_by_type.Transaction:
-            if txn.payee:
-                payee_ranker.update(txn.payee, txn.date)
-            for posting in txn.postings:
-                account_ranker.update(posting.account, txn.date)
-                currency_ranker.update(posting.units.currency, txn.date)
-                if posting.cost and posting.cost.currency is not None:
-                    currency_ranker.update(posting.cost.currency, txn.date)
-
-        self.accounts = account_ranker.sort()
-        self.currencies = currency_ranker.sort()
-        self.payees = payee_ranker.sort()
+        self.currencies = analysis.currency_ranker.sort()
+        self.payees = analysis.payee_ranker.sort()
+        self._payee_transactions = analysis.payee_transactions
+        self._payee_account_rankers = analysis.payee_account_rankers
+        self._payee_accounts = {}
+        self._completions = {
+            "accounts": PrefixIndex(self.accounts),
+            "payees": PrefixIndex(self.payees),
+            "tags": PrefixIndex(tag_ranker.sort()),
+            "links": PrefixIndex(link_ranker.sort()),
+        }
+
+    def complete(self, kind: str, prefix: str, limit: int) -> list[str]:
+        """Complete a prefix of a word of an attribute.
+
+        Args:
+            kind: The kind of attribute to complete, one of
+                :data:`COMPLETION_KINDS`.
+            prefix: A prefix of (a word of) the attribute.
+            limit: The maximum number of completions.
+
+        Returns:
+            The highest ranked completions, the most recently and
+            frequently used first.
+        """
+        return self._completions[kind].complete(prefix, limit)
 
     def payee_accounts(self, payee: str) -> Sequence[str]:
         """Rank accounts for the given payee."""
-        account_ranker = ExponentialDecayRanker(self.accounts)
-        transactions = self.ledger.all_entries_by_type.Transaction
-        for txn in transactions:
-            if txn.payee == payee:
-                for posting in txn.postings:
-                    account_ranker.update(posting.account, txn.date)
-        return account_ranker.sort()
+        accounts = self._payee_accounts.get(payee)
+        if accounts is None:
+            ranker = self._payee_account_rankers.get(payee)
+            if ranker is None:
+                return self.accounts
+            accounts = sorted(self.accounts, key=ranker.get, reverse=True)
+            self._payee_accounts[payee] = accounts
+        return accounts
 
     def payee_transaction(self, payee: str) -> Transaction | None:
         """Get the last transaction for a payee."""
-        transactions = self.ledger.all_entries_by_type.Transaction
-        for txn in reversed(transactions):
-            if txn.payee == payee:
-                return txn
-        return None
+        transactions = self._payee_transactions.get(payee)
+        return transactions[-1] if transactions else None
@@ -2,17 +2,17 @@
 
 from __future__ import annotations
 
-from collections import Counter
 from collections import defaultdict
 from decimal import Decimal
 from typing import NamedTuple
 from typing import TYPE_CHECKING
 
+from fava.beans.account import parent
 from fava.core.module_base import FavaModule
 from fava.helpers import BeancountError
-from fava.util.date import days_in_daterange
+from fava.util.date import get_next_interval
+from fava.util.date import get_prev_interval
 from fava.util.date import Interval
-from fava.util.date import number_of_days_in_period
 
 if TYPE_CHECKING:  # pragma: no cover
     import datetime
@@ -37,22 +37,54 @@ BudgetDict = dict[str, list[Budget]]
 """A map of account names to lists of budget entries."""
 
 
+class BudgetSegment(NamedTuple):
+    """A budget and the dates that it is active for."""
+
+    budget: Budget
+    begin: datetime.date
+    #: The (exclusive) end date - None if it is active from then on.
+    end: datetime.date | None
+
+
+BudgetSchedule = list[BudgetSegment]
+"""The segments of all budgets of an account."""
+
+
 class BudgetError(BeancountError):
     """Error with a budget."""
 
 
 class BudgetModule(FavaModule):
-    """Parses budget entries."""
+    """Parses budget entries.
+
+    The schedules of the budgets of all accounts and for each account the
+    list of accounts with budgets in its subtree are computed on load, so
+    the budget for an interval is a sum over the overlapping segments of
+    the schedules.
+    """
 
     def __init__(self, ledger: FavaLedger) -> None:
         super().__init__(ledger)
         self._budget_entries: BudgetDict = {}
+        self._schedules: dict[str, BudgetSchedule] = {}
+        self._subtree_accounts: dict[str, list[str]] = {}
         self.errors: Sequence[BudgetError] = []
 
     def load_file(self) -> None:  # noqa: D102
         self._budget_entries, self.errors = parse_budgets(
             self.ledger.all_entries_by_type.Custom,
         )
+        self._schedules = {
+            account: budget_schedule(budgets)
+            for account, budgets in self._budget_entries.items()
+        }
+        subtree_accounts: dict[str, list[str]] = defaultdict(list)
+        for account in sorted(self._schedules):
+            name: str | None = account
+            while name:
+                subtree_accounts[name].append(account)
+                name = parent(name)
+        self._subtree_accounts = dict(subtree_accounts)
 
     def calculate(
         self,
@@ -61,12 +93,10 @@ class BudgetModule(FavaModule):
         end_date: datetime.date,
     ) -> Mapping[str, Decimal]:
         """Calculate the budget for an account in an interval."""
-        return calculate_budget(
-            self._budget_entries,
-            account,
-            begin_date,
-            end_date,
-        )
+        schedule = self._schedules.get(account)
+        if schedule is None:
+            return {}
+        return _schedule_sum(schedule, begin_date, end_date)
 
     def calculate_children(
         self,
@@ -75,12 +105,13 @@ class BudgetModule(FavaModule):
         end_date: datetime.date,
     ) -> Mapping[str, Decimal]:
         """Calculate the budget for an account including its children."""
-        return calculate_budget_children(
-            self._budget_entries,
-            account,
-            begin_date,
-            end_date,
-        )
+        currency_dict: dict[str, Decimal] = {}
+        for child in self._subtree_accounts.get(account, []):
+            _add_to(
+                currency_dict,
+                _schedule_sum(self._schedules[child], begin_date, end_date),
+            )
+        return currency_dict
 
 
 def parse_budgets(
@@ -136,23 +167,87 @@ def parse_budgets(
     return budgets, errors
 
 
-def _matching_budgets(
-    budgets: Sequence[Budget],
-    date_active: datetime.date,
-) -> Mapping[str, Budget]:
-    """Find matching budgets.
+def budget_schedule(budgets: Sequence[Budget]) -> BudgetSchedule:
+    """Get the segments in which each of the budgets is active.
+
+    A budget is active from its start date until the start of the next
+    budget of the same currency.
+
+    Args:
+        budgets: The budgets of an account.
 
     Returns:
-        The budget that is active on the specified date for the
-        specified account.
+        The segments of the budgets.
     """
-    last_seen_budgets = {}
-    for budget in budgets:
-        if budget.date_start <= date_active:
-            last_seen_budgets[budget.currency] = budget
-        else:
-            break
-    return last_seen_budgets
+    by_currency: dict[str, list[Budget]] = defaultdict(list)
+    for budget in sorted(budgets, key=lambda budget: budget.date_start):
+        by_currency[budget.currency].append(budget)
+    schedule: BudgetSchedule = []
+    for currency_budgets in by_currency.values():
+        ends: list[datetime.date | None] = [
+            budget.date_start for budget in currency_budgets[1:]
+        ]
+        ends.append(None)
+        schedule.extend(
+            BudgetSegment(budget, budget.date_start, end)
+            for budget, end in zip(currency_budgets, ends, strict=True)
+        )
+    return schedule
+
+
+def _budget_sum(
+    budget: Budget,
+    date_from: datetime.date,
+    date_to: datetime.date,
+) -> Decimal:
+    """Sum up the budget over the days of an interval.
+
+    The daily rate is constant within each period of the budget (like a
+    month), so this is a sum over the periods instead of over the days.
+    """
+    period = budget.period
+    number = budget.number
+    if period is Interval.DAY:
+        return number * (date_to - date_from).days
+    if period is Interval.WEEK:
+        return number * (date_to - date_from).days / 7
+    total = Decimal()
+    day = date_from
+    while day < date_to:
+        start = get_prev_interval(day, period)
+        end = get_next_interval(start, period)
+        stop = min(end, date_to)
+        total += number * (stop - day).days / (end - start).days
+        day = stop
+    return total
+
+
+def _schedule_sum(
+    schedule: BudgetSchedule,
+    date_from: datetime.date,
+    date_to: datetime.date,
+) -> dict[str, Decimal]:
+    """Sum up the budgets of a schedule over an interval."""
+    currency_dict: dict[str, Decimal] = {}
+    for budget, segment_begin, segment_end in schedule:
+        begin = max(segment_begin, date_from)
+        end = date_to if segment_end is None else min(segment_end, date_to)
+        if begin < end:
+            currency = budget.currency
+            currency_dict[currency] = currency_dict.get(
+                currency, Decimal()
+            ) + _budget_sum(budget, begin, end)
+    return currency_dict
+
+
+def _add_to(
+    currency_dict: dict[str, Decimal],
+    other: Mapping[str, Decimal],
+) -> None:
+    for currency, number in other.items():
+        currency_dict[currency] = (
+            currency_dict.get(currency, Decimal()) + number
+        )
 
 
 def calculate_budget(
@@ -176,15 +271,7 @@ def calculate_budget(
     budget_list = budgets.get(account, None)
     if budget_list is None:
         return {}
-
-    currency_dict: dict[str, Decimal] = defaultdict(Decimal)
-
-    for day in days_in_daterange(date_from, date_to):
-        matches = _matching_budgets(budget_list, day)
-        for budget in matches.values():
-            days_in_period = number_of_days_in_period(budget.period, day)
-            currency_dict[budget.currency] += budget.number / days_in_period
-    return dict(currency_dict)
+    return _schedule_sum(budget_schedule(budget_list), date_from, date_to)
 
 
 def calculate_budget_children(
@@ -205,11 +292,12 @@ def calculate_budget_children(
         A dictionary of currency to Decimal with the budget for the
         specified account and period.
     """
-    currency_dict: dict[str, Decimal] = Counter()  # type: ignore[assignment]
-
+    currency_dict: dict[str, Decimal] = {}
+    prefix = f"{account}:"
     for child in budgets:
-        if child.startswith(account):
-            currency_dict.update(
+        if child == account or child.startswith(prefix):
+            _add_to(
+                currency_dict,
                 calculate_budget(budgets, child, date_from, date_to),
             )
-    return dict(currency_dict)
+    return currency_dict
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
 from dataclasses import dataclass
 from dataclasses import fields
 from dataclasses import is_dataclass
@@ -26,9 +25,9 @@ from fava.beans.account import account_tester
 from fava.beans.flags import FLAG_UNREALIZED
 from fava.beans.helpers import slice_entry_dates
 from fava.core.conversion import cost_or_value
+from fava.core.conversion import prefetch_rates
 from fava.core.inventory import CounterInventory
 from fava.core.module_base import FavaModule
-from fava.core.tree import Tree
 from fava.util import listify
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -117,7 +116,9 @@ class ChartModule(FavaModule):
     ) -> SerialisedTreeNode:
         """Render an account tree."""
         if begin is not None and end is not None:
-            tree = Tree(slice_entry_dates(filtered.entries, begin, end))
+            tree = self.ledger.postings.tree(
+                slice_entry_dates(filtered.entries, begin, end)
+            )
         else:
             tree = filtered.root_tree
         return tree.get(account_name).serialise(
@@ -149,25 +150,31 @@ class ChartModule(FavaModule):
             The balances and budgets for the intervals.
         """
         prices = self.ledger.prices
+        intervals = filtered.interval_ranges(interval)
 
-        # limit the bar charts to 100 intervals
-        intervals = filtered.interval_ranges(interval)[-100:]
+        # Bucket all postings into the intervals in a single pass.
+        interval_balances = self.ledger.postings.interval_balances(
+            filtered.entries,
+            [(date_range.begin, date_range.end) for date_range in intervals],
+            lambda account: account.startswith(accounts),
+        )
+        prefetch_rates(
+            (
+                inventory
+                for account_inventories in interval_balances
+                for inventory in account_inventories.values()
+            ),
+            conversion,
+            prices,
+            [date_range.end_inclusive for date_range in intervals],
+        )
 
-        for date_range in intervals:
+        for date_range, account_inventories in zip(
+            intervals, interval_balances, strict=True
+        ):
             inventory = CounterInventory()
-            entries = slice_entry_dates(
-                filtered.entries, date_range.begin, date_range.end
-            )
-            account_inventories: dict[str, CounterInventory] = defaultdict(
-                CounterInventory,
-            )
-            for entry in entries:
-                for posting in getattr(entry, "postings", []):
-                    if posting.account.startswith(accounts):
-                        account_inventories[posting.account].add_position(
-                            posting,
-                        )
-                        inventory.add_position(posting)
+            for account_inventory in account_inventories.values():
+                inventory.add_inventory(account_inventory)
             balance = cost_or_value(
                 inventory,
                 conversion,
@@ -224,31 +231,23 @@ class ChartModule(FavaModule):
             account has changed containing the balance (in units) of the
             account at that date.
         """
-
-        def _balances() -> Iterable[tuple[date, CounterInventory]]:
-            last_date = None
-            running_balance = CounterInventory()
-            is_child_account = account_tester(account_name, with_children=True)
-
-            for entry in filtered.entries:
-                for posting in getattr(entry, "postings", []):
-                    if is_child_account(posting.account):
-                        new_date = entry.date
-                        if last_date is not None and new_date > last_date:
-                            yield (last_date, running_balance)
-                        running_balance.add_position(posting)
-                        last_date = new_date
-
-            if last_date is not None:
-                yield (last_date, running_balance)
-
         # When the balance for a commodity just went to zero, it will be
         # missing from the 'balance' so keep track of currencies that last had
         # a balance.
         last_currencies = None
         prices = self.ledger.prices
+        balances = self.ledger.postings.running_balances(
+            filtered.entries,
+            account_tester(account_name, with_children=True),
+        )
+        prefetch_rates(
+            (bal for _, bal in balances),
+            conversion,
+            prices,
+            [d for d, _ in balances],
+        )
 
-        for d, running_bal in _balances():
+        for d, running_bal in balances:
             balance = cost_or_value(running_bal, conversion, prices, d)
             currencies = set(balance.keys())
             if last_currencies:
@@ -276,36 +275,38 @@ class ChartModule(FavaModule):
             net worth (Assets + Liabilities) separately converted to all
             operating currencies.
         """
-        transactions = (
+        transactions = [
             entry
             for entry in filtered.entries
             if (
                 isinstance(entry, Transaction)
                 and entry.flag != FLAG_UNREALIZED
             )
-        )
+        ]
 
         types = (
             self.ledger.options["name_assets"],
             self.ledger.options["name_liabilities"],
         )
 
-        txn = next(transactions, None)
-        inventory = CounterInventory()
+        balances = self.ledger.postings.running_balances(
+            transactions,
+            lambda account: account.startswith(types),
+            [
+                date_range.end
+                for date_range in filtered.interval_ranges(interval)
+            ],
+        )
 
         prices = self.ledger.prices
-        for date_range in filtered.interval_ranges(interval):
-            while txn and txn.date < date_range.end:
-                for posting in txn.postings:
-                    if posting.account.startswith(types):
-                        inventory.add_position(posting)
-                txn = next(transactions, None)
+        prefetch_rates(
+            (inventory for _, inventory in balances),
+            conversion,
+            prices,
+            [d for d, _ in balances],
+        )
+        for d, inventory in balances:
             yield DateAndBalance(
-                date_range.end_inclusive,
-                cost_or_value(
-                    inventory,
-                    conversion,
-                    prices,
-                    date_range.end_inclusive,
-                ),
+                d,
+                cost_or_value(inventory, conversion, prices, d),
             )
@@ -14,13 +14,17 @@ from fava.core.inventory import SimpleCounterInventory
 
 if TYPE_CHECKING:  # pragma: no cover
     import datetime
+    from collections.abc import Iterable
+    from collections.abc import Sequence
 
     from beancount.core.inventory import Inventory
 
+    from fava.beans.prices import BaseQuote
     from fava.beans.prices import FavaPriceMap
     from fava.beans.protocols import Amount
     from fava.beans.protocols import Position
     from fava.core.inventory import CounterInventory
+    from fava.core.inventory import InventoryKey
 
 
 def get_units(pos: Position) -> Amount:
@@ -63,10 +67,10 @@ def get_market_value(
     if cost_ is not None:
         value_currency = cost_.currency
         base_quote = (units_.currency, value_currency)
-        price_number = prices.get_price(base_quote, date)
-        if price_number is not None:
+        rates = prices.get_conversion_rates(base_quote, date)
+        if rates is not None:
             return _Amount(
-                units_.number * price_number,
+                units_.number * rates[0],
                 value_currency,
             )
         return _Amount(units_.number * cost_.number, value_currency)
@@ -92,27 +96,19 @@ def convert_position(
         cost value (or the units if the position has no cost).
     """
     units_ = pos.units
-
-    # try the direct conversion
-    base_quote = (units_.currency, target_currency)
-    price_number = prices.get_price(base_quote, date)
-    if price_number is not None:
-        return _Amount(units_.number * price_number, target_currency)
-
     cost_ = pos.cost
-    if cost_ is not None:
-        cost_currency = cost_.currency
-        if cost_currency != target_currency:
-            base_quote1 = (units_.currency, cost_currency)
-            rate1 = prices.get_price(base_quote1, date)
-            if rate1 is not None:
-                base_quote2 = (cost_currency, target_currency)
-                rate2 = prices.get_price(base_quote2, date)
-                if rate2 is not None:
-                    return _Amount(
-                        units_.number * rate1 * rate2,
-                        target_currency,
-                    )
+
+    # Convert directly or, failing that, through the cost currency.
+    rates = prices.get_conversion_rates(
+        (units_.currency, target_currency),
+        date,
+        cost_.currency if cost_ is not None else None,
+    )
+    if rates is not None:
+        number = units_.number
+        for rate in rates:
+            number *= rate
+        return _Amount(number, target_currency)
     return units_
 
 
@@ -145,6 +141,18 @@ class Conversion(ABC):
     ) -> SimpleCounterInventory:
         """Apply the conversion to an inventory."""
 
+    def rate_pairs(
+        self,
+        keys: Iterable[InventoryKey],  # noqa: ARG002
+    ) -> set[tuple[BaseQuote, str | None]]:
+        """Get the conversion rates needed to convert these positions.
+
+        Returns:
+            Pairs of a currency pair and the currency to triangulate
+            through, as passed to ``FavaPriceMap.get_conversion_rates``.
+        """
+        return set()
+
 
 class _AtCostConversion(Conversion):
     def apply(
@@ -165,6 +173,16 @@ class _AtValueConversion(Conversion):
     ) -> SimpleCounterInventory:
         return inventory.reduce(get_market_value, prices, date)
 
+    def rate_pairs(
+        self,
+        keys: Iterable[InventoryKey],
+    ) -> set[tuple[BaseQuote, str | None]]:
+        return {
+            ((currency, cost.currency), None)
+            for currency, cost in keys
+            if cost is not None
+        }
+
 
 class _UnitsConversion(Conversion):
     def apply(
@@ -195,6 +213,28 @@ class _CurrencyConversion(Conversion):
             res = res.reduce(convert_position, currency, prices, date)
         return res
 
+    def rate_pairs(
+        self,
+        keys: Iterable[InventoryKey],
+    ) -> set[tuple[BaseQuote, str | None]]:
+        currencies = iter(self._currencies)
+        target = next(currencies)
+        pairs: set[tuple[BaseQuote, str | None]] = set()
+        units_currencies = {target}
+        for currency, cost in keys:
+            pairs.add(
+                (
+                    (currency, target),
+                    cost.currency if cost is not None else None,
+                ),
+            )
+            units_currencies.add(currency)
+        # Further conversions convert the (partially) converted units.
+        for currency in currencies:
+            pairs.update(((c, currency), None) for c in units_currencies)
+            units_currencies.add(currency)
+        return pairs
+
 
 #: Convert position to its total cost.
 AT_COST = _AtCostConversion()
@@ -226,4 +266,29 @@ def cost_or_value(
     if isinstance(conversion, str):
         conversion = conversion_from_str(conversion)
 
+    prices.prefetch_conversion_rates(
+        conversion.rate_pairs(inventory.keys()), (date,)
+    )
     return conversion.apply(inventory, prices, date)
+
+
+def prefetch_rates(
+    inventories: Iterable[CounterInventory],
+    conversion: str | Conversion,
+    prices: FavaPriceMap,
+    dates: Sequence[datetime.date | None],
+) -> None:
+    """Look up the rates to convert inventories at several dates at once.
+
+    The prices for all the rates needed by the conversion of the positions
+    in any of the inventories at any of the dates are looked up in a single
+    batch, so that the following calls of :func:`cost_or_value` for them
+    only hit the rate cache of the price map.
+    """
+    if isinstance(conversion, str):
+        conversion = conversion_from_str(conversion)
+
+    keys: set[InventoryKey] = set()
+    for inventory in inventories:
+        keys.update(inventory.keys())
+    prices.prefetch_conversion_rates(conversion.rate_pairs(keys), dates)
@@ -0,0 +1,62 @@
+"""Index of the entries by their hash."""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+from fava.beans.funcs import get_position
+from fava.beans.funcs import hash_entry
+from fava.core.module_base import FavaModule
+
+if TYPE_CHECKING:  # pragma: no cover
+    from fava.beans.abc import Directive
+    from fava.core import FavaLedger
+
+
+class EntryHashIndex(FavaModule):
+    """Look up entries by their hash.
+
+    The index is built on the first lookup after each load of the ledger,
+    so the entries are only hashed once per generation.
+    """
+
+    def __init__(self, ledger: FavaLedger) -> None:
+        super().__init__(ledger)
+        self._lock = threading.Lock()
+        self._index: dict[str, Directive] | None = None
+
+    def load_file(self) -> None:  # noqa: D102
+        self._index = None
+
+    @property
+    def size(self) -> int:
+        """The number of indexed hashes (0 if not built yet)."""
+        index = self._index
+        return len(index) if index is not None else 0
+
+    def _get_index(self) -> dict[str, Directive]:
+        index = self._index
+        if index is None:
+            with self._lock:
+                index = self._index
+                if index is None:
+                    index = {}
+                    for entry in self.ledger.all_entries:
+                        # Like a linear search, return the first entry for
+                        # duplicate hashes.
+                        index.setdefault(hash_entry(entry), entry)
+                    self._index = index
+        return index
+
+    def get(self, entry_hash: str) -> Directive | None:
+        """Get the entry with the given hash, if there is one."""
+        return self._get_index().get(entry_hash)
+
+    def position(self, entry_hash: str) -> tuple[str, int] | None:
+        """Get the filename and line number of the entry with the hash."""
+        entry = self.get(entry_hash)
+        return get_position(entry) if entry is not None else None
+
+    def __len__(self) -> int:
+        return len(self._get_index())
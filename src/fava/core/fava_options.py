@@ -101,6 +101,7 @@ class FavaOptions:
     fava_crypto_settings_file: str | None = None # Added for PQC integration
     import_config: str | None = None
     import_dirs: tuple[str, ...] = ()
+    incremental_reload: bool = False
     indent: int = 2
     insert_entry: Sequence[InsertEntryOption] = field(default_factory=list)
     invert_income_liabilities_equity: bool = False
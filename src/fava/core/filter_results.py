@@ -3,16 +3,28 @@
 from __future__ import annotations
 
 import datetime
+import threading
+from collections import OrderedDict
+from functools import cached_property
 from typing import TYPE_CHECKING, Any, List, Optional, Dict, Iterator
 from dataclasses import dataclass
 
 # AccountTypes not needed for this implementation
 
 if TYPE_CHECKING:
+    from decimal import Decimal
+
     from fava.beans.abc import Directive
     from fava.core.fava_options import FavaOptions
+    from fava.core.postings import PostingStore
+    from fava.util.date import DateRange as IntervalRange
 
+from fava.beans.abc import Price
+from fava.beans.prices import FavaPriceMap
+from fava.core.journal import AccountEntryIndex
 from fava.util.date import Interval
+from fava.util.date import dateranges
+from fava.core.inventory import SimpleCounterInventory
 from beancount.core import inventory
 
 
@@ -84,16 +96,31 @@ class TreeNode:
         # Also keep a mapping for efficient lookups
         self._children_by_name: Dict[str, TreeNode] = {}
         
-    def get(self, account: str) -> TreeNode:
-        """Get a child node by account name."""
+    def get(self, account: str, *, insert: bool = False) -> TreeNode:
+        """Get a child node by account name.
+
+        Args:
+            account: An account name.
+            insert: If True, insert the account (and its parents) into the
+                tree if it does not exist.
+
+        Returns:
+            The node of the account or an empty node if the account is not
+            in the tree - the trees of the filtered entries are shared
+            between requests, so looking them up must not change them.
+        """
         if not account:
             return self
-        
+
         parts = account.split(':')
         current = self
         for part in parts:
             if part not in current._children_by_name:
-                new_node = TreeNode(current.account + ':' + part if current.account else part)
+                if not insert:
+                    return TreeNode(account)
+                new_node = TreeNode(
+                    current.account + ':' + part if current.account else part
+                )
                 current.children.append(new_node)
                 current._children_by_name[part] = new_node
             current = current._children_by_name[part]
@@ -129,64 +156,101 @@ class FilterEntries:
         self,
         entries: List[Directive],
         options: Dict[str, Any],
-        fava_options: FavaOptions
+        fava_options: FavaOptions,
+        postings: Optional[PostingStore] = None,
+        price_map: Optional[FavaPriceMap] = None,
     ):
         self.entries = entries
         self.options = options
         self.fava_options = fava_options
-        
-        # Calculate date range from entries
-        dates = []
-        for entry in entries:
-            if hasattr(entry, 'date'):
-                dates.append(entry.date)
-        
+        #: The posting store of the ledger, to compute balances with.
+        self.postings = postings
+        #: The price map of the ledger, to look up the price points with.
+        #: Only given if the entries were filtered by time only.
+        self.price_map = price_map
+
+    # The date range, trees and price entries are only computed on first
+    # access since many reports do not need all (or any) of them.
+
+    @cached_property
+    def date_range(self) -> DateRange:
+        """The date range of the filtered entries."""
+        dates = [
+            entry.date for entry in self.entries if hasattr(entry, 'date')
+        ]
         if dates:
-            self.date_range = DateRange(min(dates), max(dates))
-        else:
-            # Default date range if no entries
-            today = datetime.date.today()
-            self.date_range = DateRange(today, today)
-        
-        # Build account trees
-        self.root_tree = self._build_tree(closed=False)
-        self.root_tree_closed = self._build_tree(closed=True)
-        
-        # Create entries with all prices (for now, just use entries as-is)
-        self.entries_with_all_prices = list(entries)
-        
+            return DateRange(min(dates), max(dates))
+        # Default date range if no entries
+        today = datetime.date.today()
+        return DateRange(today, today)
+
+    @cached_property
+    def root_tree(self) -> TreeNode:
+        """The account tree of the filtered entries."""
+        return self._build_tree(closed=False)
+
+    @cached_property
+    def root_tree_closed(self) -> TreeNode:
+        """The account tree, with closed accounts."""
+        return self._build_tree(closed=True)
+
+    @cached_property
+    def account_index(self) -> AccountEntryIndex:
+        """The positions of the entries of each account."""
+        return AccountEntryIndex(self.entries)
+
+    @cached_property
+    def entries_with_all_prices(self) -> List[Directive]:
+        """The filtered entries (for now, just the entries as-is)."""
+        return list(self.entries)
+
+
     def _build_tree(self, closed: bool = False) -> TreeNode:
-        """Build the account tree from entries."""
+        """Build the account tree from entries.
+
+        The balances are the exact sums of the units per currency. They are
+        computed on the columnar posting store of the ledger if available.
+        """
         root = TreeNode('')
-        
-        # Build tree structure from accounts in entries and calculate balances
-        account_balances: Dict[str, Dict[str, float]] = {}
-        
+
+        # All accounts of the entries, in the order they first appear in.
+        accounts: Dict[str, None] = {}
         for entry in self.entries:
-            if hasattr(entry, 'account') and entry.account:
-                # For non-transaction entries (like Open, Close)
-                if entry.account not in account_balances:
-                    account_balances[entry.account] = {}
-            elif hasattr(entry, 'postings') and entry.postings:
-                # For transaction entries
-                for posting in entry.postings:
-                    if hasattr(posting, 'account'):
-                        account = posting.account
-                        if account not in account_balances:
-                            account_balances[account] = {}
-                        
-                        # Add posting amount to balance
-                        if hasattr(posting, 'units') and posting.units:
-                            currency = posting.units.currency
-                            amount = float(posting.units.number)
-                            if currency in account_balances[account]:
-                                account_balances[account][currency] += amount
-                            else:
-                                account_balances[account][currency] = amount
-        
+            entry_account: str | None = getattr(entry, 'account', None)
+            if entry_account:
+                accounts.setdefault(entry_account)
+            else:
+                for posting in getattr(entry, 'postings', None) or ():
+                    accounts.setdefault(posting.account)
+
+        sums: Dict[str, SimpleCounterInventory] = {}
+        if self.postings is not None:
+            for account, counter in self.postings.account_balances(
+                self.entries, with_cost=False
+            ).items():
+                sums[account] = SimpleCounterInventory(
+                    (currency, number)
+                    for (currency, _), number in counter.items()
+                )
+        else:
+            for entry in self.entries:
+                if getattr(entry, 'account', None):
+                    continue
+                for posting in getattr(entry, 'postings', None) or ():
+                    units = getattr(posting, 'units', None)
+                    if units and units.number is not None:
+                        sums.setdefault(
+                            posting.account, SimpleCounterInventory()
+                        ).add(units.currency, units.number)
+
+        account_balances: Dict[str, Dict[str, Decimal]] = {
+            account: dict(sums[account].items()) if account in sums else {}
+            for account in accounts
+        }
+
         # Create tree nodes for all accounts and set their balances
         for account, balance in account_balances.items():
-            node = root.get(account)
+            node = root.get(account, insert=True)
             node.balance = SimpleInventory(balance.copy())
             node.balance_children = SimpleInventory(balance.copy())
             node.has_txns = any(amount != 0 for amount in balance.values())
@@ -220,74 +284,85 @@ class FilterEntries:
         """The begin date of the filtered entries."""
         return self.date_range.begin
     
-    def interval_ranges(self, interval: Interval) -> List[DateRange]:
-        """Generate date ranges for the specified interval."""
-        ranges = []
-        current_date = self.date_range.begin
-        
-        # For now, create a simple implementation that generates monthly intervals
-        while current_date <= self.date_range.end:
-            if interval == Interval.MONTH:
-                # Move to start of month
-                start = current_date.replace(day=1)
-                # Move to start of next month, then subtract one day
-                if start.month == 12:
-                    next_month = start.replace(year=start.year + 1, month=1)
-                else:
-                    next_month = start.replace(month=start.month + 1)
-                end = next_month - datetime.timedelta(days=1)
-                
-                ranges.append(DateRange(start, end))
-                current_date = next_month
-                
-            elif interval == Interval.YEAR:
-                # Move to start of year
-                start = current_date.replace(month=1, day=1)
-                # Move to start of next year
-                next_year = start.replace(year=start.year + 1)
-                end = next_year - datetime.timedelta(days=1)
-                
-                ranges.append(DateRange(start, end))
-                current_date = next_year
-                
-            elif interval == Interval.DAY:
-                ranges.append(DateRange(current_date, current_date))
-                current_date += datetime.timedelta(days=1)
-                
-            else:
-                # Default to the entire range for unknown intervals
-                ranges.append(self.date_range)
-                break
-        
-        return ranges
+    def interval_ranges(self, interval: Interval) -> List[IntervalRange]:
+        """Generate date ranges for the specified interval.
+
+        The ranges follow the calendar (and the fiscal year of the ledger
+        for years and quarters) and cover all days of the filtered entries.
+        """
+        return dateranges(
+            self.date_range.begin,
+            self.date_range.end + datetime.timedelta(days=1),
+            interval,
+            complete=True,
+            fye=self.fava_options.fiscal_year_end,
+        )
     
     @property
     def entries_with_balances_from_realization(self):
         """Provide compatibility with original Fava API."""
         return self.entries
     
+    @cached_property
+    def _price_date_ranges(
+        self,
+    ) -> Dict[tuple[str, str], tuple[datetime.date, datetime.date]]:
+        """The first and last date of the filtered prices of each pair.
+
+        The time filter keeps all prices in a date range, so if it is the
+        only filter, the filtered price points of a pair are the ones of the
+        price map of the ledger between these dates.
+        """
+        ranges: Dict[tuple[str, str], tuple[datetime.date, datetime.date]]
+        ranges = {}
+        for entry in self.entries:
+            if isinstance(entry, Price):
+                base, quote = entry.currency, entry.amount.currency
+                for pair in ((base, quote), (quote, base)):
+                    first = ranges.get(pair)
+                    ranges[pair] = (
+                        (first[0], entry.date) if first else (entry.date,) * 2
+                    )
+        return ranges
+
     def prices(self, base: str | None = None, quote: str | None = None):
         """Get prices for a specific base/quote pair or return the price map.
-        
+
+        If the price map of the ledger was given (i.e., only the time filter
+        was applied), the price points of a pair are sliced from it instead
+        of building a new price map each time.
+
         Args:
             base: Base currency (optional)
             quote: Quote currency (optional)
-            
+
         Returns:
             If base and quote are provided, returns list of price points.
             Otherwise returns the FavaPriceMap object.
         """
-        from fava.beans.prices import FavaPriceMap
-        price_entries = [e for e in self.entries if hasattr(e, '__class__') and e.__class__.__name__ == 'Price']
-        price_map = FavaPriceMap(price_entries)
-        
+        if (
+            base is not None
+            and quote is not None
+            and self.price_map is not None
+        ):
+            date_range = self._price_date_ranges.get((base, quote))
+            if date_range is None:
+                return []
+            first, last = date_range
+            return self.price_map.slice_prices(
+                (base, quote), first, last + datetime.timedelta(days=1)
+            )
+
+        price_map = FavaPriceMap(
+            [e for e in self.entries if isinstance(e, Price)]
+        )
         if base is not None and quote is not None:
             # Return price points for the specific pair
             return price_map.get_all_prices((base, quote))
         else:
             # Return the price map object
             return price_map
-    
+
     def get_account_entries(self, account_name: str) -> List[Directive]:
         """Get entries for a specific account."""
         entries = []
@@ -298,4 +373,62 @@ class FilterEntries:
                 for posting in entry.postings:
                     if hasattr(posting, 'account') and posting.account == account_name:
                         entries.append(entry)
-                        break 
\ No newline at end of file
+                        break 
+
+
+class FilterCache:
+    """A LRU cache of filter results.
+
+    The size of the cache is limited by the total number of filtered entries
+    it holds. The caller is responsible for including everything that the
+    filter result depends on (like the ledger generation) in the keys.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._results: OrderedDict[Any, FilterEntries] = OrderedDict()
+        self._size = 0
+        #: The number of cache hits and misses.
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> FilterEntries | None:
+        """Get a cached filter result, if there is one."""
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._results.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: Any, result: FilterEntries) -> None:
+        """Add a filter result, dropping the least recently used ones."""
+        size = len(result.entries)
+        if not self.max_entries or size > self.max_entries:
+            return
+        with self._lock:
+            previous = self._results.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.entries)
+            self._results[key] = result
+            self._size += size
+            while self._size > self.max_entries:
+                _, dropped = self._results.popitem(last=False)
+                self._size -= len(dropped.entries)
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._results.clear()
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        """The total number of filtered entries in the cache."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._results)
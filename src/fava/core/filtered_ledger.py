@@ -55,25 +55,21 @@ class FilteredLedger:
         return self._filter_result.date_range
     
     def prices(self, base_currency: str, quote_currency: str) -> List[Any]:
-        """Get price entries for the given currency pair."""
-        # Filter price entries for the specific currency pair
-        price_entries = []
-        for entry in self.entries_with_all_prices:
-            if (hasattr(entry, '__class__') and 
-                entry.__class__.__name__ == 'Price' and
-                hasattr(entry, 'currency') and 
-                hasattr(entry, 'amount')):
-                # Check if this price entry matches our currency pair
-                if (entry.currency == base_currency and 
-                    hasattr(entry.amount, 'currency') and
-                    entry.amount.currency == quote_currency):
-                    price_entries.append(entry)
-                elif (entry.currency == quote_currency and 
-                      hasattr(entry.amount, 'currency') and
-                      entry.amount.currency == base_currency):
-                    price_entries.append(entry)
-        return price_entries
-    
+        """Get the price points for the given currency pair.
+
+        These are sliced from the price map of the ledger - to the date
+        range of the filtered entries if there are any.
+        """
+        base_quote = (base_currency, quote_currency)
+        date_range = self.date_range
+        if date_range is None:
+            return self.ledger.prices.slice_prices(base_quote)
+        return self.ledger.prices.slice_prices(
+            base_quote,
+            date_range.begin,
+            date_range.end + datetime.timedelta(days=1),
+        )
+
     def interval_ranges(self, interval: Interval) -> List[Any]:
         """Get interval ranges for the filtered entries."""
         if not self.entries:
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import datetime
 import re
 from abc import ABC
 from abc import abstractmethod
+from collections import defaultdict
 from decimal import Decimal
+from functools import cached_property
+from functools import lru_cache
 from typing import Any
 from typing import TYPE_CHECKING
 
@@ -14,6 +18,7 @@ from beancount.core import account
 from beancount.ops.summarize import clamp_opt
 
 from fava.beans.account import get_entry_accounts
+from fava.beans.helpers import slice_entry_dates
 from fava.helpers import FavaAPIError
 from fava.util.date import DateRange
 from fava.util.date import parse_date
@@ -22,6 +27,7 @@ if TYPE_CHECKING:  # pragma: no cover
     from collections.abc import Callable
     from collections.abc import Iterable
     from collections.abc import Sequence
+    from collections.abc import Set as AbstractSet
 
     from fava.beans.abc import Directive
     from fava.beans.types import BeancountOptions
@@ -184,15 +190,19 @@ class FilterSyntaxLexer:
 class Match:
     """Match a string."""
 
-    __slots__ = ("match",)
+    __slots__ = ("match", "regex_search", "string")
 
     match: Callable[[str], bool]
 
     def __init__(self, search: str) -> None:
+        self.string = search
+        self.regex_search: Callable[[str], Any] | None
         try:
             match = re.compile(search, re.IGNORECASE).search
+            self.regex_search = match
             self.match = lambda s: bool(match(s))
         except re.error:
+            self.regex_search = None
             self.match = lambda s: s == search
 
     def __call__(self, obj: Any) -> bool:
@@ -202,11 +212,13 @@ class Match:
 class MatchAmount:
     """Matches an amount."""
 
-    __slots__ = ("match",)
+    __slots__ = ("match", "op", "value")
 
     match: Callable[[Decimal], bool]
 
     def __init__(self, op: str, value: Decimal) -> None:
+        self.op = op
+        self.value = value
         if op == "=":
             self.match = lambda x: x == value
         elif op == ">=":
@@ -224,6 +236,473 @@ class MatchAmount:
         return self.match(abs(number)) if number is not None else False
 
 
+class FilterIndex:
+    """Inverted indexes of a list of entries for the advanced filter.
+
+    The entries are referred to by their position in the list. All the
+    indexes are only built on first use. For the values of keys and
+    attributes, the distinct values are mapped to the positions of the
+    entries that have them, so that a (regular expression) match only has
+    to be run once per distinct value.
+    """
+
+    def __init__(self, entries: Sequence[Directive]) -> None:
+        self.entries = entries
+        self._values: dict[tuple[str, str], dict[str, set[int]]] = {}
+
+    @cached_property
+    def positions(self) -> dict[int, int]:
+        """Map the id of each entry to its position."""
+        return {id(entry): pos for pos, entry in enumerate(self.entries)}
+
+    @cached_property
+    def universe(self) -> frozenset[int]:
+        """The positions of all entries."""
+        return frozenset(range(len(self.entries)))
+
+    @cached_property
+    def tags(self) -> dict[str, set[int]]:
+        """The positions of the entries with a tag."""
+        return self._by_members("tags")
+
+    @cached_property
+    def links(self) -> dict[str, set[int]]:
+        """The positions of the entries with a link."""
+        return self._by_members("links")
+
+    def _by_members(self, name: str) -> dict[str, set[int]]:
+        index: dict[str, set[int]] = defaultdict(set)
+        for pos, entry in enumerate(self.entries):
+            for member in getattr(entry, name, None) or ():
+                index[member].add(pos)
+        return dict(index)
+
+    def attribute_values(self, name: str) -> dict[str, set[int]]:
+        """The positions of the entries by (non-empty) attribute value."""
+        index = self._values.get(("attribute", name))
+        if index is None:
+            index = defaultdict(set)
+            for pos, entry in enumerate(self.entries):
+                value = getattr(entry, name, "")
+                if value:
+                    index[str(value)].add(pos)
+            index = self._values[("attribute", name)] = dict(index)
+        return index
+
+    def key_values(self, key: str) -> dict[str, set[int]]:
+        """The positions of the entries by the value for a filter key.
+
+        Like for the key filter, this is the attribute if the entry has one
+        of the name and the metadata value otherwise.
+        """
+        index = self._values.get(("key", key))
+        if index is None:
+            index = defaultdict(set)
+            for pos, entry in enumerate(self.entries):
+                value = _key_value(entry, key)
+                if value is not None:
+                    index[value].add(pos)
+            index = self._values[("key", key)] = dict(index)
+        return index
+
+    def posting_key_values(self, key: str) -> dict[str, set[int]]:
+        """The positions of the entries by the values of their postings."""
+        index = self._values.get(("posting", key))
+        if index is None:
+            index = defaultdict(set)
+            for pos, entry in enumerate(self.entries):
+                for posting in getattr(entry, "postings", None) or ():
+                    value = _key_value(posting, key)
+                    if value is not None:
+                        index[value].add(pos)
+            index = self._values[("posting", key)] = dict(index)
+        return index
+
+
+def _key_value(obj: Any, key: str) -> str | None:
+    """Get the string that a key filter matches against (if any)."""
+    if hasattr(obj, key):
+        return str(getattr(obj, key) or "")
+    if obj.meta is not None and key in obj.meta:
+        return str(obj.meta.get(key))
+    return None
+
+
+def _matching(
+    values: dict[str, set[int]], match: Callable[[str], bool]
+) -> set[int]:
+    """The union of the positions for all values that match."""
+    result: set[int] = set()
+    for value, positions in values.items():
+        if match(value):
+            result |= positions
+    return result
+
+
+class _Compiler:
+    """Generate the source of a single Python function for a predicate.
+
+    All values from the filter string are passed in the namespace of the
+    function, so only generated names end up in the source.
+    """
+
+    def __init__(self) -> None:
+        self.namespace: dict[str, Any] = {}
+        self._count = 0
+
+    def name(self, prefix: str = "_v") -> str:
+        """Get a new unique variable name."""
+        self._count += 1
+        return f"{prefix}{self._count}"
+
+    def const(self, value: Any) -> str:
+        """Add a value to the namespace and get its name."""
+        name = self.name("_c")
+        self.namespace[name] = value
+        return name
+
+    def match(self, match: Match | MatchAmount, value: str) -> str:
+        """Get an expression for matching the value expression."""
+        if isinstance(match, MatchAmount):
+            number = self.name()
+            # Compare to the absolute value to simplify this filter.
+            return (
+                f'(({number} := getattr({value}, "number", None)) is not None'
+                f" and abs({number}) {'==' if match.op == '=' else match.op} "
+                f"{self.const(match.value)})"
+            )
+        if match.regex_search is None:
+            return f"(str({value}) == {self.const(match.string)})"
+        search = self.const(match.regex_search)
+        return f"({search}(str({value})) is not None)"
+
+    def function(self, predicate: _Predicate) -> Callable[[Any], bool]:
+        """Compile the predicate to a function."""
+        expr = predicate.source(self, "_obj")
+        source = f"def _filter(_obj):\n    return bool({expr})"
+        exec(source, self.namespace)  # noqa: S102
+        return self.namespace["_filter"]  # type: ignore[no-any-return]
+
+
+class _Predicate(ABC):
+    """A parsed filter expression.
+
+    A predicate can be called on an entry (or posting) and can (possibly)
+    compute the set of matching entry positions from a :class:`FilterIndex`.
+
+    For evaluation on many entries, the whole expression is compiled into a
+    single function (see :attr:`function`), with the operands of `and` and
+    `or` ordered to evaluate cheap and selective checks (like tags) first.
+    """
+
+    __slots__ = ("_function",)
+
+    _function: Callable[[Any], bool]
+    #: Rough relative cost of evaluating the predicate on an entry.
+    cost = 1
+
+    @abstractmethod
+    def __call__(self, obj: Any) -> bool:
+        """Whether the entry or posting matches."""
+
+    @abstractmethod
+    def source(self, compiler: _Compiler, var: str) -> str:
+        """Python expression for this predicate on the variable."""
+
+    @property
+    def function(self) -> Callable[[Any], bool]:
+        """The predicate compiled to a single function."""
+        try:
+            return self._function
+        except AttributeError:
+            self._function = _Compiler().function(self)
+            return self._function
+
+    def select(self, index: FilterIndex) -> AbstractSet[int] | None:
+        """Get the positions of all matching entries.
+
+        Returns:
+            The set of positions or None if this cannot be computed with the
+            index and the predicate has to be called on each entry instead.
+        """
+        return None
+
+
+class _Tag(_Predicate):
+    __slots__ = ("tag",)
+
+    def __init__(self, tag: str) -> None:
+        self.tag = tag
+
+    def __call__(self, obj: Any) -> bool:
+        tags = getattr(obj, "tags", None)
+        return (self.tag in tags) if tags is not None else False
+
+    def source(self, compiler: _Compiler, var: str) -> str:
+        tag = compiler.const(self.tag)
+        return f'({tag} in (getattr({var}, "tags", None) or ()))'
+
+    def select(self, index: FilterIndex) -> AbstractSet[int]:
+        return index.tags.get(self.tag, set())
+
+
+class _Link(_Predicate):
+    __slots__ = ("link",)
+
+    def __init__(self, link: str) -> None:
+        self.link = link
+
+    def __call__(self, obj: Any) -> bool:
+        links = getattr(obj, "links", None)
+        return (self.link in links) if links is not None else False
+
+    def source(self, compiler: _Compiler, var: str) -> str:
+        link = compiler.const(self.link)
+        return f'({link} in (getattr({var}, "links", None) or ()))'
+
+    def select(self, index: FilterIndex) -> AbstractSet[int]:
+        return index.links.get(self.link, set())
+
+
+class _String(_Predicate):
+    __slots__ = ("match",)
+
+    NAMES = ("narration", "payee", "comment")
+    cost = 6
+
+    def __init__(self, string: str) -> None:
+        self.match = Match(string)
+
+    def __call__(self, obj: Any) -> bool:
+        for name in self.NAMES:
+            value = getattr(obj, name, "")
+            if value and self.match(value):
+                return True
+        return False
+
+    def source(self, compiler: _Compiler, var: str) -> str:
+        checks = []
+        for name in self.NAMES:
+            value = compiler.name()
+            checks.append(
+                f'(({value} := getattr({var}, "{name}", ""))'
+                f" and {compiler.match(self.match, value)})"
+            )
+        return f"({' or '.join(checks)})"
+
+    def select(self, index: FilterIndex) -> AbstractSet[int]:
+        result: set[int] = set()
+        for name in self.NAMES:
+            result |= _matching(index.attribute_values(name), self.match)
+        return result
+
+
+class _Key(_Predicate):
+    __slots__ = ("key", "match")
+
+    cost = 4
+
+    def __init__(self, key: str, match: Match | MatchAmount) -> None:
+        self.key = key
+        self.match = match
+
+    def __call__(self, obj: Any) -> bool:
+        key = self.key
+        if hasattr(obj, key):
+            return self.match(getattr(obj, key) or "")
+        if obj.meta is not None and key in obj.meta:
+            return self.match(obj.meta.get(key))
+        return False
+
+    def source(self, compiler: _Compiler, var: str) -> str:
+        key = compiler.const(self.key)
+        attribute = compiler.match(
+            self.match, f'(getattr({var}, {key}) or "")'
+        )
+        meta = compiler.match(self.match, f"{var}.meta.get({key})")
+        return (
+            f"({attribute} if hasattr({var}, {key}) else "
+            f"({var}.meta is not None and {key} in {var}.meta and {meta}))"
+        )
+
+    def select(self, index: FilterIndex) -> AbstractSet[int] | None:
+        if not isinstance(self.match, Match):
+            return None
+        return _matching(index.key_values(self.key), self.match)
+
+
+class _Units(_Predicate):
+    __slots__ = ("match",)
+
+    cost = 8
+
+    def __init__(self, match: MatchAmount) -> None:
+        self.match = match
+
+    def __call__(self, obj: Any) -> bool:
+        match = self.match
+        return any(
+            match(posting.units) for posting in getattr(obj, "postings", [])
+        )
+
+    def source(self, compiler: _Compiler, var: str) -> str:
+        posting = compiler.name("_p")
+        match = compiler.match(self.match, f"{posting}.units")
+        return f'any({match} for {posting} in getattr({var}, "postings", ()))'
+
+
+class _AllPostings(_Predicate):
+    __slots__ = ("expr",)
+
+    def __init__(self, expr: _Predicate) -> None:
+        self.expr = expr
+
+    def __call__(self, obj: Any) -> bool:
+        expr = self.expr
+        return all(expr(posting) for posting in getattr(obj, "postings", []))
+
+    @property
+    def cost(self) -> int:  # type: ignore[override]
+        return 3 + 3 * self.expr.cost
+
+    def source(self, compiler: _Compiler, var: str) -> str:
+        posting = compiler.name("_p")
+        expr = self.expr.source(compiler, posting)
+        return f'all({expr} for {posting} in getattr({var}, "postings", ()))'
+
+
+class _AnyPosting(_Predicate):
+    __slots__ = ("expr",)
+
+    def __init__(self, expr: _Predicate) -> None:
+        self.expr = expr
+
+    def __call__(self, obj: Any) -> bool:
+        expr = self.expr
+        return any(expr(posting) for posting in getattr(obj, "postings", []))
+
+    @property
+    def cost(self) -> int:  # type: ignore[override]
+        return 3 + 3 * self.expr.cost
+
+    def source(self, compiler: _Compiler, var: str) -> str:
+        posting = compiler.name("_p")
+        expr = self.expr.source(compiler, posting)
+        return f'any({expr} for {posting} in getattr({var}, "postings", ()))'
+
+    def select(self, index: FilterIndex) -> AbstractSet[int] | None:
+        expr = self.expr
+        if isinstance(expr, _Key) and isinstance(expr.match, Match):
+            return _matching(index.posting_key_values(expr.key), expr.match)
+        return None
+
+
+class _And(_Predicate):
+    __slots__ = ("left", "right")
+
+    def __init__(self, left: _Predicate, right: _Predicate) -> None:
+        self.left = left
+        self.right = right
+
+    def __call__(self, obj: Any) -> bool:
+        return self.left(obj) and self.right(obj)
+
+    @property
+    def cost(self) -> int:  # type: ignore[override]
+        return self.left.cost + self.right.cost
+
+    def operands(self) -> list[_Predicate]:
+        """The operands of this and nested ands."""
+        return [
+            operand
+            for side in (self.left, self.right)
+            for operand in (
+                side.operands() if isinstance(side, _And) else [side]
+            )
+        ]
+
+    def source(self, compiler: _Compiler, var: str) -> str:
+        operands = sorted(self.operands(), key=lambda operand: operand.cost)
+        sources = [operand.source(compiler, var) for operand in operands]
+        return f"({' and '.join(sources)})"
+
+    def select(self, index: FilterIndex) -> AbstractSet[int] | None:
+        left = self.left.select(index)
+        right = self.right.select(index)
+        if left is not None and right is not None:
+            return left & right
+        # Only check the candidates from one side with the other predicate.
+        if left is not None:
+            entries, other = index.entries, self.right.function
+            return {pos for pos in left if other(entries[pos])}
+        if right is not None:
+            entries, other = index.entries, self.left.function
+            return {pos for pos in right if other(entries[pos])}
+        return None
+
+
+class _Or(_Predicate):
+    __slots__ = ("left", "right")
+
+    def __init__(self, left: _Predicate, right: _Predicate) -> None:
+        self.left = left
+        self.right = right
+
+    def __call__(self, obj: Any) -> bool:
+        return self.left(obj) or self.right(obj)
+
+    @property
+    def cost(self) -> int:  # type: ignore[override]
+        return self.left.cost + self.right.cost
+
+    def operands(self) -> list[_Predicate]:
+        """The operands of this and nested ors."""
+        return [
+            operand
+            for side in (self.left, self.right)
+            for operand in (
+                side.operands() if isinstance(side, _Or) else [side]
+            )
+        ]
+
+    def source(self, compiler: _Compiler, var: str) -> str:
+        operands = sorted(self.operands(), key=lambda operand: operand.cost)
+        sources = [operand.source(compiler, var) for operand in operands]
+        return f"({' or '.join(sources)})"
+
+    def select(self, index: FilterIndex) -> AbstractSet[int] | None:
+        left = self.left.select(index)
+        if left is None:
+            return None
+        right = self.right.select(index)
+        if right is None:
+            return None
+        return left | right
+
+
+class _Not(_Predicate):
+    __slots__ = ("expr",)
+
+    def __init__(self, expr: _Predicate) -> None:
+        self.expr = expr
+
+    def __call__(self, obj: Any) -> bool:
+        return not self.expr(obj)
+
+    @property
+    def cost(self) -> int:  # type: ignore[override]
+        return self.expr.cost
+
+    def source(self, compiler: _Compiler, var: str) -> str:
+        return f"(not {self.expr.source(compiler, var)})"
+
+    def select(self, index: FilterIndex) -> AbstractSet[int] | None:
+        selected = self.expr.select(index)
+        if selected is None:
+            return None
+        return index.universe - selected
+
+
 class FilterSyntaxParser:
     precedence = (("left", "AND"), ("right", "UMINUS"))
     tokens = FilterSyntaxLexer.tokens
@@ -247,27 +726,13 @@ class FilterSyntaxParser:
         """
         expr : ALL expr ')'
         """
-        expr = p[2]
-
-        def _match_postings(entry: Directive) -> bool:
-            return all(
-                expr(posting) for posting in getattr(entry, "postings", [])
-            )
-
-        p[0] = _match_postings
+        p[0] = _AllPostings(p[2])
 
     def p_expr_any(self, p: list[Any]) -> None:
         """
         expr : ANY expr ')'
         """
-        expr = p[2]
-
-        def _match_postings(entry: Directive) -> bool:
-            return any(
-                expr(posting) for posting in getattr(entry, "postings", [])
-            )
-
-        p[0] = _match_postings
+        p[0] = _AnyPosting(p[2])
 
     def p_expr_parentheses(self, p: list[Any]) -> None:
         """
@@ -279,74 +744,37 @@ class FilterSyntaxParser:
         """
         expr : expr expr %prec AND
         """
-        left, right = p[1], p[2]
-
-        def _and(entry: Directive) -> bool:
-            return left(entry) and right(entry)  # type: ignore[no-any-return]
-
-        p[0] = _and
+        p[0] = _And(p[1], p[2])
 
     def p_expr_or(self, p: list[Any]) -> None:
         """
         expr : expr ',' expr
         """
-        left, right = p[1], p[3]
-
-        def _or(entry: Directive) -> bool:
-            return left(entry) or right(entry)  # type: ignore[no-any-return]
-
-        p[0] = _or
+        p[0] = _Or(p[1], p[3])
 
     def p_expr_negated(self, p: list[Any]) -> None:
         """
         expr : '-' expr %prec UMINUS
         """
-        func = p[2]
-
-        def _neg(entry: Directive) -> bool:
-            return not func(entry)
-
-        p[0] = _neg
+        p[0] = _Not(p[2])
 
     def p_simple_expr_TAG(self, p: list[Any]) -> None:  # noqa: N802
         """
         simple_expr : TAG
         """
-        tag = p[1]
-
-        def _tag(entry: Directive) -> bool:
-            tags = getattr(entry, "tags", None)
-            return (tag in tags) if tags is not None else False
-
-        p[0] = _tag
+        p[0] = _Tag(p[1])
 
     def p_simple_expr_LINK(self, p: list[Any]) -> None:  # noqa: N802
         """
         simple_expr : LINK
         """
-        link = p[1]
-
-        def _link(entry: Directive) -> bool:
-            links = getattr(entry, "links", None)
-            return (link in links) if links is not None else False
-
-        p[0] = _link
+        p[0] = _Link(p[1])
 
     def p_simple_expr_STRING(self, p: list[Any]) -> None:  # noqa: N802
         """
         simple_expr : STRING
         """
-        string = p[1]
-        match = Match(string)
-
-        def _string(entry: Directive) -> bool:
-            for name in ("narration", "payee", "comment"):
-                value = getattr(entry, name, "")
-                if value and match(value):
-                    return True
-            return False
-
-        p[0] = _string
+        p[0] = _String(p[1])
 
     def p_simple_expr_key(self, p: list[Any]) -> None:
         """
@@ -357,30 +785,14 @@ class FilterSyntaxParser:
         match: Match | MatchAmount = (
             Match(value) if op == ":" else MatchAmount(op, value)
         )
-
-        def _key(entry: Directive) -> bool:
-            if hasattr(entry, key):
-                return match(getattr(entry, key) or "")
-            if entry.meta is not None and key in entry.meta:
-                return match(entry.meta.get(key))
-            return False
-
-        p[0] = _key
+        p[0] = _Key(key, match)
 
     def p_simple_expr_units(self, p: list[Any]) -> None:
         """
         simple_expr : CMP_OP NUMBER
         """
         op, value = p[1], p[2]
-        match = MatchAmount(op, value)
-
-        def _range(entry: Directive) -> bool:
-            return any(
-                match(posting.units)
-                for posting in getattr(entry, "postings", [])
-            )
-
-        p[0] = _range
+        p[0] = _Units(MatchAmount(op, value))
 
 
 class EntryFilter(ABC):
@@ -409,6 +821,13 @@ class TimeFilter(EntryFilter):
         self.date_range = DateRange(begin, end)
 
     def apply(self, entries: Sequence[Directive]) -> Sequence[Directive]:
+        # The entries are sorted by date and those after the end of the date
+        # range do not affect the result, so only clamp the ones before it.
+        entries = slice_entry_dates(
+            entries, datetime.date.min, self.date_range.end
+        )
+        if not entries:
+            return []
         clamped_entries, _ = clamp_opt(
             entries,  # type: ignore[arg-type]
             self.date_range.begin,
@@ -427,25 +846,55 @@ PARSE = ply.yacc.yacc(
 ).parse
 
 
+@lru_cache(maxsize=256)
+def _parse_filter(value: str) -> _Predicate:
+    """Parse a filter string (the parsed predicates are immutable)."""
+    tokens = LEXER.lex(value)
+    return PARSE(  # type: ignore[no-any-return]
+        lexer="NONE",
+        tokenfunc=lambda toks=tokens: next(toks, None),
+    )
+
+
 class AdvancedFilter(EntryFilter):
-    """Filter by tags and links and keys."""
+    """Filter by tags and links and keys.
 
-    __slots__ = ("_include",)
+    If a :class:`FilterIndex` is given, the filter is evaluated on it as far
+    as possible. Entries that are not in the index (like the summarisation
+    entries of a time filter) are always checked individually.
+    """
 
-    def __init__(self, value: str) -> None:
+    __slots__ = ("_include", "_index", "_predicate")
+
+    def __init__(self, value: str, index: FilterIndex | None = None) -> None:
+        self._index = index
         try:
-            tokens = LEXER.lex(value)
-            self._include = PARSE(
-                lexer="NONE",
-                tokenfunc=lambda toks=tokens: next(toks, None),
-            )
+            self._predicate = _parse_filter(value)
         except FilterError as exception:
             exception.message += value
             raise
+        self._include = self._predicate.function
 
     def apply(self, entries: Sequence[Directive]) -> Sequence[Directive]:
         include = self._include
-        return [entry for entry in entries if include(entry)]
+        index = self._index
+        selected = (
+            self._predicate.select(index) if index is not None else None
+        )
+        if index is None or selected is None:
+            return [entry for entry in entries if include(entry)]
+        if entries is index.entries:
+            return [entries[pos] for pos in sorted(selected)]
+        positions = index.positions
+        return [
+            entry
+            for entry in entries
+            if (
+                include(entry)
+                if (pos := positions.get(id(entry))) is None
+                else pos in selected
+            )
+        ]
 
 
 class AccountFilter(EntryFilter):
@@ -364,14 +364,38 @@ def load_import_config(
 
 
 class IngestModule(FavaModule):
-    """Exposes ingest functionality."""
+    """Exposes ingest functionality.
+
+    Running the import config can be slow, so it is only loaded on first use
+    after a load of the ledger.
+    """
+
+    lazy = True
 
     def __init__(self, ledger: FavaLedger) -> None:
         super().__init__(ledger)
-        self.importers: Mapping[str, WrappedImporter] = {}
-        self.hooks: Hooks = []
+        self._importers: Mapping[str, WrappedImporter] = {}
+        self._hooks: Hooks = []
         self.mtime: int | None = None
-        self.errors: list[IngestError] = []
+        self._errors: list[IngestError] = []
+
+    @property
+    def importers(self) -> Mapping[str, WrappedImporter]:
+        """The importers of the import config by name."""
+        self.ensure_loaded()
+        return self._importers
+
+    @property
+    def hooks(self) -> Hooks:
+        """The hooks of the import config."""
+        self.ensure_loaded()
+        return self._hooks
+
+    @property
+    def errors(self) -> list[IngestError]:
+        """Errors on loading the import config."""
+        self.ensure_loaded()
+        return self._errors
 
     @property
     def module_path(self) -> Path | None:
@@ -382,7 +406,7 @@ class IngestModule(FavaModule):
         return self.ledger.join_path(config_path)
 
     def _error(self, msg: str) -> None:
-        self.errors.append(
+        self._errors.append(
             IngestError(
                 {"filename": str(self.module_path), "lineno": 0},
                 msg,
@@ -391,7 +415,7 @@ class IngestModule(FavaModule):
         )
 
     def load_file(self) -> None:  # noqa: D102
-        self.errors = []
+        self._errors = []
         module_path = self.module_path
         if module_path is None:
             return
@@ -405,7 +429,7 @@ class IngestModule(FavaModule):
             return
 
         try:
-            self.importers, self.hooks = load_import_config(module_path)
+            self._importers, self._hooks = load_import_config(module_path)
             self.mtime = new_mtime
         except FavaAPIError as error:  # pragma: no cover
             msg = f"Error in import config '{module_path}': {error!s}"
@@ -13,6 +13,7 @@ if TYPE_CHECKING:  # pragma: no cover
     import datetime
     from collections.abc import Callable
     from collections.abc import Iterator
+    from collections.abc import Mapping
     from typing import Concatenate
     from typing import ParamSpec
 
@@ -26,6 +27,36 @@ ZERO = Decimal()
 InventoryKey = tuple[str, Cost | None]
 
 
+def to_scaled(number: Decimal, scale: int) -> int | None:
+    """Get the number as an integer multiple of ``10**-scale``.
+
+    Returns:
+        The integer or None if the number has more decimal places than
+        `scale` (or is not finite).
+    """
+    sign, digits, exponent = number.as_tuple()
+    if not isinstance(exponent, int) or exponent < -scale:
+        return None
+    value: int = int("".join(map(str, digits))) * 10 ** (exponent + scale)
+    return -value if sign else value
+
+
+def from_scaled(
+    value: int, scale: int, exponent: int | None = None
+) -> Decimal:
+    """Get the Decimal for an integer multiple of ``10**-scale``.
+
+    Args:
+        value: The scaled integer.
+        scale: The scale of the integer.
+        exponent: The exponent of the result, which has to be at least
+            `-scale`; defaults to `-scale`.
+    """
+    if exponent is None or exponent == -scale:
+        return Decimal(f"{value}E{-scale}")
+    return Decimal(f"{value // 10 ** (scale + exponent)}E{exponent}")
+
+
 class _Amount(NamedTuple):
     number: Decimal
     currency: str
@@ -162,3 +193,72 @@ class CounterInventory(dict[InventoryKey, Decimal]):
                     self.pop(key, None)
                 else:
                     self[key] = new_num
+
+
+class FixedPointInventory:
+    """Exact sums of numbers per currency, kept as scaled integers.
+
+    Numbers are added up as integer multiples of ``10**-scale``, with the
+    scale of each currency given on creation (like the maximum number of
+    decimal places of the currency in the ledger). This is exact, unlike
+    floats, and adding up integers is much faster than adding up Decimals.
+    If a number with more decimal places than the scale of its currency is
+    added, the sum for that currency falls back to Decimal.
+
+    Args:
+        scales: The scale for each currency.
+    """
+
+    __slots__ = ("_sums", "scales")
+
+    def __init__(self, scales: Mapping[str, int]) -> None:
+        self.scales = scales
+        self._sums: dict[str, int | Decimal] = {}
+
+    def add_scaled(self, currency: str, value: int) -> None:
+        """Add an integer multiple of ``10**-scale`` of the currency."""
+        total = self._sums.get(currency, 0)
+        if isinstance(total, int):
+            self._sums[currency] = total + value
+        else:
+            self._sums[currency] = total + from_scaled(
+                value, self.scales[currency]
+            )
+
+    def add(self, currency: str, number: Decimal) -> None:
+        """Add a number of the currency."""
+        total = self._sums.get(currency, 0)
+        scale = self.scales.get(currency)
+        if isinstance(total, int) and scale is not None:
+            value = to_scaled(number, scale)
+            if value is not None:
+                self._sums[currency] = total + value
+                return
+            if total:
+                total = from_scaled(total, scale)
+        self._sums[currency] = total + number
+
+    def add_amount(self, amount: Amount) -> None:
+        """Add an Amount."""
+        self.add(amount.currency, amount.number)
+
+    def copy(self) -> FixedPointInventory:
+        """Get a copy of the inventory."""
+        inventory = FixedPointInventory(self.scales)
+        inventory._sums = self._sums.copy()
+        return inventory
+
+    def __bool__(self) -> bool:
+        return bool(self._sums)
+
+    def to_dict(self) -> dict[str, Decimal]:
+        """Get the sums as Decimals (including ones that are zero)."""
+        scales = self.scales
+        return {
+            currency: (
+                from_scaled(total, scales[currency])
+                if isinstance(total, int)
+                else total
+            )
+            for currency, total in self._sums.items()
+        }
@@ -0,0 +1,185 @@
+"""Index of the journal entries of the accounts."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from fava.beans.account import account_tester
+from fava.beans.account import get_entry_accounts
+from fava.beans.account import parent
+
+if TYPE_CHECKING:  # pragma: no cover
+    import datetime
+    from collections.abc import Callable
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+    from decimal import Decimal
+
+    from fava.beans.abc import Directive
+    from fava.core.inventory import FixedPointInventory
+    from fava.core.postings import PostingStore
+
+
+#: The default number of entries in a page of a journal.
+JOURNAL_PAGE_SIZE = 200
+
+#: The number of entries between two checkpoints of the journal balance.
+JOURNAL_CHECKPOINT_INTERVAL = 64
+
+
+@dataclass(frozen=True)
+class JournalPage:
+    """A page of the journal of an account.
+
+    The rows are (entry, change, balance) tuples like those of
+    :meth:`FavaLedger.account_journal_with_balance` - the balances run over
+    the whole journal, not just this page.
+    """
+
+    rows: Sequence[
+        tuple[Directive, Mapping[str, Decimal], Mapping[str, Decimal]]
+    ]
+    #: The position of the first row in the journal.
+    offset: int
+    #: The number of entries in the journal.
+    total: int
+
+
+class AccountEntryIndex:
+    """The positions of the entries of every account in a list of entries.
+
+    For each account, the positions of the entries that reference it and
+    of the entries that reference it or one of its descendants are
+    collected in a single pass, so getting the journal of an account does
+    not require going through all entries.
+
+    Args:
+        entries: A sorted list of entries.
+    """
+
+    def __init__(self, entries: Sequence[Directive]) -> None:
+        self.entries = entries
+        self._own: dict[str, list[int]] = {}
+        self._with_children: dict[str, list[int]] = {}
+        #: Journal balances every JOURNAL_CHECKPOINT_INTERVAL entries.
+        self._checkpoints: dict[
+            tuple[str, bool], list[FixedPointInventory]
+        ] = {}
+
+        own = self._own
+        with_children = self._with_children
+        for pos, entry in enumerate(entries):
+            accounts = set(get_entry_accounts(entry))
+            for account in accounts:
+                own.setdefault(account, []).append(pos)
+            names: set[str] = set()
+            for account in accounts:
+                name: str | None = account
+                while name and name not in names:
+                    names.add(name)
+                    name = parent(name)
+            for name in names:
+                with_children.setdefault(name, []).append(pos)
+
+    def positions(
+        self, account: str, *, with_children: bool
+    ) -> Sequence[int]:
+        """The positions of the entries in the journal of the account.
+
+        Args:
+            account: An account name - all entries are in the journal of
+                the empty account.
+            with_children: Whether to include the entries of descendants.
+        """
+        if not account:
+            return range(len(self.entries))
+        index = self._with_children if with_children else self._own
+        return index.get(account, [])
+
+    def journal(
+        self, account: str, *, with_children: bool
+    ) -> list[Directive]:
+        """The entries in the journal of the account."""
+        entries = self.entries
+        return [
+            entries[pos]
+            for pos in self.positions(account, with_children=with_children)
+        ]
+
+    def offset_at(
+        self, account: str, date: datetime.date, *, with_children: bool
+    ) -> int:
+        """The offset of the first entry in the journal on or after date."""
+        entries = self.entries
+        return bisect_left(
+            self.positions(account, with_children=with_children),
+            date,
+            key=lambda pos: entries[pos].date,
+        )
+
+    def opening_balance(
+        self,
+        postings: PostingStore,
+        account: str,
+        offset: int,
+        *,
+        with_children: bool,
+    ) -> FixedPointInventory:
+        """The balance (in units) before an entry of the journal.
+
+        The balances at every :data:`JOURNAL_CHECKPOINT_INTERVAL` entries
+        are computed on first use for each account, after that only the
+        entries since the last checkpoint have to be added up.
+
+        Args:
+            postings: The posting store to add up the units with.
+            account: An account name.
+            offset: The position of the entry in the journal.
+            with_children: Whether to include the entries of descendants.
+        """
+        entries = self.entries
+        positions = self.positions(account, with_children=with_children)
+        is_account = journal_account_tester(
+            account, with_children=with_children
+        )
+        key = (account, with_children)
+        checkpoints = self._checkpoints.get(key)
+        if checkpoints is None:
+            checkpoints = []
+            balance = None
+            for start in range(0, len(positions), JOURNAL_CHECKPOINT_INTERVAL):
+                end = start + JOURNAL_CHECKPOINT_INTERVAL
+                balance = postings.units_balance(
+                    (entries[pos] for pos in positions[start:end]),
+                    is_account,
+                    balance,
+                )
+                checkpoints.append(balance)
+            self._checkpoints[key] = checkpoints
+        offset = min(offset, len(positions))
+        checkpoint = offset // JOURNAL_CHECKPOINT_INTERVAL
+        start = checkpoint * JOURNAL_CHECKPOINT_INTERVAL
+        return postings.units_balance(
+            (entries[pos] for pos in positions[start:offset]),
+            is_account,
+            checkpoints[checkpoint - 1] if checkpoint else None,
+        )
+
+
+def _any_account(_account: str) -> bool:
+    return True
+
+
+def journal_account_tester(
+    account: str, *, with_children: bool
+) -> Callable[[str], bool]:
+    """Which postings are in the journal of the account.
+
+    Like :func:`fava.beans.account.account_tester`, but all accounts are
+    in the journal of the empty account.
+    """
+    if not account:
+        return _any_account
+    return account_tester(account, with_children=with_children)
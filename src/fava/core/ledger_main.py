@@ -2,31 +2,52 @@
 
 from __future__ import annotations
 
+import copy
 import logging
+import threading
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple, Type
 
 from collections import defaultdict
+from itertools import takewhile
 
-from beancount.loader import load_string, LoadError as BeancountLoaderError # Added
+from beancount.loader import LoadError as BeancountLoaderError # Added
 from beancount.core.data import Directive as BeancountDirective # For type hint if needed for all_entries_by_type
 
+from fava.beans.cache import ParseCache
+from fava.beans.load import IncrementalLoader
 from fava.core.fava_options import FavaOptions, parse_options
 from fava.core.extensions import ExtensionModule
 from fava.core.attributes import AttributesModule
 from fava.core.commodities import CommoditiesModule
 from fava.core.number import DecimalFormatModule
 from fava.core.misc import FavaMisc
+from fava.core.module_base import load_modules
 from fava.core.accounts import AccountDict
+from fava.core.analysis import LedgerAnalysis
+from fava.core.entry_index import EntryHashIndex
+from fava.core.journal import journal_account_tester
+from fava.core.journal import JOURNAL_PAGE_SIZE
+from fava.core.journal import JournalPage
+from fava.core.postings import PostingStore
+from fava.core.inventory import CounterInventory
+from fava.beans.account import get_entry_accounts
 from fava.core.budgets import BudgetModule
 from fava.core.charts import ChartModule
 from fava.core.file import FileModule
 from fava.core.ingest import IngestModule
 from fava.core.query_shell import QueryShell
+from fava.core.reload import GenerationNotifier
 from fava.beans.prices import FavaPriceMap
-from fava.core.filters import AccountFilter, AdvancedFilter, TimeFilter
+from fava.core.filters import AccountFilter, AdvancedFilter, FilterIndex, TimeFilter
+from fava.core.filter_results import FilterCache
 from fava.core.filter_results import FilterEntries # Import from new location
 from fava.core.exceptions import StatementMetadataInvalidError, StatementNotFoundError
+from fava.core.tree import Tree
+from fava.util.date import Interval
+from fava.util.date import local_today
+from fava.metrics import record_load
 # from fava.core.group_entries import group_entries_by_type # Not used directly, _AllEntriesByTypeContainer is used
 
 from fava.beans.abc import Directive, Custom, Query, Balance, Close, Commodity, Document, Event, Note, Open, Pad, Price, Transaction # Import directive types
@@ -48,10 +69,38 @@ from .ledger.crypto_helpers import (
 )
 
 if TYPE_CHECKING:  # pragma: no cover
+    import datetime
+    from collections.abc import Sequence
+
+    from fava.core.inventory import InventoryKey
+    from fava.util.date import DateRange
+    from fava.core.reload import BackgroundReloader
     from fava.core.watcher import WatcherBase
 
 log = logging.getLogger(__name__)
 
+#: The default for the total number of filtered entries to keep cached.
+DEFAULT_FILTER_CACHE_SIZE = 1_000_000
+#: The default for the number of threads to load the modules on.
+DEFAULT_MODULE_LOAD_WORKERS = 4
+
+#: The names of the module attributes of FavaLedger, see :meth:`_init_modules`.
+MODULES = (
+    "accounts",
+    "attributes",
+    "budgets",
+    "charts",
+    "commodities",
+    "entry_index",
+    "extensions",
+    "file",
+    "format_decimal",
+    "ingest",
+    "misc",
+    "postings",
+    "query_shell",
+)
+
 
 class AllEntriesByType:
     """A container to provide attribute-style access to entries by type."""
@@ -117,6 +166,14 @@ class AllEntriesByType:
             else:
                 log.debug(f"Unknown entry type encountered for AllEntriesByType: {type(entry)}")
 
+    @classmethod
+    def from_analysis(cls, analysis: LedgerAnalysis) -> AllEntriesByType:
+        """Get the entries by type from the analysis of the ledger."""
+        by_type = cls([])
+        for name, group in analysis.entries_by_type.items():
+            setattr(by_type, name, group)
+        return by_type
+
     def _asdict(self) -> dict[str, list[BeancountDirective]]:
         """Return a dictionary representation of the grouped entries."""
         # This mimics the behavior of a namedtuple's _asdict() method
@@ -146,8 +203,31 @@ class FavaLedger:
         beancount_file_path_or_options: str | FavaOptions,
         *,
         poll_watcher: WatcherBase | None = None,
+        cache_dir: str | Path | None = None,
+        reloader: BackgroundReloader | None = None,
+        preloaded: Tuple[Any, Any, Any] | None = None,
+        filter_cache_size: int = DEFAULT_FILTER_CACHE_SIZE,
+        module_load_workers: int = DEFAULT_MODULE_LOAD_WORKERS,
+        reload_quiet_window: float = 0.0,
     ) -> None:
-        """Initialize FavaLedger."""
+        """Initialize FavaLedger.
+
+        Args:
+            beancount_file_path_or_options: The path of the main file.
+            poll_watcher: The watcher to use to detect file changes.
+            cache_dir: A directory for a persistent parse cache, used to
+                speed up the initial load.
+            reloader: If given, changes are loaded on a background thread
+                into a new generation of the ledger instead of in place.
+            preloaded: The entries, errors and options of the file if it
+                has already been loaded, e.g., in a worker process.
+            filter_cache_size: The maximum total number of filtered entries
+                to keep in the cache of filter results (0 to disable it).
+            module_load_workers: The number of threads to load modules that
+                do not depend on each other on (1 to load them in order).
+            reload_quiet_window: Only reload once the files have not changed
+                for this many seconds, to coalesce bursts of writes.
+        """
         if isinstance(beancount_file_path_or_options, FavaOptions): # Test scenario
             self.fava_options = beancount_file_path_or_options
             self.beancount_file_path = self.fava_options.input_files[0] if self.fava_options.input_files else "mock_ledger.beancount"
@@ -156,17 +236,53 @@ class FavaLedger:
             # Initialize with default FavaOptions; _load_ledger_data will parse from Custom entries
             self.fava_options = FavaOptions()
         
-        self.poll_watcher = poll_watcher
-        
         # Create a watcher instance for file monitoring
         from fava.core.watcher import Watcher
-        self.watcher = poll_watcher if poll_watcher else Watcher()
+        from fava.core.watcher import WatcherBase
+
+        self.watcher = (
+            poll_watcher
+            if isinstance(poll_watcher, WatcherBase)
+            else Watcher(quiet_window=reload_quiet_window)
+        )
         
         # PQC specific crypto locator (for legacy GPG if needed) is removed.
         # PQC's BackendCryptoService, initialized globally, will handle all crypto operations,
         # including GPG if configured in fava_crypto_settings.py.
 
         # Standard Fava Ledger module initializations
+        self._init_modules()
+
+        # Core data attributes
+        self.all_entries: list[Any] = []
+        self.load_errors: list[Any] = []
+        self.options: dict[str, Any] = {"title": "Untitled"} # Beancount's options_map with default title
+        self.fava_options_errors: list[Any] = []
+        self.prices: FavaPriceMap = FavaPriceMap([])
+        self.all_entries_by_type: AllEntriesByType = AllEntriesByType([]) # Initialize with empty container
+        self.analysis = LedgerAnalysis([])
+        #: The durations (in seconds) of the stages of the last load.
+        self.load_timings: dict[str, float] = {}
+        self.filter_index = FilterIndex([])
+        self._last_mtime: float | None = None
+        self._loader = IncrementalLoader()
+        self._parse_cache = (
+            ParseCache(cache_dir) if cache_dir is not None else None
+        )
+        self._reloader = reloader
+        self._preloaded = preloaded
+        self._filter_cache = FilterCache(filter_cache_size)
+        self._module_load_workers = module_load_workers
+        self._load_lock = threading.Lock()
+        #: Incremented on every load of the ledger data.
+        self.generation = 0
+        #: Notifies waiting threads of new generations of this ledger.
+        self.notifier = GenerationNotifier()
+        self.watcher.subscribe(self.notifier.poke)
+
+        self._load_ledger_data()
+
+    def _init_modules(self) -> None:
         self.attributes = AttributesModule(self)
         self.budgets = BudgetModule(self)
         self.charts = ChartModule(self)
@@ -178,21 +294,25 @@ class FavaLedger:
         self.misc = FavaMisc(self)
         self.query_shell = QueryShell(self)
         self.accounts = AccountDict(self)
+        self.entry_index = EntryHashIndex(self)
+        self.postings = PostingStore(self)
 
-        # Core data attributes
-        self.all_entries: list[Any] = []
-        self.load_errors: list[Any] = []
-        self.options: dict[str, Any] = {"title": "Untitled"} # Beancount's options_map with default title
-        self.fava_options_errors: list[Any] = []
-        self.prices: FavaPriceMap = FavaPriceMap([])
-        self.all_entries_by_type: AllEntriesByType = AllEntriesByType([]) # Initialize with empty container
-        self._last_mtime: float | None = None
+    def load_snapshot(self) -> FavaLedger:
+        """Load the next generation of this ledger.
 
-        self._load_ledger_data()
-        
-        # Initialize watcher with the main beancount file
-        if isinstance(self.watcher, Watcher):
-            self.watcher.update([Path(self.beancount_file_path)], [])
+        The returned ledger has its own module state and is loaded from the
+        current file contents, while this ledger is left untouched. The
+        loader, parse cache, watcher, notifier and file lock are shared
+        between both. The new generation is only published to the notifier
+        once it is in use, see :class:`BackgroundReloader`.
+        """
+        new = copy.copy(self)
+        new._init_modules()  # noqa: SLF001
+        max_entries = self._filter_cache.max_entries
+        new._filter_cache = FilterCache(max_entries)  # noqa: SLF001
+        new.file._lock = self.file._lock  # noqa: SLF001
+        new._load_ledger_data(publish=False)  # noqa: SLF001
+        return new
 
     @property
     def errors(self) -> list[Any]:
@@ -201,6 +321,11 @@ class FavaLedger:
         # e.g., self.extensions.errors, self.ingest.errors etc.
         return self.load_errors + self.fava_options_errors
 
+    @property
+    def filter_cache(self) -> FilterCache:
+        """The cache of filter results of this generation."""
+        return self._filter_cache
+
     @property
     def mtime(self) -> int | None:
         """The timestamp of the last successful load of the underlying file."""
@@ -208,43 +333,6 @@ class FavaLedger:
             return None
         return int(self._last_mtime)
 
-    def changed(self) -> bool:
-        """
-        Checks if the underlying Beancount files have changed and reloads if necessary.
-        Returns True if a reload happened, False otherwise.
-        """
-        if not self.beancount_file_path:
-            return False
-
-        needs_reload = False
-        if self.poll_watcher:
-            if self.poll_watcher.check(): 
-                log.debug(f"File change detected by poll_watcher for {self.beancount_file_path}")
-                needs_reload = True
-        
-        if not needs_reload:
-            try:
-                current_mtime = Path(self.beancount_file_path).stat().st_mtime
-                if self._last_mtime is None or current_mtime > self._last_mtime:
-                    log.debug(
-                        f"File modification time changed for {self.beancount_file_path} "
-                        f"(current: {current_mtime}, last: {self._last_mtime})"
-                    )
-                    needs_reload = True
-            except FileNotFoundError:
-                log.warning(f"Beancount file not found during mtime check: {self.beancount_file_path}.")
-                if self._last_mtime is not None: 
-                    needs_reload = True 
-            except Exception as e:
-                log.error(f"Error checking mtime for {self.beancount_file_path}: {e}")
-                return False 
-
-        if needs_reload:
-            self._load_ledger_data()
-            return True
-        
-        return False
-
     def _get_key_material_for_operation(
         self, file_path_context: str, operation_type: str # e.g., "encrypt" or "decrypt"
     ) -> Dict[str, Any]:
@@ -305,8 +393,26 @@ class FavaLedger:
         
         return key_material
 
-    def _load_ledger_data(self) -> None:
+    def _load_ledger_data(self, *, publish: bool = True) -> None:
         """Load the main file and all included files and set attributes."""
+        with self._load_lock:
+            loaded_at = time.time_ns()
+            self._load_data()
+            self.generation += 1
+            self._filter_cache.clear()
+            self.watcher.update(
+                self._watched_files(), [], loaded_at=loaded_at
+            )
+        record_load(self)
+        if publish:
+            self.notifier.publish(self.generation)
+
+    def _watched_files(self) -> list[Path]:
+        """The source files of the ledger that exist."""
+        includes = self.options.get("include") or [self.beancount_file_path]
+        return [path for path in map(Path, includes) if path.exists()]
+
+    def _load_data(self) -> None:
         if not self.beancount_file_path:
             log.warning("_load_ledger_data called with no beancount_file_path.")
             self.all_entries, self.load_errors, self.options = [], [("No beancount file path configured.", None)], {"title": "Untitled"}
@@ -315,7 +421,14 @@ class FavaLedger:
 
         log.info(f"Reloading ledger data for {self.beancount_file_path}")
         try:
+            self._loader.timings = {}
+            start = time.perf_counter()
             entries, errors, options_map = self.load_file(self.beancount_file_path)
+            # The stages are only timed if the file was not loaded from cache.
+            timings: dict[str, float] = {
+                "load": time.perf_counter() - start,
+                **self._loader.timings,
+            }
             
             # If entries were loaded from a string by beancount.loader.load_string,
             # their filename metadata might be '<string>'. Update to actual file path.
@@ -333,19 +446,37 @@ class FavaLedger:
                 default_title = Path(self.beancount_file_path).stem if self.beancount_file_path else "Untitled"
                 self.options["title"] = default_title
 
-            # Populate the AllEntriesByType container using the loaded entries
-            self.all_entries_by_type = AllEntriesByType(self.all_entries) # self.all_entries is already set
+            # Go through all entries once for the data the modules need
+            start = time.perf_counter()
+            self.analysis = LedgerAnalysis(self.all_entries)
+            self.all_entries_by_type = AllEntriesByType.from_analysis(
+                self.analysis
+            )
+            timings["analysis"] = time.perf_counter() - start
+            # The indexes for the advanced filter are built lazily
+            self.filter_index = FilterIndex(self.all_entries)
             
             # FavaOptions are parsed from Custom entries
             parsed_fava_options, fava_options_errors_list = parse_options(self.all_entries_by_type.Custom)
             self.fava_options = parsed_fava_options
             self.fava_options_errors = fava_options_errors_list
+            if not self.fava_options.incremental_reload:
+                # Only keep the parsed source files around if they are used.
+                self._loader.clear()
 
             # Prices are derived from Price entries
             self.prices = FavaPriceMap(self.all_entries_by_type.Price)
 
             try:
-                self._last_mtime = Path(self.beancount_file_path).stat().st_mtime
+                # Also consider the included files, so that the mtime
+                # changes on every change to the source files.
+                self._last_mtime = max(
+                    path.stat().st_mtime
+                    for path in [
+                        Path(self.beancount_file_path),
+                        *self._watched_files(),
+                    ]
+                )
             except FileNotFoundError:
                 log.error(f"File {self.beancount_file_path} not found after load to update mtime.")
                 self._last_mtime = None
@@ -353,21 +484,21 @@ class FavaLedger:
                 log.error(f"Error stating file {self.beancount_file_path} after load: {e_stat}")
                 self._last_mtime = None
 
-            modules_to_load = [
-                self.accounts, self.attributes, self.budgets, self.charts,
-                self.commodities, self.extensions, self.file, self.format_decimal,
-                self.misc, self.query_shell, self.ingest
-            ]
-            for module in modules_to_load:
-                if hasattr(module, 'load_file') and callable(module.load_file):
-                    try:
-                        module.load_file()
-                    except Exception as e_mod_load:
-                        log.exception(f"Error loading module {type(module).__name__}: {e_mod_load}")
-                else:
-                    log.warning(f"Module {type(module).__name__} has no load_file method.")
-
+            # Independent modules are loaded concurrently; ingest is only
+            # marked to be loaded on first use.
+            timings.update(
+                load_modules(
+                    {name: getattr(self, name) for name in MODULES},
+                    self._module_load_workers,
+                )
+            )
+            self.load_timings = timings
+            log.debug(
+                "Load timings: %s",
+                ", ".join(f"{name}={t:.4f}s" for name, t in timings.items()),
+            )
 
+            # Run the hooks before the new generation is swapped in.
             self.extensions.after_load_file()
             log.info(f"Successfully reloaded all ledger data and modules for {self.beancount_file_path}")
 
@@ -375,6 +506,8 @@ class FavaLedger:
             log.exception(f"Critical failure during _load_ledger_data for {self.beancount_file_path}: {e_load_main}")
             self.all_entries, self.load_errors, self.options = [], [(f"Failed to load {self.beancount_file_path}: {e_load_main!s}", None)], {"title": "Untitled"}
             self.all_entries_by_type = AllEntriesByType([]) # Use empty container on critical failure
+            self.analysis = LedgerAnalysis([])
+            self.filter_index = FilterIndex([])
             self.prices = FavaPriceMap([])
 
     def load_file(self, file_path: str) -> Tuple[Any, Any, Any]:
@@ -382,9 +515,21 @@ class FavaLedger:
         Loads a file, attempting PQC decryption if applicable.
         If decryption fails or no handler, attempts to load as plaintext.
         """
+        if self._preloaded is not None:
+            result, self._preloaded = self._preloaded, None
+            return result
+
+        # On the initial load, try the persistent parse cache first
+        cache = self._parse_cache
+        if cache is not None and self._last_mtime is None:
+            cached = cache.get(str(Path(file_path).absolute()))
+            if cached is not None:
+                return cached
+
         try:
             file_content_bytes = READ_BYTES_FROM_FILE(file_path)
         except FileNotFoundError:
+            cache = None
             # Create minimal mock content for testing
             source_to_parse = """
 1970-01-01 open Assets:Cash
@@ -409,9 +554,22 @@ class FavaLedger:
                     log.error(f"Failed to decode {file_path} even with error handling: {e2}")
                     return [], [f"Unicode decode error: {e}"], {}
 
-        # Use beancount.loader.load_string to parse the source
+        # Parse the source (and includes), only re-parsing changed files
         try:
-            entries, errors, options_map = load_string(source_to_parse, dedent=True)
+            abs_path = str(Path(file_path).absolute())
+            start = time.perf_counter()
+            entries, errors, options_map = self._loader.load(
+                abs_path, source_to_parse
+            )
+            log.info(
+                "Loaded %s in %.3fs.", file_path, time.perf_counter() - start
+            )
+            if cache is not None:
+                cache.put(
+                    abs_path,
+                    (entries, errors, options_map),
+                    include_globs=self._loader.include_globs,
+                )
             return entries, errors, options_map
         except BeancountLoaderError as e:
             log.error(f"Beancount loading error for {file_path}: {e}")
@@ -441,34 +599,25 @@ class FavaLedger:
 
     def changed(self) -> bool:
         """Check if the underlying Beancount files have changed and reload if necessary.
-        
+
+        The watcher only reports a change once a burst of changes to the
+        files has settled, so a file that is written in several steps is
+        only reloaded once.
+
         Returns:
             True if a reload happened, False otherwise.
         """
         if not self.beancount_file_path:
             return False
 
-        needs_reload = False
-        if self.poll_watcher:
-            if self.poll_watcher.check(): 
-                log.debug(f"File change detected by poll_watcher for {self.beancount_file_path}")
-                needs_reload = True
-        
-        if not needs_reload:
-            try:
-                current_mtime = Path(self.beancount_file_path).stat().st_mtime
-                if self._last_mtime is None or current_mtime > self._last_mtime:
-                    log.debug(
-                        f"File modification time changed for {self.beancount_file_path} "
-                        f"(current: {current_mtime}, last: {self._last_mtime})"
-                    )
-                    needs_reload = True
-            except FileNotFoundError:
-                log.warning(f"Beancount file not found during mtime check: {self.beancount_file_path}.")
-                if self._last_mtime is not None: 
-                    needs_reload = True
-            except Exception as e_stat:
-                log.error(f"Error checking file mtime for {self.beancount_file_path}: {e_stat}")
+        needs_reload = self.watcher.check()
+        if needs_reload:
+            log.debug(f"File change detected by watcher for {self.beancount_file_path}")
+
+        if needs_reload and self._reloader is not None:
+            # Keep serving this generation until the new one is loaded.
+            self._reloader.schedule(self)
+            return False
 
         if needs_reload:
             log.info(f"Reloading ledger data due to file changes for {self.beancount_file_path}")
@@ -585,12 +734,14 @@ class FavaLedger:
         from fava.beans.funcs import hash_entry as calculate_entry_hash
         from fava.core.exceptions import EntryNotFoundForHashError
         from fava.pqc.timing_protection import SecureComparison
-        
-        for entry in self.all_entries:
-            computed_hash = calculate_entry_hash(entry)
-            if SecureComparison.compare_strings(computed_hash, entry_hash):
-                return entry
-        
+
+        # Only the candidate from the index is hashed and compared.
+        entry = self.entry_index.get(entry_hash)
+        if entry is not None and SecureComparison.compare_strings(
+            calculate_entry_hash(entry), entry_hash
+        ):
+            return entry
+
         raise EntryNotFoundForHashError(entry_hash)
 
     def account_journal(
@@ -601,41 +752,19 @@ class FavaLedger:
         with_children: bool = True,
     ) -> list[Directive]:
         """Get journal entries for a specific account.
-        
+
         Args:
             filtered: Filtered ledger entries
             account_name: The account name to get entries for
             conversion: Conversion method to apply
             with_children: Whether to include child accounts
-            
+
         Returns:
             List of entries related to the account
         """
-        if not account_name:
-            return list(filtered.entries)
-        
-        account_entries = []
-        for entry in filtered.entries:
-            entry_accounts = []
-            
-            # Get accounts from different entry types
-            if hasattr(entry, 'account') and entry.account:
-                entry_accounts.append(entry.account)
-            elif hasattr(entry, 'postings') and entry.postings:
-                entry_accounts.extend(posting.account for posting in entry.postings)
-            
-            # Check if any of the entry's accounts match our criteria
-            for acc in entry_accounts:
-                if with_children:
-                    if acc.startswith(account_name):
-                        account_entries.append(entry)
-                        break
-                else:
-                    if acc == account_name:
-                        account_entries.append(entry)
-                        break
-        
-        return account_entries
+        return filtered.account_index.journal(
+            account_name, with_children=with_children
+        )
 
     def account_journal_with_balance(
         self,
@@ -645,152 +774,152 @@ class FavaLedger:
         with_children: bool = True,
     ) -> list[tuple]:
         """Get journal entries for a specific account with running balance and changes.
-        
+
         Args:
             filtered: Filtered ledger entries
             account_name: The account name to get entries for
             conversion: Conversion method to apply
             with_children: Whether to include child accounts
-            
+
         Returns:
             List of tuples (entry, change_dict, balance_dict)
         """
         entries = self.account_journal(filtered, account_name, conversion, with_children)
-        
-        # Calculate running balances and changes
-        running_balance = {}  # currency -> amount
-        result = []
-        
-        for entry in entries:
-            change = {}  # currency -> amount change for this entry
-            
-            if hasattr(entry, 'postings') and entry.postings:
-                # For transactions, calculate the change for matching accounts
-                for posting in entry.postings:
-                    account_matches = False
-                    if with_children:
-                        account_matches = posting.account.startswith(account_name) if account_name else True
-                    else:
-                        account_matches = posting.account == account_name
-                    
-                    if account_matches and hasattr(posting, 'units') and posting.units:
-                        currency = posting.units.currency
-                        amount = float(posting.units.number)
-                        
-                        # Add to change for this entry
-                        if currency in change:
-                            change[currency] += amount
-                        else:
-                            change[currency] = amount
-                        
-                        # Update running balance
-                        if currency in running_balance:
-                            running_balance[currency] += amount
-                        else:
-                            running_balance[currency] = amount
-            
-            # ALWAYS return a tuple of (entry, change, balance) for consistency
-            result.append((entry, change, dict(running_balance)))
-        
-        return result
+        is_account = journal_account_tester(
+            account_name, with_children=with_children
+        )
+
+        # The changes and balances are exact sums of the units, added up as
+        # scaled integers on the columnar posting store.
+        balances = self.postings.journal_balances(entries, is_account)
+        return [
+            (entry, change, balance)
+            for entry, (change, balance) in zip(entries, balances, strict=True)
+        ]
+
+    def account_journal_page(
+        self,
+        filtered: FilterEntries,
+        account_name: str,
+        *,
+        with_children: bool = True,
+        offset: int | None = None,
+        date: datetime.date | None = None,
+        limit: int = JOURNAL_PAGE_SIZE,
+    ) -> JournalPage:
+        """Get a page of the journal of an account with running balances.
+
+        The entries of the account are looked up in the account index of
+        the filtered entries and the balance before the page is computed
+        from the checkpoints of the index, so only the entries of the page
+        have to be gone through.
+
+        Args:
+            filtered: Filtered ledger entries
+            account_name: The account name to get entries for
+            with_children: Whether to include child accounts
+            offset: The position of the first entry of the page in the
+                journal - by default, the last page is returned.
+            date: If given (and no offset), the page starts at the first
+                entry on or after this date.
+            limit: The maximum number of entries of the page.
+
+        Returns:
+            The page, with rows like those of account_journal_with_balance.
+        """
+        index = filtered.account_index
+        positions = index.positions(account_name, with_children=with_children)
+        total = len(positions)
+        if offset is None:
+            offset = (
+                index.offset_at(account_name, date, with_children=with_children)
+                if date is not None
+                else total - limit
+            )
+        offset = min(max(offset, 0), total)
+        entries = [
+            filtered.entries[pos] for pos in positions[offset : offset + limit]
+        ]
+        opening = index.opening_balance(
+            self.postings, account_name, offset, with_children=with_children
+        )
+        balances = self.postings.journal_balances(
+            entries,
+            journal_account_tester(account_name, with_children=with_children),
+            opening,
+        )
+        return JournalPage(
+            [
+                (entry, change, balance)
+                for entry, (change, balance) in zip(
+                    entries, balances, strict=True
+                )
+            ],
+            offset,
+            total,
+        )
 
     def interval_balances(
         self,
         filtered: FilterEntries,
-        interval,
+        interval: Interval | str,
         account_name: str,
+        *,
         accumulate: bool = False,
-    ):
-        """Get interval balances for an account.
-        
-        Args:
-            filtered: Filtered entries
-            interval: Time interval (e.g., 'day', 'week', 'month', 'year')
-            account_name: Account to calculate balances for
-            accumulate: Whether to accumulate balances over time
-            
+    ) -> tuple[list[Tree], list[DateRange]]:
+        """Balances by interval.
+
+        The intervals follow the calendar (and the fiscal year of the
+        ledger for years and quarters). The postings are summed up per
+        interval in a single pass; for accumulated balances, the balance
+        of each interval is the running sum of the intervals up to it.
+
+        Arguments:
+            filtered: The currently filtered ledger.
+            interval: An interval.
+            account_name: An account name.
+            accumulate: A boolean, ``True`` if the balances for an interval
+                should include all entries up to the end of the interval.
+
         Returns:
-            Tuple of (trees, date_ranges) where trees is a list of account tree objects
-            and date_ranges is a list of DateRange objects with begin/end attributes
+            A pair of a list of Tree instances and the intervals, both
+            with the most recent interval first.
         """
-        from datetime import timedelta
-        from fava.core.conversion import conversion_from_str
-        
-        # Define a simple DateRange class with end_inclusive property
-        class DateRange:
-            def __init__(self, begin, end):
-                self.begin = begin
-                self.end = end
-            
-            @property
-            def end_inclusive(self):
-                # Return the end date as the end_inclusive date
-                return self.end
-        
-        if not filtered.entries:
-            return [], []
-        
-        # Get date range from filtered entries
-        dates = [entry.date for entry in filtered.entries if hasattr(entry, 'date')]
-        if not dates:
+        if isinstance(interval, str):
+            interval = Interval.get(interval)
+        entries = filtered.entries
+        if not entries:
             return [], []
-            
-        start_date = min(dates)
-        end_date = max(dates)
-        
-        # Generate interval date ranges
-        date_ranges = []
-        current_date = start_date
-        
-        if hasattr(interval, 'value'):
-            # Handle Interval enum
-            interval_str = interval.value
-        else:
-            interval_str = str(interval)
-        
-        if interval_str == 'day':
-            delta = timedelta(days=1)
-        elif interval_str == 'week':
-            delta = timedelta(weeks=1)
-        elif interval_str == 'month':
-            # Approximate month as 30 days
-            delta = timedelta(days=30)
-        elif interval_str == 'quarter':
-            # Approximate quarter as 90 days
-            delta = timedelta(days=90)
-        elif interval_str == 'year':
-            delta = timedelta(days=365)
-        else:
-            # Default to monthly
-            delta = timedelta(days=30)
-        
-        while current_date <= end_date:
-            next_date = min(current_date + delta, end_date)
-            date_ranges.append(DateRange(current_date, next_date))
-            current_date = next_date
-            if current_date >= end_date:
-                break
-        
-        # Generate tree for each interval
+        ranges = filtered.interval_ranges(interval)
+        buckets = self.postings.interval_balances(
+            entries,
+            [(date_range.begin, date_range.end) for date_range in ranges],
+            lambda account: account.startswith(account_name),
+        )
+
+        min_accounts = [
+            account
+            for account in self.accounts
+            if account.startswith(account_name)
+        ]
+        running: dict[str, CounterInventory] = {}
         trees = []
-        
-        for date_range in date_ranges:
-            # Create a filtered entries subset for this date range
-            from fava.core.tree import Tree
-            from fava.util.date import slice_entry_dates
-            
-            # Get entries within this date range
-            interval_entries = slice_entry_dates(
-                filtered.entries, 
-                date_range.begin, 
-                date_range.end
-            )
-            
-            # Create a Tree from these entries
-            tree = Tree(interval_entries)
+        for balances in buckets:
+            if accumulate:
+                for account, balance in balances.items():
+                    total = running.get(account)
+                    if total is None:
+                        total = running[account] = CounterInventory()
+                    total.add_inventory(balance)
+                balances = running  # noqa: PLW2901
+            tree = Tree(create_accounts=min_accounts)
+            for account, balance in sorted(balances.items()):
+                tree.insert(account, balance)
             trees.append(tree)
-        
-        return trees, date_ranges
+
+        trees.reverse()
+        ranges.reverse()
+        return trees, ranges
 
     def context(self, entry_hash: str) -> tuple[Any, Optional[dict], Optional[dict], str, str]:
         """Get context for an entry.
@@ -820,31 +949,59 @@ class FavaLedger:
         # Calculate balances before and after for Balance and Transaction entries
         before_balances = None
         after_balances = None
-        
-        if hasattr(entry, 'postings') or hasattr(entry, 'account'):
-            # For Balance and Transaction entries, calculate account balances
-            affected_accounts = set()
-            
-            if hasattr(entry, 'postings') and entry.postings:
-                # Transaction entry
-                for posting in entry.postings:
-                    affected_accounts.add(posting.account)
-            elif hasattr(entry, 'account') and entry.account:
-                # Balance entry
-                affected_accounts.add(entry.account)
-            
-            if affected_accounts:
-                # Calculate balances before and after this entry
-                # This is a simplified implementation
-                before_balances = {}
-                after_balances = {}
-                
-                for account in affected_accounts:
-                    # For now, return empty balance maps
-                    # In a full implementation, this would calculate actual running balances
-                    before_balances[account] = []
-                    after_balances[account] = []
-        
+
+        if isinstance(entry, (Balance, Transaction)):
+            accounts = list(dict.fromkeys(get_entry_accounts(entry)))
+            position = self.postings.columns.positions.get(id(entry))
+            if position is not None:
+                balances = self.postings.balances
+                before = {
+                    account: balances.balance(account, position=position)
+                    for account in accounts
+                }
+                after = {
+                    account: balances.balance(account, position=position + 1)
+                    for account in accounts
+                }
+            else:
+                before = {account: CounterInventory() for account in accounts}
+                for entry_ in takewhile(
+                    lambda e: e is not entry, self.all_entries
+                ):
+                    for posting in getattr(entry_, "postings", []):
+                        balance = before.get(posting.account)
+                        if balance is not None:
+                            balance.add_position(posting)
+                after = {
+                    account: CounterInventory(balance)
+                    for account, balance in before.items()
+                }
+                for posting in getattr(entry, "postings", []):
+                    after[posting.account].add_position(posting)
+
+            def sort_key(item: tuple[InventoryKey, Any]) -> tuple[Any, ...]:
+                (currency, cost), _number = item
+                if cost is None:
+                    return (currency, False)
+                return (currency, True, cost.number, cost.currency,
+                        cost.date, cost.label or "")
+
+            def to_strings(balance: CounterInventory) -> list[str]:
+                # List the positions by currency and cost, like Beancount.
+                return CounterInventory(
+                    sorted(balance.items(), key=sort_key)
+                ).to_strings()
+
+            before_balances = {
+                account: to_strings(balance)
+                for account, balance in before.items()
+            }
+            if isinstance(entry, Transaction):
+                after_balances = {
+                    account: to_strings(balance)
+                    for account, balance in after.items()
+                }
+
         return entry, before_balances, after_balances, source_slice, sha256sum
 
     def commodity_pairs(self) -> list[tuple[str, str]]:
@@ -927,18 +1084,41 @@ class FavaLedger:
         Returns:
             FilterEntries object with filtered entries
         """
-        current_entries: list[Directive] = list(self.all_entries)
+        # Relative time filters depend on the current date.
+        key = (account, filter_str, time, local_today(), self.generation)
+        cached = self._filter_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Each filter returns a new list (and the time filter only looks at
+        # the entries up to the end of its date range), so the entries do not
+        # need to be copied in between.
+        current_entries: Sequence[Directive] = self.all_entries
 
         if time:
             time_filter_obj = TimeFilter(self.options, self.fava_options, time)
-            current_entries = list(time_filter_obj.apply(current_entries))
+            current_entries = time_filter_obj.apply(current_entries)
 
         if account:
             account_filter_obj = AccountFilter(account)
-            current_entries = list(account_filter_obj.apply(current_entries))
-        
+            current_entries = account_filter_obj.apply(current_entries)
+
         if filter_str:
-            advanced_filter_obj = AdvancedFilter(filter_str)
-            current_entries = list(advanced_filter_obj.apply(current_entries))
-        
-        return FilterEntries(current_entries, self.options, self.fava_options)
\ No newline at end of file
+            advanced_filter_obj = AdvancedFilter(filter_str, self.filter_index)
+            current_entries = advanced_filter_obj.apply(current_entries)
+
+        filtered = FilterEntries(
+            (
+                current_entries
+                if isinstance(current_entries, list)
+                else list(current_entries)
+            ),
+            self.options,
+            self.fava_options,
+            self.postings,
+            # The account and advanced filters can drop some of the prices
+            # of a pair, so they cannot be sliced from the ledger price map.
+            None if account or filter_str else self.prices,
+        )
+        self._filter_cache.put(key, filtered)
+        return filtered
\ No newline at end of file
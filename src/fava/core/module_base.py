@@ -2,17 +2,155 @@
 
 from __future__ import annotations
 
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from typing import ClassVar
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Mapping
+    from concurrent.futures import Future
+
     from fava.core import FavaLedger
 
+log = logging.getLogger(__name__)
+
 
 class FavaModule:
     """Base class for the "modules" of FavaLedger."""
 
+    #: The names of the modules (as attributes of the ledger) that have to
+    #: be loaded before this one.
+    dependencies: ClassVar[tuple[str, ...]] = ()
+    #: Whether to only load this module on first use after a load of the
+    #: ledger. Lazy modules have to call :meth:`ensure_loaded` on access.
+    lazy: ClassVar[bool] = False
+
     def __init__(self, ledger: FavaLedger) -> None:
         self.ledger = ledger
+        # How often the module was marked as stale and the count when it was
+        # last loaded lazily - it is stale if they differ.
+        self._marked_stale = 0
+        self._loaded_at = 0
+        self._loading = False
+        self._lazy_lock = threading.RLock()
 
     def load_file(self) -> None:
         """Run when the file has been (re)loaded."""
+
+    def mark_stale(self) -> None:
+        """Load the module on its next use instead of right away."""
+        self._marked_stale += 1
+
+    def ensure_loaded(self) -> None:
+        """Load the module if it has been marked as stale.
+
+        If it is marked as stale again while it is being loaded, it stays
+        stale and is loaded once more on its next use.
+        """
+        if self._loaded_at == self._marked_stale:
+            return
+        with self._lazy_lock:
+            marked_stale = self._marked_stale
+            # The module might be used while it is being loaded, e.g., by
+            # its own load - do not load it again then.
+            if self._loaded_at == marked_stale or self._loading:
+                return
+            self._loading = True
+            try:
+                start = time.perf_counter()
+                self._load_lazily()
+                self.ledger.load_timings[type(self).__name__] = (
+                    time.perf_counter() - start
+                )
+            except Exception:
+                log.exception("Error loading module %s", type(self).__name__)
+            finally:
+                self._loading = False
+                self._loaded_at = marked_stale
+
+    def _load_lazily(self) -> None:
+        self.load_file()
+
+
+def _load_module(module: FavaModule) -> float:
+    start = time.perf_counter()
+    try:
+        module.load_file()
+    except Exception:
+        log.exception("Error loading module %s", type(module).__name__)
+    return time.perf_counter() - start
+
+
+def load_modules(
+    modules: Mapping[str, FavaModule],
+    max_workers: int = 1,
+) -> dict[str, float]:
+    """Load the given modules in the order of their dependencies.
+
+    Modules whose dependencies have all been loaded are loaded concurrently
+    if `max_workers` is larger than one. Lazy modules are only marked as
+    stale. Exceptions in `load_file` are logged.
+
+    Args:
+        modules: The modules by the name of their attribute on the ledger.
+        max_workers: The maximal number of threads to load modules on.
+
+    Returns:
+        The durations (in seconds) of the loads by module class name.
+
+    Raises:
+        ValueError: If the dependencies of the modules contain a cycle.
+    """
+    remaining: dict[str, set[str]] = {}
+    for name, module in modules.items():
+        if module.lazy:
+            module.mark_stale()
+        else:
+            remaining[name] = {
+                dep
+                for dep in module.dependencies
+                if dep in modules and not modules[dep].lazy
+            }
+
+    timings: dict[str, float] = {}
+
+    def _ready() -> list[str]:
+        ready = [name for name, deps in remaining.items() if not deps]
+        for name in ready:
+            del remaining[name]
+        return ready
+
+    def _loaded(name: str, duration: float) -> None:
+        timings[type(modules[name]).__name__] = duration
+        for deps in remaining.values():
+            deps.discard(name)
+
+    if max_workers <= 1:
+        while remaining:
+            ready = _ready()
+            if not ready:
+                msg = f"Cyclic module dependencies: {sorted(remaining)}"
+                raise ValueError(msg)
+            for name in ready:
+                _loaded(name, _load_module(modules[name]))
+        return timings
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="fava-module"
+    ) as pool:
+        running: dict[Future[float], str] = {}
+        while remaining or running:
+            for name in _ready():
+                running[pool.submit(_load_module, modules[name])] = name
+            if not running:
+                msg = f"Cyclic module dependencies: {sorted(remaining)}"
+                raise ValueError(msg)
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                _loaded(running.pop(future), future.result())
+    return timings
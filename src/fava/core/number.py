@@ -54,6 +54,8 @@ def get_locale_format(locale: Locale | None, precision: int) -> Formatter:
 class DecimalFormatModule(FavaModule):
     """Formatting numbers."""
 
+    dependencies = ("commodities",)
+
     def __init__(self, ledger: FavaLedger) -> None:
         super().__init__(ledger)
         self._locale: Locale | None = None
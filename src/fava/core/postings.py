@@ -0,0 +1,804 @@
+"""Columnar store of the postings of the ledger."""
+
+from __future__ import annotations
+
+import threading
+from array import array
+from bisect import bisect_left
+from bisect import bisect_right
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from fava.beans.abc import Open
+from fava.core.inventory import CounterInventory
+from fava.core.inventory import FixedPointInventory
+from fava.core.inventory import from_scaled
+from fava.core.inventory import to_scaled
+from fava.core.module_base import FavaModule
+from fava.core.tree import Tree
+from fava.util.date import ONE_DAY
+
+if TYPE_CHECKING:  # pragma: no cover
+    import datetime
+    from collections.abc import Callable
+    from collections.abc import Iterable
+    from collections.abc import Sequence
+
+    from fava.beans.abc import Directive
+    from fava.beans.protocols import Cost
+    from fava.core import FavaLedger
+
+    #: A column of integers - falls back to a list if they overflow.
+    IntColumn = array[int] | list[int]
+
+
+def _int_column(values: list[int]) -> IntColumn:
+    try:
+        return array("q", values)
+    except OverflowError:
+        return values
+
+
+def _is_columnar(entry: Directive) -> bool:
+    """Whether all postings of the entry can be stored in the columns."""
+    for posting in getattr(entry, "postings", ()):
+        number = getattr(posting.units, "number", None)
+        if not isinstance(number, Decimal) or not number.is_finite():
+            return False
+    return True
+
+
+class PostingColumns:
+    """The postings of a list of entries, stored column by column.
+
+    Each row is a posting. Accounts, currencies and costs are interned, so
+    the columns all hold integers: the position of the entry, the date
+    ordinal, the ids of the account, currency, cost and cost currency, and
+    the units as an integer multiple of ``10**-scale`` where the scale is
+    the maximum number of decimal places seen for the currency. Summing up
+    units is thus exact and only needs integer additions.
+
+    The rows of the postings of the entry at position ``i`` are
+    ``offsets[i]:offsets[i + 1]``. Entries with postings that have no
+    (finite) number are not stored - they are handled by iterating over
+    their postings instead.
+
+    Args:
+        entries: A sorted list of entries.
+    """
+
+    def __init__(self, entries: Sequence[Directive]) -> None:
+        self.entries = entries
+        #: Entry (by id) to its position in the list of entries.
+        self.positions: dict[int, int] = {}
+        #: The accounts of all Open entries.
+        self.open_accounts: list[str] = []
+
+        self.accounts: list[str] = []
+        self.currencies: list[str] = []
+        #: The interned costs - the cost id 0 is for postings without cost.
+        self.costs: list[Cost | None] = [None]
+        #: The scale of the units for each currency id.
+        self.scales: list[int] = []
+
+        account_ids: dict[str, int] = {}
+        currency_ids: dict[str, int] = {}
+        cost_ids: dict[Cost | None, int] = {None: 0}
+
+        offsets = [0]
+        entry_col: list[int] = []
+        date_col: list[int] = []
+        account_col: list[int] = []
+        currency_col: list[int] = []
+        cost_col: list[int] = []
+        cost_currency_col: list[int] = []
+        exponent_col: list[int] = []
+        numbers: list[Decimal] = []
+
+        def _currency_id(currency: str) -> int:
+            currency_id = currency_ids.get(currency)
+            if currency_id is None:
+                currency_id = currency_ids[currency] = len(self.currencies)
+                self.currencies.append(currency)
+                self.scales.append(0)
+            return currency_id
+
+        scales = self.scales
+        for pos, entry in enumerate(entries):
+            if isinstance(entry, Open):
+                self.open_accounts.append(entry.account)
+            if not _is_columnar(entry):
+                offsets.append(len(entry_col))
+                continue
+            self.positions[id(entry)] = pos
+            ordinal = entry.date.toordinal()
+            for posting in getattr(entry, "postings", ()):
+                account = posting.account
+                account_id = account_ids.get(account)
+                if account_id is None:
+                    account_id = account_ids[account] = len(self.accounts)
+                    self.accounts.append(account)
+                units = posting.units
+                currency_id = _currency_id(units.currency)
+                cost = posting.cost
+                cost_id = cost_ids.get(cost)
+                if cost_id is None:
+                    cost_id = cost_ids[cost] = len(self.costs)
+                    self.costs.append(cost)
+                cost_currency = getattr(cost, "currency", None)
+
+                number = units.number
+                exponent = int(number.as_tuple().exponent)
+                scales[currency_id] = max(scales[currency_id], -exponent)
+
+                entry_col.append(pos)
+                date_col.append(ordinal)
+                account_col.append(account_id)
+                currency_col.append(currency_id)
+                cost_col.append(cost_id)
+                cost_currency_col.append(
+                    _currency_id(cost_currency) if cost_currency else -1
+                )
+                exponent_col.append(exponent)
+                numbers.append(number)
+            offsets.append(len(entry_col))
+
+        self.offsets = array("q", offsets)
+        self.entry = array("q", entry_col)
+        self.date = array("q", date_col)
+        self.account = array("q", account_col)
+        self.currency = array("q", currency_col)
+        self.cost = array("q", cost_col)
+        self.cost_currency = array("q", cost_currency_col)
+        self.exponent = array("q", exponent_col)
+        # The scales are the maximum number of decimal places of each
+        # currency, so all numbers can be scaled to integers.
+        units = [
+            to_scaled(number, scales[currency_id])
+            for number, currency_id in zip(numbers, currency_col, strict=True)
+        ]
+        self.units = _int_column(units)  # type: ignore[arg-type]
+
+    def __len__(self) -> int:
+        return len(self.entry)
+
+    def rows(
+        self, entries: Iterable[Directive]
+    ) -> tuple[Iterable[int], list[Directive]]:
+        """Get the rows of the postings of the given entries.
+
+        Returns:
+            The rows of the postings of all the entries that are stored in
+            the columns and the list of entries that are not.
+        """
+        if entries is self.entries:
+            missing = [
+                entry
+                for entry in self.entries
+                if id(entry) not in self.positions
+            ]
+            return range(len(self)), missing
+        rows: list[int] = []
+        missing = []
+        positions = self.positions
+        offsets = self.offsets
+        for entry in entries:
+            pos = positions.get(id(entry))
+            if pos is None:
+                missing.append(entry)
+            else:
+                rows.extend(range(offsets[pos], offsets[pos + 1]))
+        return rows, missing
+
+    def sum_by_account(
+        self, rows: Iterable[int], *, with_cost: bool = True
+    ) -> dict[str, CounterInventory]:
+        """Group the units of the given rows by account (and currency, cost).
+
+        Args:
+            rows: The rows to add up.
+            with_cost: Whether to keep positions with different costs
+                separate - otherwise, only the units are summed up.
+
+        Returns:
+            The balance of every account that has postings in the rows.
+        """
+        account_col = self.account
+        currency_col = self.currency
+        cost_col = self.cost if with_cost else _NO_COST
+        units_col = self.units
+        exponent_col = self.exponent
+
+        sums: dict[tuple[int, int, int], int] = {}
+        exponents: dict[tuple[int, int, int], int] = {}
+        sums_get = sums.get
+        exponents_get = exponents.get
+        for row in rows:
+            key = (account_col[row], currency_col[row], cost_col[row])
+            sums[key] = sums_get(key, 0) + units_col[row]
+            # The sum of Decimals has the smallest exponent of the summands.
+            exponent = exponent_col[row]
+            if exponent < exponents_get(key, 1):
+                exponents[key] = exponent
+
+        accounts = self.accounts
+        currencies = self.currencies
+        costs = self.costs
+        scales = self.scales
+        balances: dict[str, CounterInventory] = {}
+        for key, value in sums.items():
+            account_id, currency_id, cost_id = key
+            account = accounts[account_id]
+            balance = balances.get(account)
+            if balance is None:
+                balance = balances[account] = CounterInventory()
+            if value:
+                balance[currencies[currency_id], costs[cost_id]] = (
+                    from_scaled(value, scales[currency_id], exponents[key])
+                )
+        return balances
+
+    def sum_by_interval(
+        self,
+        rows: Iterable[int],
+        ranges: Sequence[tuple[datetime.date, datetime.date]],
+        matches: Sequence[bool],
+    ) -> list[dict[str, CounterInventory]]:
+        """Group the units of the given rows by date range and account.
+
+        This buckets the rows into the date ranges in a single pass.
+
+        Args:
+            rows: The rows to add up.
+            ranges: Sorted and non-overlapping date ranges, as tuples of
+                the begin date and the (exclusive) end date.
+            matches: For each account id, whether to include its postings.
+
+        Returns:
+            For each date range, the balances of the accounts with postings
+            in it.
+        """
+        begins = [begin.toordinal() for begin, _ in ranges]
+        ends = [end.toordinal() for _, end in ranges]
+        account_col = self.account
+        date_col = self.date
+        currency_col = self.currency
+        cost_col = self.cost
+        units_col = self.units
+        exponent_col = self.exponent
+
+        sums: dict[tuple[int, int, int, int], int] = {}
+        exponents: dict[tuple[int, int, int, int], int] = {}
+        sums_get = sums.get
+        exponents_get = exponents.get
+        for row in rows:
+            account_id = account_col[row]
+            if not matches[account_id]:
+                continue
+            date = date_col[row]
+            index = bisect_right(begins, date) - 1
+            if index < 0 or date >= ends[index]:
+                continue
+            key = (index, account_id, currency_col[row], cost_col[row])
+            sums[key] = sums_get(key, 0) + units_col[row]
+            exponent = exponent_col[row]
+            if exponent < exponents_get(key, 1):
+                exponents[key] = exponent
+
+        accounts = self.accounts
+        currencies = self.currencies
+        costs = self.costs
+        scales = self.scales
+        intervals: list[dict[str, CounterInventory]] = [{} for _ in ranges]
+        for key, value in sums.items():
+            index, account_id, currency_id, cost_id = key
+            balances = intervals[index]
+            account = accounts[account_id]
+            balance = balances.get(account)
+            if balance is None:
+                balance = balances[account] = CounterInventory()
+            if value:
+                balance[currencies[currency_id], costs[cost_id]] = (
+                    from_scaled(value, scales[currency_id], exponents[key])
+                )
+        return intervals
+
+
+class _NoCost:
+    """Stands in for the cost column if costs are ignored."""
+
+    def __getitem__(self, _row: int) -> int:
+        return 0
+
+
+_NO_COST = _NoCost()
+
+
+#: The number of postings between two checkpoints of the running balance.
+CHECKPOINT_INTERVAL = 64
+
+#: Sums of units by (currency id, cost id), with the smallest exponent.
+_Sums = dict[tuple[int, int], tuple[int, int]]
+
+
+class _AccountPostings:
+    """The postings of one account with running balance checkpoints."""
+
+    __slots__ = ("checkpoints", "dates", "positions", "rows")
+
+    def __init__(self, columns: PostingColumns, rows: list[int]) -> None:
+        date_col = columns.date
+        entry_col = columns.entry
+        currency_col = columns.currency
+        cost_col = columns.cost
+        units_col = columns.units
+        exponent_col = columns.exponent
+
+        self.rows = array("q", rows)
+        self.dates = array("q", [date_col[row] for row in rows])
+        self.positions = array("q", [entry_col[row] for row in rows])
+        #: The sums of the first ``i * CHECKPOINT_INTERVAL`` postings.
+        self.checkpoints: list[_Sums] = []
+        running: _Sums = {}
+        for index, row in enumerate(rows):
+            if not index % CHECKPOINT_INTERVAL:
+                self.checkpoints.append(running.copy())
+            key = (currency_col[row], cost_col[row])
+            value, exponent = running.get(key, (0, 1))
+            running[key] = (
+                value + units_col[row],
+                min(exponent, exponent_col[row]),
+            )
+
+    def sums(self, columns: PostingColumns, count: int) -> _Sums:
+        """The sums of the first `count` postings."""
+        checkpoint = count // CHECKPOINT_INTERVAL
+        if checkpoint == len(self.checkpoints):
+            checkpoint -= 1
+        sums = self.checkpoints[checkpoint].copy()
+        currency_col = columns.currency
+        cost_col = columns.cost
+        units_col = columns.units
+        exponent_col = columns.exponent
+        for row in self.rows[checkpoint * CHECKPOINT_INTERVAL : count]:
+            key = (currency_col[row], cost_col[row])
+            value, exponent = sums.get(key, (0, 1))
+            sums[key] = (
+                value + units_col[row],
+                min(exponent, exponent_col[row]),
+            )
+        return sums
+
+
+def _to_inventory(columns: PostingColumns, sums: _Sums) -> CounterInventory:
+    """Turn sums of scaled units into an inventory."""
+    currencies = columns.currencies
+    costs = columns.costs
+    scales = columns.scales
+    balance = CounterInventory()
+    for (currency_id, cost_id), (value, exponent) in sums.items():
+        if value:
+            balance[currencies[currency_id], costs[cost_id]] = from_scaled(
+                value, scales[currency_id], exponent
+            )
+    return balance
+
+
+class _RunningBalance:
+    """A running balance of some accounts, summed up as scaled integers.
+
+    The units of the postings in the columns are added up as integers by
+    currency and cost and only turned into a :class:`.CounterInventory`
+    when the balance is requested. Entries that are not stored in the
+    columns are added up as Decimals separately.
+    """
+
+    __slots__ = ("columns", "is_account", "matches", "others", "sums")
+
+    def __init__(
+        self, columns: PostingColumns, is_account: Callable[[str], bool]
+    ) -> None:
+        self.columns = columns
+        self.is_account = is_account
+        self.matches = [is_account(account) for account in columns.accounts]
+        self.sums: _Sums = {}
+        self.others = CounterInventory()
+
+    def add_entry(self, entry: Directive) -> bool:
+        """Add the postings of the accounts in the entry.
+
+        Returns:
+            Whether the entry has any postings of the accounts.
+        """
+        columns = self.columns
+        pos = columns.positions.get(id(entry))
+        found = False
+        if pos is None:
+            for posting in getattr(entry, "postings", ()):
+                if self.is_account(posting.account):
+                    self.others.add_position(posting)
+                    found = True
+            return found
+        matches = self.matches
+        account_col = columns.account
+        currency_col = columns.currency
+        cost_col = columns.cost
+        units_col = columns.units
+        exponent_col = columns.exponent
+        sums = self.sums
+        for row in range(columns.offsets[pos], columns.offsets[pos + 1]):
+            if not matches[account_col[row]]:
+                continue
+            found = True
+            key = (currency_col[row], cost_col[row])
+            value, exponent = sums.get(key, (0, 1))
+            value += units_col[row]
+            # Like in a CounterInventory, positions that go to zero are
+            # removed (and start over with a new exponent).
+            if value:
+                sums[key] = (value, min(exponent, exponent_col[row]))
+            else:
+                sums.pop(key, None)
+        return found
+
+    def balance(self) -> CounterInventory:
+        """The current balance."""
+        balance = _to_inventory(self.columns, self.sums)
+        balance.add_inventory(self.others)
+        return balance
+
+
+class RunningBalanceIndex:
+    """Balances of the accounts at any date or entry position.
+
+    For each account, the dates and entry positions of its postings are
+    stored in order, together with checkpoints of the running balance every
+    :data:`CHECKPOINT_INTERVAL` postings. The balance at a date or position
+    is then a bisection and the replay of the postings since the last
+    checkpoint.
+
+    Args:
+        columns: The posting columns of the ledger.
+    """
+
+    def __init__(self, columns: PostingColumns) -> None:
+        self.columns = columns
+        by_account: list[list[int]] = [[] for _ in columns.accounts]
+        for row, account_id in enumerate(columns.account):
+            by_account[account_id].append(row)
+        self._accounts = {
+            name: _AccountPostings(columns, rows)
+            for name, rows in zip(columns.accounts, by_account, strict=True)
+        }
+
+    def _names(self, account: str, *, with_children: bool) -> list[str]:
+        if not with_children:
+            return [account] if account in self._accounts else []
+        prefix = f"{account}:"
+        return [
+            name
+            for name in self._accounts
+            if name == account or name.startswith(prefix)
+        ]
+
+    def balance(
+        self,
+        account: str,
+        *,
+        date: datetime.date | None = None,
+        position: int | None = None,
+        with_children: bool = False,
+    ) -> CounterInventory:
+        """Get the balance of an account.
+
+        Args:
+            account: An account name.
+            date: Only include postings before this date.
+            position: Only include postings of entries before this position
+                in the list of all entries.
+            with_children: Whether to include the postings of sub-accounts.
+
+        Returns:
+            The balance (with costs) of the account.
+        """
+        columns = self.columns
+        currencies = columns.currencies
+        costs = columns.costs
+        scales = columns.scales
+        balance = CounterInventory()
+        for name in self._names(account, with_children=with_children):
+            postings = self._accounts[name]
+            count = len(postings.rows)
+            if date is not None:
+                count = bisect_left(postings.dates, date.toordinal(), 0, count)
+            if position is not None:
+                count = bisect_left(postings.positions, position, 0, count)
+            if not count:
+                continue
+            for (currency_id, cost_id), (value, exponent) in postings.sums(
+                columns, count
+            ).items():
+                if value:
+                    balance.add(
+                        (currencies[currency_id], costs[cost_id]),
+                        from_scaled(value, scales[currency_id], exponent),
+                    )
+        return balance
+
+
+class PostingStore(FavaModule):
+    """Columnar store of all postings of the ledger.
+
+    The columns are built on first use after each load of the ledger.
+    Aggregations like account balances are computed on the integer columns
+    instead of by adding up the Decimal numbers of the postings one by one.
+    """
+
+    def __init__(self, ledger: FavaLedger) -> None:
+        super().__init__(ledger)
+        self._lock = threading.Lock()
+        self._columns: PostingColumns | None = None
+        self._balances: RunningBalanceIndex | None = None
+
+    def load_file(self) -> None:  # noqa: D102
+        self._columns = None
+        self._balances = None
+
+    @property
+    def size(self) -> int:
+        """The number of stored postings (0 if not built yet)."""
+        columns = self._columns
+        return len(columns) if columns is not None else 0
+
+    @property
+    def columns(self) -> PostingColumns:
+        """The columns of the postings of all entries of the ledger."""
+        columns = self._columns
+        if columns is None:
+            with self._lock:
+                columns = self._columns
+                if columns is None:
+                    columns = PostingColumns(self.ledger.all_entries)
+                    self._columns = columns
+        return columns
+
+    @property
+    def balances(self) -> RunningBalanceIndex:
+        """Running balances of all accounts of the ledger."""
+        balances = self._balances
+        if balances is None:
+            columns = self.columns
+            with self._lock:
+                balances = self._balances
+                if balances is None:
+                    balances = RunningBalanceIndex(columns)
+                    self._balances = balances
+        return balances
+
+    @property
+    def scales(self) -> dict[str, int]:
+        """The scale of the units of each currency in the columns."""
+        columns = self.columns
+        return dict(zip(columns.currencies, columns.scales, strict=True))
+
+    def account_balances(
+        self, entries: Sequence[Directive], *, with_cost: bool = True
+    ) -> dict[str, CounterInventory]:
+        """Get the balances of all accounts with postings in the entries.
+
+        Entries that are not part of the ledger (like the summarising
+        entries added by the time filter) are added up one by one.
+
+        Args:
+            entries: A list of entries.
+            with_cost: Whether to keep positions with different costs
+                separate - otherwise, only the units are summed up.
+        """
+        columns = self.columns
+        rows, missing = columns.rows(entries)
+        balances = columns.sum_by_account(rows, with_cost=with_cost)
+        for entry in missing:
+            for posting in getattr(entry, "postings", ()):
+                balance = balances.get(posting.account)
+                if balance is None:
+                    balance = balances[posting.account] = CounterInventory()
+                if with_cost:
+                    balance.add_position(posting)
+                else:
+                    balance.add_amount(posting.units)
+        return balances
+
+    def interval_balances(
+        self,
+        entries: Sequence[Directive],
+        ranges: Sequence[tuple[datetime.date, datetime.date]],
+        is_account: Callable[[str], bool],
+    ) -> list[dict[str, CounterInventory]]:
+        """Get the balances of the accounts for each of the date ranges.
+
+        Args:
+            entries: A list of entries.
+            ranges: Sorted and non-overlapping date ranges, as tuples of
+                the begin date and the (exclusive) end date.
+            is_account: Which accounts to include the postings of.
+
+        Returns:
+            For each date range, the balances of the accounts with postings
+            in it.
+        """
+        columns = self.columns
+        rows, missing = columns.rows(entries)
+        matches = [is_account(account) for account in columns.accounts]
+        intervals = columns.sum_by_interval(rows, ranges, matches)
+        begins = [begin for begin, _ in ranges]
+        for entry in missing:
+            index = bisect_right(begins, entry.date) - 1
+            if index < 0 or entry.date >= ranges[index][1]:
+                continue
+            balances = intervals[index]
+            for posting in getattr(entry, "postings", ()):
+                if is_account(posting.account):
+                    balance = balances.get(posting.account)
+                    if balance is None:
+                        balance = balances[posting.account] = (
+                            CounterInventory()
+                        )
+                    balance.add_position(posting)
+        return intervals
+
+    def running_balances(
+        self,
+        entries: Iterable[Directive],
+        is_account: Callable[[str], bool],
+        ends: Sequence[datetime.date] | None = None,
+    ) -> list[tuple[datetime.date, CounterInventory]]:
+        """Get the running balance (with costs) of the accounts over time.
+
+        The units are added up as scaled integers by currency and cost (see
+        :class:`_RunningBalance`).
+
+        Args:
+            entries: A sorted list of entries.
+            is_account: Which accounts to include the postings of.
+            ends: Sorted (exclusive) end dates to get the balance at. If not
+                given, the balance is taken at the end of each day with
+                postings of the accounts.
+
+        Returns:
+            Pairs of the last date that is included and the balance.
+        """
+        running = _RunningBalance(self.columns, is_account)
+        result: list[tuple[datetime.date, CounterInventory]] = []
+        if ends is None:
+            last_date: datetime.date | None = None
+            for entry in entries:
+                if last_date is not None and entry.date > last_date:
+                    result.append((last_date, running.balance()))
+                    last_date = None
+                if running.add_entry(entry):
+                    last_date = entry.date
+            if last_date is not None:
+                result.append((last_date, running.balance()))
+            return result
+
+        index = 0
+        for entry in entries:
+            while index < len(ends) and entry.date >= ends[index]:
+                result.append((ends[index] - ONE_DAY, running.balance()))
+                index += 1
+            if index == len(ends):
+                break
+            running.add_entry(entry)
+        result.extend(
+            (end - ONE_DAY, running.balance()) for end in ends[index:]
+        )
+        return result
+
+    def _add_units(
+        self,
+        entry: Directive,
+        is_account: Callable[[str], bool],
+        matches: Sequence[bool],
+        *inventories: FixedPointInventory,
+    ) -> None:
+        """Add the units of the matching postings of the entry."""
+        columns = self.columns
+        pos = columns.positions.get(id(entry))
+        if pos is not None:
+            currencies = columns.currencies
+            account_col = columns.account
+            currency_col = columns.currency
+            units_col = columns.units
+            offsets = columns.offsets
+            for row in range(offsets[pos], offsets[pos + 1]):
+                if matches[account_col[row]]:
+                    currency = currencies[currency_col[row]]
+                    value = units_col[row]
+                    for inventory in inventories:
+                        inventory.add_scaled(currency, value)
+            return
+        for posting in getattr(entry, "postings", ()):
+            units = posting.units
+            if is_account(posting.account) and isinstance(
+                getattr(units, "number", None), Decimal
+            ):
+                for inventory in inventories:
+                    inventory.add_amount(units)
+
+    def units_balance(
+        self,
+        entries: Iterable[Directive],
+        is_account: Callable[[str], bool],
+        balance: FixedPointInventory | None = None,
+    ) -> FixedPointInventory:
+        """Get the balance of the entries in units.
+
+        Args:
+            entries: A list of entries.
+            is_account: Which accounts to include the postings of.
+            balance: A balance to start from - it is not modified.
+
+        Returns:
+            The exact balance after all the entries.
+        """
+        columns = self.columns
+        matches = [is_account(account) for account in columns.accounts]
+        balance = (
+            balance.copy()
+            if balance is not None
+            else FixedPointInventory(self.scales)
+        )
+        for entry in entries:
+            self._add_units(entry, is_account, matches, balance)
+        return balance
+
+    def journal_balances(
+        self,
+        entries: Sequence[Directive],
+        is_account: Callable[[str], bool],
+        balance: FixedPointInventory | None = None,
+    ) -> list[tuple[dict[str, Decimal], dict[str, Decimal]]]:
+        """Get the change and the running balance of the entries in units.
+
+        The sums are exact and added up as scaled integers (see
+        :class:`.FixedPointInventory`).
+
+        Args:
+            entries: A list of entries.
+            is_account: Which accounts to include the postings of.
+            balance: The balance before the first entry (for a page of a
+                journal) - it is not modified.
+
+        Returns:
+            For each entry, the change and the balance after it per
+            currency - the balance includes currencies it has gone back
+            to zero for.
+        """
+        columns = self.columns
+        matches = [is_account(account) for account in columns.accounts]
+        scales = self.scales
+        balance = (
+            balance.copy()
+            if balance is not None
+            else FixedPointInventory(scales)
+        )
+        result = []
+        for entry in entries:
+            change = FixedPointInventory(scales)
+            self._add_units(entry, is_account, matches, change, balance)
+            result.append((change.to_dict(), balance.to_dict()))
+        return result
+
+    def tree(self, entries: Sequence[Directive]) -> Tree:
+        """Get the account tree for the entries (like :class:`.Tree`)."""
+        columns = self.columns
+        if entries is columns.entries:
+            open_accounts = columns.open_accounts
+        else:
+            open_accounts = [
+                entry.account for entry in entries if isinstance(entry, Open)
+            ]
+        tree = Tree(create_accounts=open_accounts)
+        for name, balance in sorted(self.account_balances(entries).items()):
+            tree.insert(name, balance)
+        return tree
@@ -0,0 +1,178 @@
+"""Reload ledgers in the background."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
+
+    from fava.core import FavaLedger
+
+
+log = logging.getLogger(__name__)
+
+
+class GenerationNotifier:
+    """Notify waiting threads of new generations of a ledger.
+
+    All generations of a ledger share one notifier. Waiting threads can pass
+    a `check` callable that looks for changes to the ledger and triggers a
+    reload (like :meth:`FavaLedger.changed`). However many threads wait, it
+    is only run by one of them at a time, at most once per `check_interval`
+    or right after a :meth:`poke`, e.g., by a file watcher that noticed a
+    change.
+
+    Args:
+        generation: The current generation of the ledger.
+        check_interval: The minimal interval between two checks in seconds.
+    """
+
+    def __init__(
+        self, generation: int = 0, check_interval: float = 1.0
+    ) -> None:
+        self.generation = generation
+        self.check_interval = check_interval
+        self._condition = threading.Condition()
+        self._checking = False
+        self._last_check = float("-inf")
+        self._poked = False
+
+    def publish(self, generation: int) -> None:
+        """Wake up the waiting threads if there is a new generation."""
+        with self._condition:
+            if generation > self.generation:
+                self.generation = generation
+                self._condition.notify_all()
+
+    def poke(self) -> None:
+        """Run the next check right away."""
+        with self._condition:
+            self._poked = True
+            self._condition.notify_all()
+
+    def _next_check(self, now: float) -> float | None:
+        """The time until the next check or None if one is running."""
+        if self._checking:
+            return None
+        if self._poked:
+            return 0.0
+        return self._last_check + self.check_interval - now
+
+    def wait(
+        self,
+        generation: int,
+        timeout: float,
+        check: Callable[[], object] | None = None,
+    ) -> int:
+        """Wait for a generation newer than the given one.
+
+        Args:
+            generation: The latest generation known to the caller.
+            timeout: The maximal time to wait in seconds.
+            check: Called to check for changes while waiting.
+
+        Returns:
+            The current generation, which is not newer than the given one if
+            the wait timed out.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._condition:
+                now = time.monotonic()
+                if self.generation > generation or now >= deadline:
+                    return self.generation
+                wait_for = deadline - now
+                next_check = (
+                    self._next_check(now) if check is not None else None
+                )
+                if check is None or next_check is None or next_check > 0:
+                    if next_check is not None:
+                        wait_for = min(wait_for, next_check)
+                    self._condition.wait(wait_for)
+                    continue
+                self._checking = True
+                self._poked = False
+                self._last_check = now
+            try:
+                check()
+            except Exception:
+                log.exception("Checking for changes failed")
+            finally:
+                with self._condition:
+                    self._checking = False
+                    self._condition.notify_all()
+
+
+class BackgroundReloader:
+    """Reload changed ledgers on a background thread.
+
+    A new generation of the ledger is loaded with
+    :meth:`FavaLedger.load_snapshot`, which leaves the current one untouched,
+    so requests keep being served from the current generation until the new
+    one has been fully loaded and is passed to the `swap` callback. Changes
+    that are noticed while a reload is running are loaded by another reload
+    right after it.
+
+    Args:
+        swap: Called with the old and the new generation of a ledger once
+            the new one has been loaded.
+    """
+
+    def __init__(self, swap: Callable[[FavaLedger, FavaLedger], None]) -> None:
+        self._swap = swap
+        self._lock = threading.Lock()
+        self._threads: dict[str, threading.Thread] = {}
+        # The paths of ledgers that changed while they were being reloaded.
+        self._dirty: set[str] = set()
+
+    def schedule(self, ledger: FavaLedger) -> bool:
+        """Schedule a reload of the given ledger.
+
+        Returns:
+            Whether a reload was started - False if one is already running,
+            in which case the ledger is reloaded again once it is done.
+        """
+        path = ledger.beancount_file_path
+        with self._lock:
+            if path in self._threads:
+                self._dirty.add(path)
+                return False
+            thread = threading.Thread(
+                target=self._reload,
+                args=(ledger,),
+                name=f"fava-reload-{path}",
+                daemon=True,
+            )
+            self._threads[path] = thread
+        thread.start()
+        return True
+
+    def _reload(self, ledger: FavaLedger) -> None:
+        path = ledger.beancount_file_path
+        while True:
+            try:
+                new = ledger.load_snapshot()
+                self._swap(ledger, new)
+                new.notifier.publish(new.generation)
+                log.info(
+                    "Swapped in generation %s of %s", new.generation, path
+                )
+                ledger = new
+            except Exception:
+                log.exception("Reloading %s failed", path)
+            with self._lock:
+                if path not in self._dirty:
+                    del self._threads[path]
+                    return
+                self._dirty.discard(path)
+
+    def join(self) -> None:
+        """Wait for all running reloads to finish."""
+        with self._lock:
+            threads = list(self._threads.values())
+        for thread in threads:
+            thread.join()
@@ -6,6 +6,7 @@ import abc
 import atexit
 import logging
 import threading
+import time
 from os import walk
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -39,12 +40,14 @@ class _WatchfilesThread(threading.Thread):
         *,
         is_relevant: Callable[[Change, str], bool] | None = None,
         recursive: bool = False,
+        on_change: Callable[[], None] | None = None,
     ) -> None:
         super().__init__(daemon=True)
         self.paths = paths
         self.mtime = mtime
         self._is_relevant = is_relevant or DefaultFilter()
         self._recursive = recursive
+        self._on_change = on_change
         self._stop_event = threading.Event()
 
     def stop(self) -> None:
@@ -76,22 +79,40 @@ class _WatchfilesThread(threading.Thread):
                     )
                 self.mtime = max(change_mtime, self.mtime)
             log.debug("new mtime: %s", self.mtime)
+            if self._on_change is not None:
+                self._on_change()
 
 
 class _FilesWatchfilesThread(_WatchfilesThread):
-    def __init__(self, files: set[Path], mtime: int) -> None:
+    def __init__(
+        self,
+        files: set[Path],
+        mtime: int,
+        on_change: Callable[[], None] | None = None,
+    ) -> None:
         paths = {f.parent for f in files}
 
         def is_relevant(_c: Change, path: str) -> bool:
             return Path(path) in files
 
         super().__init__(
-            paths, mtime, is_relevant=is_relevant, recursive=False
+            paths,
+            mtime,
+            is_relevant=is_relevant,
+            recursive=False,
+            on_change=on_change,
         )
 
 
 class WatcherBase(abc.ABC):
-    """ABC for Fava ledger file watchers."""
+    """ABC for Fava ledger file watchers.
+
+    Args:
+        quiet_window: Only report changes to the files once no further
+            change has been noticed for this many seconds, so that a burst
+            of writes (like an editor saving a file in several steps) only
+            results in a single reload.
+    """
 
     last_checked: int
     """Timestamp of the latest change noticed by the file watcher."""
@@ -99,27 +120,99 @@ class WatcherBase(abc.ABC):
     last_notified: int
     """Timestamp of the latest change that the watcher was notified of."""
 
+    def __init__(self, *, quiet_window: float = 0.0) -> None:
+        self.last_checked = 0
+        self.last_notified = 0
+        self.quiet_window = quiet_window
+        # The latest unreported change and when it was first noticed.
+        self._pending_mtime = 0
+        self._pending_since = 0
+        self._check_lock = threading.Lock()
+        self._listeners: list[Callable[[], None]] = []
+
     @abc.abstractmethod
-    def update(self, files: Iterable[Path], folders: Iterable[Path]) -> None:
+    def update(
+        self,
+        files: Iterable[Path],
+        folders: Iterable[Path],
+        *,
+        loaded_at: int | None = None,
+    ) -> None:
         """Update the folders/files to watch.
 
         Args:
             files: A list of file paths.
             folders: A list of paths to folders.
+            loaded_at: The time (in ns) at which loading the files started.
+                Changes from then on are still reported by :meth:`check`,
+                as they might not be part of the loaded data.
         """
 
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        """Call `listener` whenever the watcher notices a change.
+
+        Only watchers that notice changes by themselves (and not only when
+        checked) call their listeners - they can be used to run
+        :meth:`check` right after a change instead of polling it.
+        """
+        self._listeners.append(listener)
+
+    def _changed(self) -> None:
+        for listener in self._listeners:
+            try:
+                listener()
+            except Exception:
+                log.exception("Error in file watcher listener")
+
     def check(self) -> bool:
         """Check for changes.
 
+        Changes that the watcher was notified of are reported right away,
+        other ones only once they have settled for the quiet window.
+
         Returns:
             `True` if there was a file change in one of the files or folders,
             `False` otherwise.
         """
-        latest_mtime = max(self._get_latest_mtime(), self.last_notified)
-        has_higher_mtime = latest_mtime > self.last_checked
-        if has_higher_mtime:
+        with self._check_lock:
+            files_mtime = self._get_latest_mtime()
+            latest_mtime = max(files_mtime, self.last_notified)
+            if latest_mtime <= self.last_checked:
+                return False
+            if files_mtime > self.last_notified and not self._settled(
+                latest_mtime
+            ):
+                return False
             self.last_checked = latest_mtime
-        return has_higher_mtime
+            return True
+
+    def _settled(self, mtime: int) -> bool:
+        """Whether the change at `mtime` has been quiet for long enough."""
+        if self.quiet_window <= 0:
+            return True
+        window_ns = int(self.quiet_window * 1e9)
+        observed_at = self._observed_at()
+        if observed_at - mtime >= window_ns:
+            return True
+        # The modification time might be off, so also wait for the quiet
+        # window to pass from when the change was first noticed.
+        if mtime != self._pending_mtime:
+            self._pending_mtime = mtime
+            self._pending_since = observed_at
+            return False
+        return observed_at - self._pending_since >= window_ns
+
+    def _observed_at(self) -> int:
+        """The time (in ns) at which the latest mtime was determined."""
+        return time.time_ns()
+
+    def _mark_checked(self, loaded_at: int | None = None) -> None:
+        """Consider all changes up to now (or `loaded_at`) as reported."""
+        with self._check_lock:
+            latest_mtime = max(self.last_notified, self._get_latest_mtime())
+            if loaded_at is not None:
+                latest_mtime = min(latest_mtime, loaded_at)
+            self.last_checked = max(self.last_checked, latest_mtime)
 
     def notify(self, path: Path) -> None:
         """Notify the watcher of a change to a path."""
@@ -137,33 +230,45 @@ class WatcherBase(abc.ABC):
 class WatchfilesWatcher(WatcherBase):
     """A file and folder watcher using the watchfiles library."""
 
-    def __init__(self) -> None:
-        self.last_checked = 0
-        self.last_notified = 0
+    def __init__(self, *, quiet_window: float = 0.0) -> None:
+        super().__init__(quiet_window=quiet_window)
         self._paths: tuple[set[Path], set[Path]] | None = None
         self._watchers: tuple[_WatchfilesThread, _WatchfilesThread] | None = (
             None
         )
 
-    def update(self, files: Iterable[Path], folders: Iterable[Path]) -> None:
+    def update(
+        self,
+        files: Iterable[Path],
+        folders: Iterable[Path],
+        *,
+        loaded_at: int | None = None,
+    ) -> None:
         """Update the folders/files to watch."""
         files_set = {p.absolute() for p in files if p.exists()}
         folders_set = {p.absolute() for p in folders if p.is_dir()}
         new_paths = (files_set, folders_set)
         if self._watchers and new_paths == self._paths:
-            self.check()
+            self._mark_checked(loaded_at)
             return
         self._paths = new_paths
         if self._watchers:
             self._watchers[0].stop()
             self._watchers[1].stop()
         self._watchers = (
-            _FilesWatchfilesThread(files_set, self.last_checked),
-            _WatchfilesThread(folders_set, self.last_checked, recursive=True),
+            _FilesWatchfilesThread(
+                files_set, self.last_checked, on_change=self._changed
+            ),
+            _WatchfilesThread(
+                folders_set,
+                self.last_checked,
+                recursive=True,
+                on_change=self._changed,
+            ),
         )
         self._watchers[0].start()
         self._watchers[1].start()
-        self.check()
+        self._mark_checked(loaded_at)
 
     def __enter__(self) -> None:
         pass
@@ -191,19 +296,29 @@ class Watcher(WatcherBase):
 
     For folders, only checks mtime of the folder and all subdirectories.
     So a file change won't be noticed, but only new/deleted files.
+
+    The files and folders are stat'ed at most once per quiet window.
     """
 
-    def __init__(self) -> None:
-        self.last_checked = 0
-        self.last_notified = 0
+    def __init__(self, *, quiet_window: float = 0.0) -> None:
+        super().__init__(quiet_window=quiet_window)
         self._files: Sequence[Path] = []
         self._folders: Sequence[Path] = []
+        self._latest_mtime: int | None = None
+        self._latest_mtime_at = 0
 
-    def update(self, files: Iterable[Path], folders: Iterable[Path]) -> None:
+    def update(
+        self,
+        files: Iterable[Path],
+        folders: Iterable[Path],
+        *,
+        loaded_at: int | None = None,
+    ) -> None:
         """Update the folders/files to watch."""
         self._files = list(files)
         self._folders = list(folders)
-        self.check()
+        self._latest_mtime = None
+        self._mark_checked(loaded_at)
 
     def _mtimes(self) -> Iterable[int]:
         for path in self._files:
@@ -216,4 +331,16 @@ class Watcher(WatcherBase):
                 yield Path(dirpath).stat().st_mtime_ns
 
     def _get_latest_mtime(self) -> int:
-        return max(self._mtimes())
+        now = time.time_ns()
+        latest_mtime = self._latest_mtime
+        if (
+            latest_mtime is None
+            or now - self._latest_mtime_at >= self.quiet_window * 1e9
+        ):
+            latest_mtime = max(self._mtimes(), default=0)
+            self._latest_mtime = latest_mtime
+            self._latest_mtime_at = now
+        return latest_mtime
+
+    def _observed_at(self) -> int:
+        return self._latest_mtime_at
@@ -7,9 +7,11 @@ OpenTelemetry tracing, SIEM integration, and audit logging for enterprise deploy
 
 import json
 import logging
+import math
 import time
+from bisect import bisect_left
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Callable, Union
+from typing import Any, Dict, List, Optional, Callable, Tuple, Union
 from datetime import datetime, timezone
 import threading
 import queue
@@ -20,6 +22,9 @@ from .dependency_manager import DependencyManager, enterprise_feature
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds of the buckets of all histograms (in seconds).
+HISTOGRAM_BUCKETS = [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0]
+
 
 @dataclass
 class MetricDefinition:
@@ -109,6 +114,48 @@ class MetricsCollector:
             'histogram',
             'Duration of various performance-sensitive operations',
             ['operation', 'component']
+        ),
+        MetricDefinition(
+            'fava_load_duration_seconds',
+            'histogram',
+            'Duration of the stages of loading a ledger',
+            ['ledger', 'stage']
+        ),
+        MetricDefinition(
+            'fava_last_load_duration_seconds',
+            'gauge',
+            'Duration of the stages of the last load of a ledger',
+            ['ledger', 'stage']
+        ),
+        MetricDefinition(
+            'fava_request_duration_seconds',
+            'histogram',
+            'Duration of requests by endpoint',
+            ['endpoint', 'method']
+        ),
+        MetricDefinition(
+            'fava_filter_cache_lookups',
+            'gauge',
+            'Lookups in the filter cache of the current ledger generation',
+            ['ledger', 'outcome']
+        ),
+        MetricDefinition(
+            'fava_filter_cache_hit_ratio',
+            'gauge',
+            'Hit ratio of the filter cache of the current ledger generation',
+            ['ledger']
+        ),
+        MetricDefinition(
+            'fava_ledger_size',
+            'gauge',
+            'Number of entries of a ledger and of the items in its indexes',
+            ['ledger', 'kind']
+        ),
+        MetricDefinition(
+            'fava_ledger_generation',
+            'gauge',
+            'Number of loads of a ledger',
+            ['ledger']
         )
     ]
     
@@ -150,7 +197,7 @@ class MetricsCollector:
                         metric_def.name,
                         metric_def.description,
                         labelnames=metric_def.labels,
-                        buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0]
+                        buckets=HISTOGRAM_BUCKETS
                     )
                 elif metric_def.metric_type == 'gauge':
                     metric = prometheus_client.Gauge(
@@ -261,6 +308,58 @@ class MetricsCollector:
             'hsm_token': hsm_token
         })
     
+    def collect_samples(self) -> List[Tuple[MetricDefinition, List[Tuple[str, Dict[str, str], float]]]]:
+        """Get the current samples of all metrics.
+        
+        Returns:
+            For each metric, its definition and the list of its samples as
+            tuples of the sample name, the labels and the value.
+        """
+        result = []
+        for name, metric in self._prometheus_metrics.items():
+            metric_def = self._metrics_registry[name]
+            if isinstance(metric, FallbackMetric):
+                samples = metric.samples()
+            else:
+                samples = [
+                    (sample.name, dict(sample.labels), sample.value)
+                    for family in metric.collect()
+                    for sample in family.samples
+                ]
+            result.append((metric_def, samples))
+        return result
+    
+    def get_metrics_snapshot(self) -> Dict[str, Any]:
+        """Get the current values of all metrics in a JSON-serialisable form."""
+        return {
+            metric_def.name: {
+                'type': metric_def.metric_type,
+                'description': metric_def.description,
+                'samples': [
+                    {'name': sample_name, 'labels': labels, 'value': value}
+                    for sample_name, labels, value in samples
+                ],
+            }
+            for metric_def, samples in self.collect_samples()
+        }
+    
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric_def, samples in self.collect_samples():
+            lines.append(f'# HELP {metric_def.name} {metric_def.description}')
+            lines.append(f'# TYPE {metric_def.name} {metric_def.metric_type}')
+            for sample_name, labels, value in samples:
+                if labels:
+                    label_str = ','.join(
+                        f'{key}="{_escape_label_value(val)}"'
+                        for key, val in labels.items()
+                    )
+                    lines.append(f'{sample_name}{{{label_str}}} {_format_value(value)}')
+                else:
+                    lines.append(f'{sample_name} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+    
     def get_metrics_summary(self) -> Dict[str, Any]:
         """Get summary of metrics status."""
         return {
@@ -272,30 +371,83 @@ class MetricsCollector:
         }
 
 
+def _escape_label_value(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value for the Prometheus text format."""
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
 class FallbackMetric:
-    """Fallback metric implementation when Prometheus is not available."""
+    """Fallback metric implementation when Prometheus is not available.
     
-    def __init__(self, metric_def: MetricDefinition):
+    Like the Prometheus client, a labelled metric has a child metric for each
+    combination of label values. Histograms only keep the counts of the
+    observations in each bucket and their sum, not the observations.
+    """
+    
+    def __init__(self, metric_def: MetricDefinition, label_values: Tuple[str, ...] = ()):
         self.metric_def = metric_def
+        self.label_values = label_values
         self._value = 0.0
-        self._observations = []
-        self._labels_values = {}
+        self._bucket_counts = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._children: Dict[Tuple[str, ...], 'FallbackMetric'] = {}
+        self._lock = threading.Lock()
     
     def inc(self, value: float = 1):
-        self._value += value
-        logger.debug(f"Fallback metric {self.metric_def.name}: incremented by {value}")
+        with self._lock:
+            self._value += value
     
     def set(self, value: float):
         self._value = value
-        logger.debug(f"Fallback metric {self.metric_def.name}: set to {value}")
     
     def observe(self, value: float):
-        self._observations.append(value)
-        logger.debug(f"Fallback metric {self.metric_def.name}: observed {value}")
+        index = bisect_left(HISTOGRAM_BUCKETS, value)
+        with self._lock:
+            self._bucket_counts[index] += 1
+            self._count += 1
+            self._sum += value
     
     def labels(self, **kwargs):
-        """Return self for label chaining (simplified fallback)."""
-        return self
+        """Get the child metric for the given label values."""
+        key = tuple(str(kwargs.get(name, '')) for name in self.metric_def.labels)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, FallbackMetric(self.metric_def, key))
+        return child
+    
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Get the samples of this metric and its children."""
+        if self.metric_def.labels and not self.label_values:
+            with self._lock:
+                children = list(self._children.values())
+            return [sample for child in children for sample in child.samples()]
+        
+        name = self.metric_def.name
+        labels = dict(zip(self.metric_def.labels, self.label_values))
+        if self.metric_def.metric_type != 'histogram':
+            return [(name, labels, self._value)]
+        
+        with self._lock:
+            bucket_counts = list(self._bucket_counts)
+            count, total = self._count, self._sum
+        samples = []
+        cumulative = 0
+        for bound, bucket_count in zip([*HISTOGRAM_BUCKETS, math.inf], bucket_counts):
+            cumulative += bucket_count
+            le = _format_value(bound)
+            samples.append((f'{name}_bucket', {**labels, 'le': le}, float(cumulative)))
+        samples.append((f'{name}_count', labels, float(count)))
+        samples.append((f'{name}_sum', labels, total))
+        return samples
     
     def time(self):
         """Return self for timing context (simplified fallback)."""
@@ -34,6 +34,11 @@ if TYPE_CHECKING:  # pragma: no cover
     from fava.util.date import Interval
 
 
+#: The maximum number of payees, tags and links in the ledger data - the
+#: frontend gets the others from the completions API endpoint.
+LEDGER_DATA_COMPLETIONS = 1000
+
+
 @dataclass(frozen=True)
 class SerialisedError:
     """A Beancount error, as passed to the frontend."""
@@ -53,7 +58,11 @@ class SerialisedError:
 
 @dataclass(frozen=True)
 class LedgerData:
-    """This is used as report-independent data in the frontend."""
+    """This is used as report-independent data in the frontend.
+
+    Of the payees, tags and links, only the highest ranked
+    :data:`LEDGER_DATA_COMPLETIONS` are included.
+    """
 
     accounts: Sequence[str]
     account_details: AccountDict
@@ -102,6 +111,8 @@ def get_ledger_data() -> LedgerData:
     """Get the report-independent ledger data."""
     ledger = g.ledger
     all_queries = ledger.all_entries_by_type.Query
+    attributes = ledger.attributes
+    limit = LEDGER_DATA_COMPLETIONS
 
     return LedgerData(
         ledger.attributes.accounts,
@@ -113,11 +124,11 @@ def get_ledger_data() -> LedgerData:
         ledger.fava_options,
         current_app.config["INCOGNITO"],
         HAVE_EXCEL,
-        ledger.attributes.links,
+        sorted(attributes.complete("links", "", limit)),
         _get_options(),
-        ledger.attributes.payees,
+        attributes.payees[:limit],
         ledger.format_decimal.precisions,
-        ledger.attributes.tags,
+        sorted(attributes.complete("tags", "", limit)),
         ledger.attributes.years,
         all_queries[: ledger.fava_options.sidebar_show_queries],
         len(ledger.misc.upcoming_events),
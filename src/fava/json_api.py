@@ -6,9 +6,13 @@ interface for asynchronous functionality.
 
 from __future__ import annotations
 
+import datetime
+import json
 import logging
 import shutil
+import time
 from abc import abstractmethod
+from contextlib import suppress
 from dataclasses import dataclass
 from dataclasses import fields
 from functools import wraps
@@ -26,21 +30,25 @@ from flask import jsonify
 from flask import request
 from flask import Response
 from flask import send_from_directory
+from flask import stream_with_context
 from flask import current_app
 from flask_babel import gettext  # type: ignore[import-untyped]
 
 from fava.beans.abc import Document
 from fava.beans.abc import Event
 from fava.context import g
+from fava.core.attributes import COMPLETION_KINDS
 from fava.core.documents import filepath_in_document_folder
 from fava.core.documents import is_document_or_import_file
 from fava.core.filters import FilterError
 from fava.core.ingest import filepath_in_primary_imports_folder
+from fava.core.journal import JOURNAL_PAGE_SIZE
 from fava.core.misc import align
 from fava.helpers import FavaAPIError
 from fava.internal_api import ChartApi
 from fava.internal_api import get_errors
 from fava.internal_api import get_ledger_data
+from fava.metrics import metrics_snapshot
 from fava.serialisation import deserialise
 from fava.serialisation import serialise
 from fava.pqc.global_config import GlobalConfig # Added for PQC Config API
@@ -48,13 +56,16 @@ from fava.pqc.exceptions import CriticalConfigurationError as PQCCriticalConfigu
 
 if TYPE_CHECKING:  # pragma: no cover
     from collections.abc import Callable
+    from collections.abc import Iterator
     from collections.abc import Mapping
     from collections.abc import Sequence
     from datetime import date
     from decimal import Decimal
+    from threading import BoundedSemaphore
 
     from flask.wrappers import Response
 
+    from fava.core import FavaLedger
     from fava.core.ingest import FileImporters
     from fava.core.query import QueryResultTable
     from fava.core.query import QueryResultText
@@ -66,6 +77,17 @@ if TYPE_CHECKING:  # pragma: no cover
 json_api = Blueprint("json_api", __name__)
 log = logging.getLogger(__name__)
 
+#: The default maximal number of concurrent streams of change notifications.
+DEFAULT_MAX_CHANGE_STREAMS = 8
+#: How long (in seconds) a stream of change notifications is kept open.
+#: Browsers reconnect to it once it is closed, so that server threads are
+#: not held by clients that went away without closing the connection.
+CHANGE_STREAM_DURATION = 300.0
+#: The interval (in seconds) between keep-alive comments in the stream.
+CHANGE_STREAM_KEEPALIVE = 15.0
+#: The time (in milliseconds) browsers should wait before reconnecting.
+CHANGE_STREAM_RETRY = 1000
+
 
 class ValidationError(Exception):
     """Validation of data failed."""
@@ -87,6 +109,15 @@ class IncorrectTypeValidationError(ValidationError):
         )
 
 
+class IncorrectValueValidationError(ValidationError):
+    """Validation failed due to an unsupported value of a parameter."""
+
+    def __init__(self, param: str, values: Sequence[str]) -> None:
+        super().__init__(
+            f"Parameter `{param}` has to be one of: {', '.join(values)}.",
+        )
+
+
 def json_err(msg: str, status: HTTPStatus) -> Response:
     """Jsonify the error message."""
     res = jsonify({"error": msg})
@@ -275,10 +306,81 @@ def get_changed() -> bool:
     return g.ledger.changed()
 
 
+def _change_event(ledger: FavaLedger) -> str:
+    data = {"generation": ledger.generation, "mtime": str(ledger.mtime)}
+    return (
+        f"id: {ledger.generation}\n"
+        "event: changed\n"
+        f"data: {json.dumps(data)}\n\n"
+    )
+
+
+@json_api.route("/changes", methods=["GET"])
+def get_changes() -> Response:
+    """Stream the generations of the ledger as Server-Sent Events.
+
+    A `changed` event with the generation and mtime of the ledger is sent
+    right away and then whenever a new generation has been loaded, so that
+    clients only need to refetch data when notified. The generation is the
+    id of the event - unless it changed, a reconnecting client (which sends
+    the last id in the `Last-Event-ID` header) does not get the initial event.
+
+    Each stream occupies a server thread, so once there are as many streams
+    as allowed, the endpoint fails and clients have to poll for changes.
+    """
+    streams: BoundedSemaphore = current_app.config["CHANGE_STREAMS"]
+    if not streams.acquire(blocking=False):
+        return json_err(
+            "Too many open change streams.", HTTPStatus.SERVICE_UNAVAILABLE
+        )
+    ledgers = current_app.config["LEDGERS"]
+    slug = g.beancount_file_slug
+    notifier = g.ledger.notifier
+    last_event_id = request.headers.get("Last-Event-ID", "")
+
+    def check() -> None:
+        with suppress(KeyError):
+            ledgers[slug].changed()
+
+    def events() -> Iterator[str]:
+        ledger = g.ledger
+        generation = ledger.generation
+        yield f"retry: {CHANGE_STREAM_RETRY}\n\n"
+        if last_event_id != str(generation):
+            yield _change_event(ledger)
+        deadline = time.monotonic() + CHANGE_STREAM_DURATION
+        while time.monotonic() < deadline:
+            timeout = min(CHANGE_STREAM_KEEPALIVE, deadline - time.monotonic())
+            if notifier.wait(generation, timeout, check) > generation:
+                try:
+                    ledger = ledgers[slug]
+                except KeyError:
+                    # The title, and with it the slug, of the ledger changed.
+                    return
+                generation = ledger.generation
+                yield _change_event(ledger)
+            else:
+                yield ": keep-alive\n\n"
+
+    response = current_app.response_class(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    response.call_on_close(streams.release)
+    return response
+
+
 api_endpoint(get_errors)
 api_endpoint(get_ledger_data)
 
 
+@api_endpoint
+def get_metrics() -> Mapping[str, Any]:
+    """Get the performance metrics of all ledgers."""
+    return metrics_snapshot(current_app.config["LEDGERS"].ledgers)
+
+
 @api_endpoint
 def get_pqc_config() -> Mapping[str, Any]:
     """Get PQC-related configuration for the frontend."""
@@ -418,6 +520,23 @@ def get_verified_wasm(module_name: str) -> Response:
         return Response(f"Error in verified WASM endpoint: {e}", status=500)
 
 
+#: The default number of completions returned by the completions endpoint.
+COMPLETIONS_LIMIT = 30
+
+
+@api_endpoint
+def get_completions(kind: str, prefix: str) -> Sequence[str]:
+    """Complete a prefix of an account, payee, tag or link.
+
+    Returns the highest ranked values with a word starting with the prefix,
+    at most as many as the ``limit`` query string parameter.
+    """
+    if kind not in COMPLETION_KINDS:
+        raise IncorrectValueValidationError("kind", COMPLETION_KINDS)
+    limit = _int_arg("limit", COMPLETIONS_LIMIT)
+    return g.ledger.attributes.complete(kind, prefix, limit)
+
+
 @api_endpoint
 def get_payee_accounts(payee: str) -> Sequence[str]:
     """Rank accounts for the given payee."""
@@ -807,10 +926,27 @@ class AccountBudget:
 
 @dataclass(frozen=True)
 class AccountReportJournal:
-    """Data for the journal account report."""
+    """Data for the journal account report.
+
+    The journal only contains the most recent page of entries, the other
+    pages are fetched with :func:`get_account_journal`.
+    """
 
     charts: Sequence[ChartData]
     journal: str
+    offset: int
+    limit: int
+    total: int
+
+
+@dataclass(frozen=True)
+class AccountJournalPage:
+    """A page of the journal of an account."""
+
+    journal: str
+    offset: int
+    limit: int
+    total: int
 
 
 @dataclass(frozen=True)
@@ -904,14 +1040,74 @@ def get_account_report() -> AccountReportJournal | AccountReportTree:
             budgets=budgets,
         )
 
-    journal = get_template_attribute("_journal_table.html", "journal_table")
-    entries = g.ledger.account_journal_with_balance(
+    page = _account_journal_page(account_name)
+    return AccountReportJournal(
+        charts,
+        journal=page.journal,
+        offset=page.offset,
+        limit=page.limit,
+        total=page.total,
+    )
+
+
+def _int_arg(name: str, default: int) -> int:
+    """Get a non-negative integer query string parameter."""
+    value = request.args.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise IncorrectTypeValidationError(name, int) from None
+    if number < 0:
+        raise IncorrectTypeValidationError(name, int)
+    return number
+
+
+@api_endpoint
+def get_account_journal() -> AccountJournalPage:
+    """Get a page of the journal of an account.
+
+    The page is selected with the ``offset`` and ``limit`` query string
+    parameters or starts at the first entry on or after ``date`` - by
+    default, it contains the most recent entries. The running balances are
+    those of the whole journal.
+    """
+    limit = _int_arg("limit", JOURNAL_PAGE_SIZE) or JOURNAL_PAGE_SIZE
+    offset = _int_arg("offset", -1)
+    date_str = request.args.get("date")
+    try:
+        start = datetime.date.fromisoformat(date_str) if date_str else None
+    except ValueError:
+        raise IncorrectTypeValidationError("date", datetime.date) from None
+    return _account_journal_page(
+        request.args.get("a", ""),
+        offset=offset if offset >= 0 else None,
+        date=start,
+        limit=limit,
+    )
+
+
+def _account_journal_page(
+    account_name: str,
+    *,
+    offset: int | None = None,
+    date: datetime.date | None = None,
+    limit: int = JOURNAL_PAGE_SIZE,
+) -> AccountJournalPage:
+    """Render a page of the journal of an account."""
+    page = g.ledger.account_journal_page(
         g.filtered,
         account_name,
-        g.conversion,
         with_children=g.ledger.fava_options.account_journal_include_children,
+        offset=offset,
+        date=date,
+        limit=limit,
     )
-    return AccountReportJournal(
-        charts,
-        journal=journal(entries, show_change_and_balance=True),
+    journal = get_template_attribute("_journal_table.html", "journal_table")
+    return AccountJournalPage(
+        journal=journal(page.rows, show_change_and_balance=True),
+        offset=page.offset,
+        limit=limit,
+        total=page.total,
     )
@@ -0,0 +1,102 @@
+"""Performance metrics of Fava.
+
+The metrics are kept in the global
+:class:`~fava.enterprise.monitoring.MetricsCollector`: the durations of the
+stages of each load of a ledger and of each request are recorded as they
+happen, while the sizes of the ledgers and their indexes and the hit rates
+of the filter caches are only read when the metrics are requested.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from fava.enterprise.monitoring import get_metrics_collector
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Iterable
+    from typing import Any
+
+    from fava.core import FavaLedger
+
+
+def record_load(ledger: FavaLedger) -> None:
+    """Record the durations of the stages of the last load of a ledger."""
+    collector = get_metrics_collector()
+    for stage, duration in ledger.load_timings.items():
+        labels = {"ledger": ledger.beancount_file_path, "stage": stage}
+        collector.observe_histogram(
+            "fava_load_duration_seconds", duration, labels
+        )
+
+
+def record_request(endpoint: str, method: str, duration: float) -> None:
+    """Record the duration of a request."""
+    get_metrics_collector().observe_histogram(
+        "fava_request_duration_seconds",
+        duration,
+        {"endpoint": endpoint, "method": method},
+    )
+
+
+def ledger_sizes(ledger: FavaLedger) -> dict[str, int]:
+    """The number of entries of a ledger and of the items in its indexes.
+
+    Indexes that are built lazily and have not been built yet have size 0.
+    """
+    attributes = ledger.attributes
+    return {
+        "entries": len(ledger.all_entries),
+        "accounts": len(ledger.accounts),
+        "payees": len(attributes.payees),
+        "tags": len(attributes.tags),
+        "links": len(attributes.links),
+        "postings": ledger.postings.size,
+        "entry_hashes": ledger.entry_index.size,
+        "filter_cache_results": len(ledger.filter_cache),
+        "filter_cache_entries": ledger.filter_cache.size,
+    }
+
+
+def _update_ledger_gauges(ledgers: Iterable[FavaLedger]) -> None:
+    collector = get_metrics_collector()
+    for ledger in ledgers:
+        name = ledger.beancount_file_path
+        collector.set_gauge(
+            "fava_ledger_generation", ledger.generation, {"ledger": name}
+        )
+        for stage, duration in ledger.load_timings.items():
+            collector.set_gauge(
+                "fava_last_load_duration_seconds",
+                duration,
+                {"ledger": name, "stage": stage},
+            )
+        for kind, size in ledger_sizes(ledger).items():
+            collector.set_gauge(
+                "fava_ledger_size", size, {"ledger": name, "kind": kind}
+            )
+        cache = ledger.filter_cache
+        hits, misses = cache.hits, cache.misses
+        for outcome, count in (("hit", hits), ("miss", misses)):
+            collector.set_gauge(
+                "fava_filter_cache_lookups",
+                count,
+                {"ledger": name, "outcome": outcome},
+            )
+        collector.set_gauge(
+            "fava_filter_cache_hit_ratio",
+            hits / (hits + misses) if hits + misses else 0.0,
+            {"ledger": name},
+        )
+
+
+def metrics_snapshot(ledgers: Iterable[FavaLedger]) -> dict[str, Any]:
+    """Get all metrics as a JSON-serialisable dict."""
+    _update_ledger_gauges(ledgers)
+    return get_metrics_collector().get_metrics_snapshot()
+
+
+def metrics_text(ledgers: Iterable[FavaLedger]) -> str:
+    """Get all metrics in the Prometheus text exposition format."""
+    _update_ledger_gauges(ledgers)
+    return get_metrics_collector().render_prometheus()
@@ -142,24 +142,57 @@ class Interval(Enum):
         return date.strftime("%Y-%m-%d")
 
 
+def _fiscal_year(
+    date: datetime.date,
+    fye: FiscalYearEnd,
+) -> tuple[int, datetime.date]:
+    """Get the fiscal year in which the date falls and its start date."""
+    year = date.year - fye.year_offset + 1
+    while True:
+        start, _ = get_fiscal_period(year, fye)
+        if start is not None and start <= date:
+            return year, start
+        year -= 1
+
+
+def _uses_fiscal_year(interval: Interval, fye: FiscalYearEnd | None) -> bool:
+    """Whether the interval has to be aligned to the fiscal year."""
+    if fye is None or fye == END_OF_YEAR:
+        return False
+    if interval is Interval.YEAR:
+        return True
+    return interval is Interval.QUARTER and fye.has_quarters()
+
+
 def get_prev_interval(
     date: datetime.date,
     interval: Interval,
+    fye: FiscalYearEnd | None = None,
 ) -> datetime.date:
     """Get the start date of the interval in which the date falls.
 
     Args:
         date: A date.
         interval: An interval.
+        fye: If given, years (and quarters) are fiscal years (and fiscal
+            quarters) ending on this date.
 
     Returns:
         The start date of the `interval` before `date`.
     """
+    if fye is not None and _uses_fiscal_year(interval, fye):
+        _, start = _fiscal_year(date, fye)
+        if interval is Interval.QUARTER:
+            months = (date.year - start.year) * 12 + date.month - start.month
+            if date.day < start.day:
+                months -= 1
+            start = month_offset(start, months // 3 * 3)
+        return start
     if interval is Interval.YEAR:
         return datetime.date(date.year, 1, 1)
     if interval is Interval.QUARTER:
         for i in [10, 7, 4]:
-            if date.month > i:
+            if date.month >= i:
                 return datetime.date(date.year, i, 1)
         return datetime.date(date.year, 1, 1)
     if interval is Interval.MONTH:
@@ -172,17 +205,26 @@ def get_prev_interval(
 def get_next_interval(  # noqa: PLR0911
     date: datetime.date,
     interval: Interval,
+    fye: FiscalYearEnd | None = None,
 ) -> datetime.date:
     """Get the start date of the next interval.
 
     Args:
         date: A date.
         interval: An interval.
+        fye: If given, years (and quarters) are fiscal years (and fiscal
+            quarters) ending on this date.
 
     Returns:
         The start date of the next `interval` after `date`.
     """
     try:
+        if fye is not None and _uses_fiscal_year(interval, fye):
+            if interval is Interval.QUARTER:
+                return month_offset(get_prev_interval(date, interval, fye), 3)
+            year, _ = _fiscal_year(date, fye)
+            start, _ = get_fiscal_period(year + 1, fye)
+            return start  # type: ignore[return-value]
         if interval is Interval.YEAR:
             return datetime.date(date.year + 1, 1, 1)
         if interval is Interval.QUARTER:
@@ -216,6 +258,7 @@ def interval_ends(
     interval: Interval,
     *,
     complete: bool,
+    fye: FiscalYearEnd | None = None,
 ) -> Iterator[datetime.date]:
     """Get interval ends.
 
@@ -224,10 +267,10 @@ def interval_ends(
     """
     if begin >= end:
         raise InvalidDateRangeError
-    current = get_prev_interval(begin, interval) if complete else begin
+    current = get_prev_interval(begin, interval, fye) if complete else begin
     while current < end:
         yield current
-        current = get_next_interval(current, interval)
+        current = get_next_interval(current, interval, fye)
     yield current if complete else end
 
 
@@ -260,6 +303,7 @@ def dateranges(
     interval: Interval,
     *,
     complete: bool,
+    fye: FiscalYearEnd | None = None,
 ) -> Iterable[DateRange]:
     """Get date ranges for the given begin and end date.
 
@@ -270,11 +314,13 @@ def dateranges(
              date
         interval: The type of interval to generate ranges for.
         complete: Whether to complete starting and ending intervals.
+        fye: If given, years (and quarters) are fiscal years (and fiscal
+             quarters) ending on this date.
 
     Yields:
         Date ranges for all intervals of the given in the
     """
-    ends = interval_ends(begin, end, interval, complete=complete)
+    ends = interval_ends(begin, end, interval, complete=complete, fye=fye)
     left, right = tee(ends)
     next(right, None)
     for interval_begin, interval_end in zip(left, right, strict=False):
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import heapq
 import math
+import re
+from bisect import bisect_left
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -12,6 +15,9 @@ if TYPE_CHECKING:  # pragma: no cover
 ZERO = 0.0
 DEFAULT_RATE = math.log(2) * 1 / 365
 
+#: The start of a word (after the start of the string or a separator).
+WORD_START_RE = re.compile(r"(?<=[\s:/_.-])[^\s:/_.-]")
+
 
 class ExponentialDecayRanker:
     """Rank a list by exponential decay.
@@ -77,3 +83,51 @@ class ExponentialDecayRanker:
         if self.list is None:
             return sorted(self.scores.keys(), key=self.get, reverse=True)
         return sorted(self.list, key=self.get, reverse=True)
+
+
+class PrefixIndex:
+    """Complete prefixes of the words in a ranked list of strings.
+
+    For each item, the (casefolded) suffixes that start at a word boundary
+    are kept in a sorted list. The keys starting with a prefix form a range
+    of this list that is found by bisection, so only the matching items
+    have to be ranked to complete a prefix.
+
+    Args:
+        items: The items to complete, the highest ranked item first.
+    """
+
+    __slots__ = ("_keys", "_ranks", "items")
+
+    def __init__(self, items: Sequence[str]) -> None:
+        self.items = items
+        keys: list[tuple[str, int]] = []
+        for rank, item in enumerate(items):
+            folded = item.casefold()
+            keys.append((folded, rank))
+            keys.extend(
+                (folded[match.start() :], rank)
+                for match in WORD_START_RE.finditer(folded)
+            )
+        keys.sort()
+        self._keys = [key for key, _ in keys]
+        self._ranks = [rank for _, rank in keys]
+
+    def complete(self, prefix: str, limit: int) -> list[str]:
+        """Get the highest ranked items with a word starting with prefix.
+
+        Args:
+            prefix: The prefix to complete, case is ignored.
+            limit: The maximum number of items to return.
+
+        Returns:
+            The matching items, in the order of their rank.
+        """
+        if not prefix:
+            return list(self.items[:limit])
+        folded = prefix.casefold()
+        keys = self._keys
+        start = bisect_left(keys, folded)
+        end = bisect_left(keys, folded + "\U0010ffff", start)
+        ranks = set(self._ranks[start:end])
+        return [self.items[rank] for rank in heapq.nsmallest(limit, ranks)]
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from fava.core.filters import _parse_filter
+from fava.core.filters import AdvancedFilter
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Callable
+    from typing import Any
+
+    from fava.core import FavaLedger
+
+performance_logger = logging.getLogger("filter_performance")
+performance_logger.setLevel(logging.INFO)
+handler = logging.StreamHandler()
+handler.setFormatter(logging.Formatter("%(message)s"))
+if not performance_logger.handlers:
+    performance_logger.addHandler(handler)
+
+NUM_RUNS = 20
+
+FILTERS = [
+    "#test",
+    "payee:BayBook",
+    "BayBook",
+    "(payee:BayBook, #test,#nomatch) -#nomatch",
+    'any(account:"Assets:US:ETrade")',
+    'all(-account:"Assets:US:ETrade")',
+    ">=17500 <18000",
+]
+
+
+def _ns_per_entry(
+    predicate: Callable[[Any], bool], entries: list[Any]
+) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(NUM_RUNS):
+        for entry in entries:
+            predicate(entry)
+    return (time.perf_counter_ns() - start) / (NUM_RUNS * len(entries))
+
+
+@pytest.mark.parametrize("filter_string", FILTERS)
+def test_compiled_filter_performance(
+    example_ledger: FavaLedger, filter_string: str
+) -> None:
+    entries = list(example_ledger.all_entries)
+    predicate = _parse_filter(filter_string)
+    compiled = predicate.function
+
+    assert [e for e in entries if compiled(e)] == [
+        e for e in entries if predicate(e)
+    ]
+
+    tree_ns = _ns_per_entry(predicate, entries)
+    compiled_ns = _ns_per_entry(compiled, entries)
+    performance_logger.info(
+        f"PERFORMANCE_LOG: operation=filter_eval, filter={filter_string!r}, "
+        f"entries={len(entries)}, tree_ns_per_entry={tree_ns:.1f}, "
+        f"compiled_ns_per_entry={compiled_ns:.1f}"
+    )
+
+
+def test_filter_parse_performance() -> None:
+    filter_string = "(payee:BayBook, #test,#nomatch) -#nomatch"
+    start = time.perf_counter_ns()
+    for _ in range(NUM_RUNS):
+        AdvancedFilter(filter_string)
+    duration_us = (time.perf_counter_ns() - start) / NUM_RUNS / 1000
+    performance_logger.info(
+        f"PERFORMANCE_LOG: operation=filter_parse, "
+        f"filter={filter_string!r}, avg_duration_us={duration_us:.1f}"
+    )
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import datetime
+import os
+import threading
 from http import HTTPStatus
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -17,11 +19,14 @@ from fava.application import static_url
 from fava.beans import create
 from fava.beans.funcs import hash_entry
 from fava.context import g
+from fava.core import FavaLedger
 from fava.core import StatementMetadataInvalidError
 from fava.core import StatementNotFoundError
 from fava.core.group_entries import group_entries_by_type
 
 if TYPE_CHECKING:  # pragma: no cover
+    from typing import Any
+
     from flask import Flask
     from flask.testing import FlaskClient
     from werkzeug.test import TestResponse
@@ -300,6 +305,144 @@ def test_read_only_mode(test_data_dir: Path) -> None:
         assert response.status_code == HTTPStatus.UNAUTHORIZED.value
 
 
+def test_parallel_load(test_data_dir: Path) -> None:
+    """Multiple ledgers can be loaded in worker processes."""
+    app = create_app(
+        [
+            test_data_dir / "example.beancount",
+            test_data_dir / "long-example.beancount",
+        ],
+        parallel_load=True,
+    )
+    ledgers = app.config["LEDGERS"]
+    assert ledgers.first_slug() == "example"
+    assert ledgers["long-example"].options["title"] == "Long Example"
+    assert [slug for slug, _ in ledgers.items()] == ["example", "long-example"]
+    assert ledgers["example"].all_entries
+
+
+def test_parallel_load_error(
+    test_data_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """An error creating one of the ledgers is raised to the waiters."""
+
+    def _ledger(path: str, **kwargs: Any) -> FavaLedger:
+        if str(path).endswith("long-example.beancount"):
+            msg = "broken ledger"
+            raise ValueError(msg)
+        return FavaLedger(path, **kwargs)
+
+    monkeypatch.setattr("fava.application.FavaLedger", _ledger)
+    app = create_app(
+        [
+            test_data_dir / "example.beancount",
+            test_data_dir / "long-example.beancount",
+        ],
+        parallel_load=True,
+    )
+    ledgers = app.config["LEDGERS"]
+    with pytest.raises(ValueError, match="broken ledger"):
+        _ = ledgers.ledgers
+    with pytest.raises(ValueError, match="broken ledger"):
+        ledgers["long-example"]
+
+
+def test_background_reload(tmp_path: Path) -> None:
+    """Changes are loaded into a new generation that is swapped in."""
+    main = tmp_path / "main.beancount"
+    main.write_text(
+        'option "title" "Background"\n2020-01-01 open Assets:Cash\n'
+    )
+    app = create_app([main], load=True, background_reload=True)
+    ledgers = app.config["LEDGERS"]
+    old = ledgers["background"]
+    assert old.generation == 1
+
+    main.write_text(
+        'option "title" "Background"\n'
+        "2020-01-01 open Assets:Cash\n"
+        "2020-01-01 open Assets:Bank\n"
+    )
+    mtime = main.stat().st_mtime + 1
+    os.utime(main, (mtime, mtime))
+    # The old generation is left untouched, the reload happens in the
+    # background.
+    assert not old.changed()
+    ledgers.reloader.join()
+    assert len(old.all_entries) == 1
+
+    new = ledgers["background"]
+    assert new is not old
+    assert new.generation == 2
+    assert len(new.all_entries) == 2
+    assert new.accounts.ledger is new
+
+
+def test_background_reload_change_during_reload(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Changes while a reload is running are loaded right after it."""
+    main = tmp_path / "main.beancount"
+    accounts = ["Assets:Cash"]
+
+    def write() -> None:
+        main.write_text(
+            'option "title" "Background"\n'
+            + "".join(f"2020-01-01 open {a}\n" for a in accounts)
+        )
+        mtime = main.stat().st_mtime + len(accounts)
+        os.utime(main, (mtime, mtime))
+
+    write()
+    app = create_app([main], load=True, background_reload=True)
+    ledgers = app.config["LEDGERS"]
+    old = ledgers["background"]
+
+    loaded = threading.Event()
+    proceed = threading.Event()
+    load_data = FavaLedger._load_data  # noqa: SLF001
+
+    def slow_load_data(ledger: FavaLedger) -> None:
+        load_data(ledger)
+        loaded.set()
+        proceed.wait()
+
+    monkeypatch.setattr(FavaLedger, "_load_data", slow_load_data)
+
+    accounts.append("Assets:Bank")
+    write()
+    assert not old.changed()
+    assert loaded.wait(5)
+
+    # The file changes after it has been read by the running reload.
+    accounts.append("Assets:Other")
+    write()
+    assert not old.changed()
+    proceed.set()
+    ledgers.reloader.join()
+
+    new = ledgers["background"]
+    assert new.generation == 3
+    assert len(new.all_entries) == 3
+
+    # Also if the change is only checked for after the reload is done.
+    loaded.clear()
+    proceed.clear()
+    accounts.append("Assets:Bank2")
+    write()
+    assert not new.changed()
+    assert loaded.wait(5)
+    accounts.append("Assets:Bank3")
+    write()
+    proceed.set()
+    ledgers.reloader.join()
+    assert len(ledgers["background"].all_entries) == 4
+
+    assert not ledgers["background"].changed()
+    ledgers.reloader.join()
+    assert len(ledgers["background"].all_entries) == 5
+
+
 def test_download_journal(
     test_client: FlaskClient,
     snapshot: SnapshotFunc,
@@ -325,6 +468,20 @@ def test_static_url(app: Flask) -> None:
         assert url == "/static/nonexistent.js?mtime=0"
 
 
+def test_metrics(test_client: FlaskClient) -> None:
+    test_client.get("/long-example/api/changed")
+    response = test_client.get("/metrics")
+    data = assert_success(response)
+    assert response.mimetype == "text/plain"
+    assert "# TYPE fava_request_duration_seconds histogram" in data
+    assert (
+        'fava_request_duration_seconds_count{endpoint="json_api.get_changed"'
+        in data
+    )
+    assert 'fava_ledger_size{ledger="' in data
+    assert "fava_filter_cache_hit_ratio{" in data
+
+
 def test_load_extension_reports(test_client: FlaskClient) -> None:
     """Extension can register reports."""
 
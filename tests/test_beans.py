@@ -16,6 +16,8 @@ from fava.beans.account import root
 from fava.beans.funcs import get_position
 from fava.beans.funcs import hash_entry
 from fava.beans.helpers import replace
+from fava.beans.cache import ParseCache
+from fava.beans.load import IncrementalLoader
 from fava.beans.prices import FavaPriceMap
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -161,3 +163,197 @@ def test_fava_price_map(load_doc_entries: list[Directive]) -> None:
     assert prices.get_price(usd_chf, datetime.date(2022, 12, 20)) == Decimal(
         "0.9288",
     )
+
+    assert prices.slice_prices(("NO", "PRICES")) == []
+    assert prices.slice_prices(usd_chf) == prices.get_all_prices(usd_chf)
+    assert prices.slice_prices(
+        usd_chf, datetime.date(2020, 12, 19), datetime.date(2022, 12, 19)
+    ) == []
+    assert prices.slice_prices(usd_chf, datetime.date(2020, 12, 18)) == [
+        (datetime.date(2020, 12, 18), Decimal("0.88")),
+        (datetime.date(2022, 12, 19), Decimal("0.9288")),
+    ]
+    assert prices.slice_prices(usd_chf, end=datetime.date(2022, 12, 19)) == [
+        (datetime.date(2020, 12, 18), Decimal("0.88")),
+    ]
+
+    dates = [
+        datetime.date(2020, 12, 17),
+        datetime.date(2022, 12, 18),
+        None,
+    ]
+    pairs = [usd_chf, ("CHF", "CHF"), ("NO", "PRICES")]
+    assert prices.get_prices(pairs, dates) == {
+        usd_chf: [None, Decimal("0.88"), Decimal("0.9288")],
+        ("CHF", "CHF"): [Decimal(1)] * 3,
+        ("NO", "PRICES"): [None] * 3,
+    }
+
+    assert prices.get_conversion_rates(usd_chf) == (Decimal("0.9288"),)
+    assert prices.get_conversion_rates(("ZEROUSD", "CHF")) is None
+    assert prices.get_conversion_rates(("ZEROUSD", "CHF"), via="USD") is None
+    assert prices.get_conversion_rates(
+        ("CHF", "ZEROUSD"), datetime.date(2021, 1, 1), via="USD"
+    ) == (Decimal(1) / Decimal("0.88"), Decimal(0))
+
+
+def test_incremental_loader(tmp_path: Path) -> None:
+    main = tmp_path / "main.beancount"
+    main.write_text(
+        '''option "operating_currency" "USD"
+include "months/*.beancount"
+2020-01-01 open Assets:Cash
+2020-01-01 open Expenses:Food
+'''
+    )
+    months = tmp_path / "months"
+    months.mkdir()
+    for month in ("01", "02"):
+        (months / f"{month}.beancount").write_text(
+            f'''2020-{month}-05 * "Shop"
+  Expenses:Food  10.00 USD
+  Assets:Cash
+'''
+        )
+
+    loader = IncrementalLoader()
+    entries, errors, options = loader.load(str(main))
+    assert not errors
+    assert len(entries) == 4
+    assert len(loader.reparsed) == 3
+    assert len(options["include"]) == 3
+
+    entries, errors, _ = loader.load(str(main))
+    assert not loader.reparsed
+    assert len(entries) == 4
+
+    (months / "02.beancount").write_text(
+        '''2020-02-05 * "Shop"
+  Expenses:Food  10.00 USD
+  Assets:Cash
+2020-01-07 * "Shop"
+  Expenses:Food  5.00 USD
+  Assets:Cash
+'''
+    )
+    entries, errors, _ = loader.load(str(main))
+    assert not errors
+    assert loader.reparsed == [str(months / "02.beancount")]
+    assert [entry.date for entry in entries] == sorted(
+        entry.date for entry in entries
+    )
+    assert len(entries) == 5
+
+    (months / "01.beancount").unlink()
+    entries, errors, _ = loader.load(str(main))
+    assert not errors
+    assert not loader.reparsed
+    assert len(entries) == 4
+
+
+def test_incremental_loader_mutating_plugin(tmp_path: Path) -> None:
+    (tmp_path / "mutating_meta_plugin.py").write_text(
+        """__plugins__ = ["mutate"]
+
+
+def mutate(entries, options_map):
+    for entry in entries:
+        entry.meta["loads"] = entry.meta.get("loads", 0) + 1
+        for posting in getattr(entry, "postings", None) or []:
+            posting.meta["loads"] = posting.meta.get("loads", 0) + 1
+    return entries, []
+"""
+    )
+    main = tmp_path / "main.beancount"
+    main.write_text(
+        """option "insert_pythonpath" "TRUE"
+plugin "mutating_meta_plugin"
+2020-01-01 open Assets:Cash
+2020-01-01 open Expenses:Food
+2020-01-05 * "Shop"
+  Expenses:Food  10.00 USD
+  Assets:Cash
+"""
+    )
+
+    loader = IncrementalLoader()
+    for _ in range(2):
+        entries, errors, _ = loader.load(str(main))
+        assert not errors
+        assert [entry.meta["loads"] for entry in entries] == [1, 1, 1]
+        assert [
+            posting.meta["loads"] for posting in entries[-1].postings
+        ] == [1, 1]
+    assert not loader.reparsed
+
+
+def test_parse_cache(tmp_path: Path) -> None:
+    main = tmp_path / "main.beancount"
+    main.write_text(
+        """include "other.beancount"
+2020-01-01 open Assets:Cash
+"""
+    )
+    other = tmp_path / "other.beancount"
+    other.write_text("2020-01-01 open Expenses:Food\n")
+    filename = str(main)
+
+    cache = ParseCache(tmp_path / "cache")
+    assert cache.get(filename) is None
+    assert cache.misses == 1
+
+    result = IncrementalLoader().load(filename)
+    cache.put(filename, result)
+    cached = cache.get(filename)
+    assert cached is not None
+    assert cache.hits == 1
+    entries, errors, options = cached
+    assert entries == result[0]
+    assert not errors
+    assert options["include"] == result[2]["include"]
+
+    other.write_text("2020-01-02 open Expenses:Food\n")
+    assert cache.get(filename) is None
+    assert cache.misses == 2
+
+    cache._cache_path(filename).write_text("x")
+    assert cache.get(filename) is None
+
+
+def test_parse_cache_include_globs_and_documents(tmp_path: Path) -> None:
+    main = tmp_path / "main.beancount"
+    main.write_text(
+        """option "documents" "documents"
+include "months/*.beancount"
+2020-01-01 open Assets:Cash
+"""
+    )
+    months = tmp_path / "months"
+    months.mkdir()
+    (months / "01.beancount").write_text("2020-01-01 open Expenses:Food\n")
+    documents = tmp_path / "documents" / "Assets" / "Cash"
+    documents.mkdir(parents=True)
+    filename = str(main)
+
+    def load_and_put() -> None:
+        loader = IncrementalLoader()
+        result = loader.load(filename)
+        cache.put(filename, result, include_globs=loader.include_globs)
+
+    cache = ParseCache(tmp_path / "cache")
+    load_and_put()
+    assert cache.get(filename) is not None
+
+    # A new file matching the include glob invalidates the cache.
+    (months / "02.beancount").write_text("2020-02-01 open Expenses:Rent\n")
+    assert cache.get(filename) is None
+    load_and_put()
+    assert cache.get(filename) is not None
+
+    # So does a new file in a documents folder.
+    (documents / "2020-01-02 receipt.pdf").write_text("")
+    assert cache.get(filename) is None
+    load_and_put()
+    cached = cache.get(filename)
+    assert cached is not None
+    assert any(type(entry).__name__ == "Document" for entry in cached[0])
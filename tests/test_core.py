@@ -1,20 +1,25 @@
 from __future__ import annotations
 
+from datetime import date
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
 
 from fava.beans.funcs import hash_entry
+from fava.beans.helpers import slice_entry_dates
 from fava.core import EntryNotFoundForHashError
+from fava.core import FavaLedger
 from fava.core import FilteredLedger
+from fava.core.filter_results import FilterCache
+from fava.core.filter_results import FilterEntries
+from fava.core.tree import Tree
 from fava.helpers import FavaAPIError
 from fava.util.date import Interval
 from fava.util.date import local_today
 
 if TYPE_CHECKING:  # pragma: no cover
     from fava.beans.abc import Directive
-    from fava.core import FavaLedger
 
 
 def test_apiexception() -> None:
@@ -63,6 +68,67 @@ def test_ledger_get_entry(
         small_example_ledger.get_entry("asdfa")
 
 
+def test_entry_hash_index(small_example_ledger: FavaLedger) -> None:
+    index = small_example_ledger.entry_index
+    entries = small_example_ledger.all_entries
+    assert len(index) == len({hash_entry(entry) for entry in entries})
+
+    last = entries[-1]
+    assert index.get(hash_entry(last)) is last
+    assert index.position(hash_entry(last)) == (
+        last.meta["filename"],
+        last.meta["lineno"],
+    )
+    assert index.get("asdfa") is None
+    assert index.position("asdfa") is None
+
+
+def test_get_filtered_cached(small_example_ledger: FavaLedger) -> None:
+    filtered = small_example_ledger.get_filtered(time="2012")
+    assert small_example_ledger.get_filtered(time="2012") is filtered
+    assert small_example_ledger.get_filtered(time="2013") is not filtered
+    assert "root_tree" not in filtered.__dict__
+    assert filtered.root_tree is filtered.root_tree
+
+
+def test_filter_cache(small_example_ledger: FavaLedger) -> None:
+    options = small_example_ledger.options
+    fava_options = small_example_ledger.fava_options
+    entries = small_example_ledger.all_entries[:2]
+    cache = FilterCache(max_entries=4)
+    first = FilterEntries(entries, options, fava_options)
+    second = FilterEntries(entries, options, fava_options)
+    third = FilterEntries(entries, options, fava_options)
+
+    cache.put("first", first)
+    cache.put("second", second)
+    assert cache.get("first") is first
+    cache.put("third", third)
+    assert cache.get("second") is None
+    assert cache.get("first") is first
+    assert cache.get("third") is third
+    assert len(cache) == 2
+
+    cache.clear()
+    assert cache.get("first") is None
+    assert (cache.hits, cache.misses) == (3, 2)
+
+
+def test_filtered_tree_lookup_does_not_insert(
+    small_example_ledger: FavaLedger,
+) -> None:
+    filtered = small_example_ledger.get_filtered()
+    node = filtered.root_tree.get("Expenses:Bogus:Account")
+    assert node.account == "Expenses:Bogus:Account"
+    assert not node.children
+    assert not node.balance_children
+
+    # The trees are cached, so a lookup must not add nodes to them.
+    assert small_example_ledger.get_filtered() is filtered
+    expenses = small_example_ledger.get_filtered().root_tree.get("Expenses")
+    assert "Expenses:Bogus" not in [c.account for c in expenses.children]
+
+
 def test_paths_to_watch(
     example_ledger: FavaLedger,
     monkeypatch: pytest.MonkeyPatch,
@@ -139,3 +205,109 @@ def test_commodity_names(example_ledger: FavaLedger) -> None:
     assert example_ledger.commodities.name("USD") == "US Dollar"
     assert example_ledger.commodities.name("NOCOMMODITY") == "NOCOMMODITY"
     assert example_ledger.commodities.name("VMMXX") == "VMMXX"
+
+
+@pytest.mark.parametrize("accumulate", [False, True])
+def test_interval_balances(
+    example_ledger: FavaLedger, *, accumulate: bool
+) -> None:
+    filtered = example_ledger.get_filtered()
+    trees, dates = example_ledger.interval_balances(
+        filtered, Interval.MONTH, "Expenses", accumulate=accumulate
+    )
+    assert len(trees) == len(dates)
+    assert dates[0].end > filtered.date_range.end >= dates[0].begin
+    assert dates[-1].begin == filtered.date_range.begin.replace(day=1)
+    assert all(
+        later.begin == earlier.end
+        for later, earlier in zip(dates, dates[1:], strict=False)
+    )
+
+    for tree, date_range in zip(trees, dates, strict=True):
+        begin = dates[-1].begin if accumulate else date_range.begin
+        expected = Tree(
+            slice_entry_dates(filtered.entries, begin, date_range.end)
+        )
+        assert dict(tree.get("Expenses").balance_children.items()) == dict(
+            expected.get("Expenses").balance_children.items()
+        )
+        assert "Expenses:Food:Groceries" in tree.accounts
+
+
+@pytest.mark.parametrize(
+    ("account", "with_children"),
+    [
+        ("Assets:US:BofA:Checking", False),
+        ("Assets:US:BofA", True),
+        ("", True),
+    ],
+)
+def test_account_journal_page(
+    example_ledger: FavaLedger, account: str, *, with_children: bool
+) -> None:
+    filtered = example_ledger.get_filtered()
+    full = example_ledger.account_journal_with_balance(
+        filtered, account, "at_cost", with_children=with_children
+    )
+
+    for offset in [0, 1, 63, 64, 65, len(full) - 3]:
+        page = example_ledger.account_journal_page(
+            filtered,
+            account,
+            with_children=with_children,
+            offset=offset,
+            limit=10,
+        )
+        assert page.total == len(full)
+        assert page.offset == offset
+        assert list(page.rows) == full[offset : offset + 10]
+
+    last = example_ledger.account_journal_page(
+        filtered, account, with_children=with_children, limit=10
+    )
+    assert list(last.rows) == full[-10:]
+
+    date_ = full[len(full) // 2][0].date
+    page = example_ledger.account_journal_page(
+        filtered, account, with_children=with_children, date=date_
+    )
+    assert page.rows[0][0].date == date_
+    assert full[page.offset - 1][0].date < date_
+
+
+def test_filtered_prices(example_ledger: FavaLedger) -> None:
+    gld_usd = ("GLD", "USD")
+    all_prices = example_ledger.prices.get_all_prices(gld_usd)
+    assert all_prices
+    assert example_ledger.get_filtered().prices(*gld_usd) == all_prices
+
+    prices = example_ledger.get_filtered(time="2015").prices(*gld_usd)
+    assert prices
+    assert set(prices) < set(all_prices)
+    assert all(date_ <= date(2015, 12, 31) for date_, _ in prices)
+    assert [p for p in all_prices if p[0].year == 2015] == [
+        p for p in prices if p[0].year == 2015
+    ]
+
+    assert not example_ledger.get_filtered(account="Assets").prices(*gld_usd)
+    assert example_ledger.get_filtered(time="2015").prices("X", "Y") == []
+
+
+def test_filtered_prices_by_metadata(tmp_path: Path) -> None:
+    ledger_path = tmp_path / "prices.beancount"
+    ledger_path.write_text(
+        """
+2022-01-01 commodity EUR
+2022-01-01 price EUR 1.10 USD
+  source: "x"
+2022-01-02 price EUR 1.20 USD
+2022-01-03 price EUR 1.30 USD
+  source: "x"
+""",
+    )
+    ledger = FavaLedger(str(ledger_path))
+    prices = ledger.get_filtered(filter_str='source:"x"').prices("EUR", "USD")
+    assert [date_ for date_, _ in prices] == [
+        date(2022, 1, 1),
+        date(2022, 1, 3),
+    ]
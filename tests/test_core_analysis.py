@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING
+
+from fava.core.analysis import LedgerAnalysis
+from fava.core.group_entries import group_entries_by_account
+from fava.core.group_entries import group_entries_by_type
+
+if TYPE_CHECKING:  # pragma: no cover
+    from fava.beans.abc import Directive
+    from fava.core import FavaLedger
+
+
+def test_ledger_analysis(load_doc_entries: list[Directive]) -> None:
+    """
+    2016-01-01 open Assets:Cash
+    2016-01-01 open Expenses:Food
+
+    2016-01-02 * "Shop" "Food" #trip ^receipt
+        Assets:Cash   -10.00 USD
+        Expenses:Food
+
+    2016-01-02 * "Shop" "More food"
+        Assets:Cash   -5.00 USD
+        Expenses:Food
+
+    2016-02-01 balance Assets:Cash  -15.00 USD
+    """
+    analysis = LedgerAnalysis(load_doc_entries)
+
+    by_type = group_entries_by_type(load_doc_entries)
+    assert dict(analysis.entries_by_type) == by_type._asdict()
+    assert analysis.entries_by_account == group_entries_by_account(
+        load_doc_entries
+    )
+    assert analysis.dates == [
+        datetime.date(2016, 1, 1),
+        datetime.date(2016, 1, 2),
+        datetime.date(2016, 2, 1),
+    ]
+    assert analysis.payee_transactions["Shop"] == by_type.Transaction
+    assert analysis.payee_ranker.sort() == ["Shop"]
+    assert analysis.tag_ranker.sort() == ["trip"]
+    assert analysis.link_ranker.sort() == ["receipt"]
+    assert analysis.currency_ranker.sort() == ["USD"]
+    assert sorted(analysis.account_ranker.scores) == [
+        "Assets:Cash",
+        "Expenses:Food",
+    ]
+
+
+def test_load_timings(example_ledger: FavaLedger) -> None:
+    timings = example_ledger.load_timings
+    assert "analysis" in timings
+    assert "AccountDict" in timings
+    assert "AttributesModule" in timings
+    assert all(duration >= 0 for duration in timings.values())
@@ -54,6 +54,8 @@ def test_payee_accounts(example_ledger: FavaLedger) -> None:
     verizon = attr.payee_accounts("Verizon Wireless")
     assert verizon[:2] == ["Assets:US:BofA:Checking", "Expenses:Home:Phone"]
     assert len(verizon) == len(attr.accounts)
+    # The ranking is cached until the next load of the ledger.
+    assert attr.payee_accounts("Verizon Wireless") is verizon
 
 
 def test_payee_transaction(example_ledger: FavaLedger) -> None:
@@ -63,3 +65,15 @@ def test_payee_transaction(example_ledger: FavaLedger) -> None:
     txn = attr.payee_transaction("BayBook")
     assert txn
     assert str(txn.date) == "2016-05-05"
+
+
+def test_complete(example_ledger: FavaLedger) -> None:
+    attr = example_ledger.attributes
+    assert attr.complete("payees", "", 3) == attr.payees[:3]
+    assert attr.complete("payees", "verizon", 5) == ["Verizon Wireless"]
+    assert attr.complete("payees", "wireless", 5) == ["Verizon Wireless"]
+    assert sorted(attr.complete("tags", "", 100)) == attr.tags
+    assert sorted(attr.complete("links", "", 100)) == attr.links
+    accounts = attr.complete("accounts", "Food", 100)
+    assert accounts
+    assert all(":Food" in account for account in accounts)
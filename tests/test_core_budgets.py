@@ -6,6 +6,7 @@ from datetime import date
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
+from fava.core.budgets import budget_schedule
 from fava.core.budgets import calculate_budget
 from fava.core.budgets import calculate_budget_children
 from fava.core.budgets import parse_budgets
@@ -145,3 +146,34 @@ def test_budgets_children(budgets_doc: BudgetDict) -> None:
         date(2017, 1, 2),
     )
     assert budget["USD"] == Decimal("2.00")
+
+
+def test_budgets_multiple_periods(budgets_doc: BudgetDict) -> None:
+    """
+    2016-01-01 custom "budget" Expenses:Books "monthly" 100.00 EUR
+    2016-03-01 custom "budget" Expenses:Books "monthly" 50.00 EUR
+    2016-01-01 custom "budget" Expenses:Books "weekly" 7.00 USD"""
+
+    budget = calculate_budget(
+        budgets_doc,
+        "Expenses:Books",
+        date(2016, 1, 1),
+        date(2016, 5, 1),
+    )
+    assert budget["EUR"] == Decimal("300.00")
+    assert budget["USD"] == Decimal("121.00")
+
+    budget = calculate_budget(
+        budgets_doc,
+        "Expenses:Books",
+        date(2015, 12, 1),
+        date(2016, 1, 16),
+    )
+    assert budget["EUR"] == Decimal(100) * 15 / 31
+
+    schedule = budget_schedule(budgets_doc["Expenses:Books"])
+    assert [(s.budget.currency, s.begin, s.end) for s in schedule] == [
+        ("EUR", date(2016, 1, 1), date(2016, 3, 1)),
+        ("EUR", date(2016, 3, 1), None),
+        ("USD", date(2016, 1, 1), None),
+    ]
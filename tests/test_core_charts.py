@@ -1,8 +1,15 @@
 from __future__ import annotations
 
 from decimal import Decimal
+from itertools import pairwise
 from typing import TYPE_CHECKING
 
+import pytest
+
+from fava.beans.helpers import slice_entry_dates
+from fava.core.conversion import cost_or_value
+from fava.core.inventory import CounterInventory
+from fava.core.inventory import SimpleCounterInventory
 from fava.util.date import Interval
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -43,6 +50,71 @@ def test_interval_totals_inverted(
         snapshot(data, json=True)
 
 
+def test_interval_totals_all_intervals(example_ledger: FavaLedger) -> None:
+    filtered = example_ledger.get_filtered()
+    intervals = filtered.interval_ranges(Interval.MONTH)
+    assert len(intervals) > 100
+    data = example_ledger.charts.interval_totals(
+        filtered, Interval.MONTH, "Expenses", "at_cost"
+    )
+    assert len(data) == len(intervals)
+
+    for date_range, totals in list(zip(intervals, data, strict=True))[-24:]:
+        inventory = CounterInventory()
+        for entry in slice_entry_dates(
+            filtered.entries, date_range.begin, date_range.end
+        ):
+            for posting in getattr(entry, "postings", []):
+                if posting.account.startswith("Expenses"):
+                    inventory.add_position(posting)
+        assert totals.date == date_range.end_inclusive
+        assert totals.balance == cost_or_value(
+            inventory, "at_cost", example_ledger.prices, totals.date
+        )
+
+
+@pytest.mark.parametrize("interval", [Interval.DAY, Interval.WEEK])
+def test_interval_totals_days_and_weeks(
+    example_ledger: FavaLedger,
+    interval: Interval,
+) -> None:
+    filtered = example_ledger.get_filtered()
+    intervals = filtered.interval_ranges(interval)
+    for previous, date_range in pairwise(intervals):
+        assert previous.end == date_range.begin
+    if interval == Interval.WEEK:
+        assert all(date_range.begin.weekday() == 0 for date_range in intervals)
+    data = example_ledger.charts.interval_totals(
+        filtered, interval, "Expenses", "at_cost"
+    )
+    assert len(data) == len(intervals)
+
+    # The postings on all days are counted in exactly one of the intervals.
+    total = CounterInventory()
+    for entry in filtered.entries:
+        for posting in getattr(entry, "postings", []):
+            if posting.account.startswith("Expenses"):
+                total.add_position(posting)
+    summed = SimpleCounterInventory()
+    for totals in data:
+        for currency, number in totals.balance.items():
+            summed.add(currency, number)
+    assert summed == cost_or_value(total, "at_cost", example_ledger.prices)
+
+    for date_range, totals in list(zip(intervals, data, strict=True))[-10:]:
+        inventory = CounterInventory()
+        for entry in slice_entry_dates(
+            filtered.entries, date_range.begin, date_range.end
+        ):
+            for posting in getattr(entry, "postings", []):
+                if posting.account.startswith("Expenses"):
+                    inventory.add_position(posting)
+        assert totals.date == date_range.end_inclusive
+        assert totals.balance == cost_or_value(
+            inventory, "at_cost", example_ledger.prices, totals.date
+        )
+
+
 def test_linechart_data(
     example_ledger: FavaLedger,
     snapshot: SnapshotFunc,
@@ -15,9 +15,11 @@ from fava.core.conversion import _CurrencyConversion
 from fava.core.conversion import Conversion
 from fava.core.conversion import conversion_from_str
 from fava.core.conversion import convert_position
+from fava.core.conversion import cost_or_value
 from fava.core.conversion import get_cost
 from fava.core.conversion import get_market_value
 from fava.core.conversion import get_units
+from fava.core.conversion import prefetch_rates
 from fava.core.inventory import _Amount
 from fava.core.inventory import _Cost
 from fava.core.inventory import _Position
@@ -203,6 +205,7 @@ def test_convert_position(
     ],
 )
 def test_conversion(
+    monkeypatch: pytest.MonkeyPatch,
     load_doc_entries: list[Directive],
     inventory: str,
     conversion: str,
@@ -226,3 +229,21 @@ def test_conversion(
         prices=prices,
         date=conversion_date,
     ) == _simple_inv(expected)
+
+    # With the rates prefetched, no further price lookups are needed.
+    prices = FavaPriceMap(
+        (e for e in load_doc_entries if isinstance(e, Price)),
+    )
+    prefetch_rates([inv], conv, prices, [date(2022, 2, 3), conversion_date])
+
+    def _no_lookups(*_args: object) -> None:
+        raise AssertionError
+
+    monkeypatch.setattr(prices, "get_prices", _no_lookups)
+    monkeypatch.setattr(prices, "get_price", _no_lookups)
+    assert cost_or_value(
+        inv,
+        conv,
+        prices,
+        conversion_date,
+    ) == _simple_inv(expected)
@@ -6,16 +6,19 @@ from typing import TYPE_CHECKING
 
 import pytest
 from beancount.core.account import has_component
+from beancount.ops.summarize import clamp_opt
 
 from fava.beans import create
 from fava.beans.account import get_entry_accounts
 from fava.core.filters import AccountFilter
 from fava.core.filters import AdvancedFilter
 from fava.core.filters import FilterError
+from fava.core.filters import FilterIndex
 from fava.core.filters import FilterSyntaxLexer
 from fava.core.filters import Match
 from fava.core.filters import MatchAmount
 from fava.core.filters import TimeFilter
+from fava.core.filters import _parse_filter
 
 if TYPE_CHECKING:  # pragma: no cover
     from fava.core import FavaLedger
@@ -171,6 +174,33 @@ def test_advanced_filter(
     filtered_entries = filter_.apply(example_ledger.all_entries)
     assert len(filtered_entries) == number
 
+    index = FilterIndex(example_ledger.all_entries)
+    indexed_filter = AdvancedFilter(string, index)
+    assert indexed_filter.apply(example_ledger.all_entries) == filtered_entries
+    # Entries that are not in the index are checked individually.
+    partial_index = FilterIndex(example_ledger.all_entries[:1000])
+    partial_filter = AdvancedFilter(string, partial_index)
+    assert partial_filter.apply(example_ledger.all_entries) == filtered_entries
+
+    # The compiled function and the predicate tree agree.
+    predicate = _parse_filter(string)
+    assert [
+        entry for entry in example_ledger.all_entries if predicate(entry)
+    ] == filtered_entries
+
+
+def test_advanced_filter_memoised() -> None:
+    filter_string = "(payee:BayBook, #test) -#nomatch"
+    predicate = _parse_filter(filter_string)
+    assert _parse_filter(filter_string) is predicate
+    assert predicate.function is predicate.function
+
+    with pytest.raises(FilterError, match="Failed to parse filter"):
+        AdvancedFilter('any(who:"Martin"')
+    # The value is only appended to the message of the raised exception.
+    with pytest.raises(FilterError, match=r"filter: any\(who:\"Martin\"$"):
+        AdvancedFilter('any(who:"Martin"')
+
 
 def test_null_meta_posting() -> None:
     filter_ = AdvancedFilter('any(some_meta:"1")')
@@ -235,3 +265,20 @@ def test_time_filter(example_ledger: FavaLedger) -> None:
             example_ledger.fava_options,
             "no_date",
         )
+
+
+def test_time_filter_matches_clamp(example_ledger: FavaLedger) -> None:
+    """Only clamping the entries up to the end date gives the same result."""
+    time_filter = TimeFilter(
+        example_ledger.options,
+        example_ledger.fava_options,
+        "2016-05",
+    )
+    date_range = time_filter.date_range
+    expected, _ = clamp_opt(
+        example_ledger.all_entries,
+        date_range.begin,
+        date_range.end,
+        example_ledger.options,
+    )
+    assert time_filter.apply(example_ledger.all_entries) == expected
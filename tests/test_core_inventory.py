@@ -6,7 +6,10 @@ import pytest
 
 from fava.beans import create
 from fava.core.inventory import CounterInventory
+from fava.core.inventory import FixedPointInventory
+from fava.core.inventory import from_scaled
 from fava.core.inventory import SimpleCounterInventory
+from fava.core.inventory import to_scaled
 
 
 def test_no_iter_possible() -> None:
@@ -60,3 +63,32 @@ def test_add_inventory() -> None:
     inv = CounterInventory()
     inv.add_inventory(inv2)
     assert len(inv) == 1
+
+
+def test_scaled() -> None:
+    assert to_scaled(Decimal("1.25"), 2) == 125
+    assert to_scaled(Decimal("-1.2"), 3) == -1200
+    assert to_scaled(Decimal(10), 0) == 10
+    assert to_scaled(Decimal("1.255"), 2) is None
+    assert to_scaled(Decimal("NaN"), 2) is None
+    assert str(from_scaled(125, 2)) == "1.25"
+    assert str(from_scaled(-1200, 3)) == "-1.200"
+    assert str(from_scaled(-1200, 3, -1)) == "-1.2"
+
+
+def test_fixed_point_inventory() -> None:
+    inv = FixedPointInventory({"USD": 2})
+    assert not inv
+    inv.add("USD", Decimal("0.1"))
+    inv.add_scaled("USD", 20)
+    inv.add_amount(create.amount("-0.30 USD"))
+    assert inv
+    assert inv.to_dict() == {"USD": Decimal(0)}
+    copy = inv.copy()
+
+    # Fall back to Decimal for more decimal places and unknown currencies.
+    inv.add("USD", Decimal("0.001"))
+    inv.add_scaled("USD", 1)
+    inv.add("EUR", Decimal("1.5"))
+    assert inv.to_dict() == {"USD": Decimal("0.011"), "EUR": Decimal("1.5")}
+    assert copy.to_dict() == {"USD": Decimal(0)}
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from fava.core.module_base import FavaModule
+from fava.core.module_base import load_modules
+
+if TYPE_CHECKING:  # pragma: no cover
+    from fava.core import FavaLedger
+
+
+class _Module(FavaModule):
+    def __init__(
+        self, ledger: FavaLedger, loaded: list[str], name: str
+    ) -> None:
+        super().__init__(ledger)
+        self.loaded = loaded
+        self.name = name
+
+    def load_file(self) -> None:
+        self.loaded.append(self.name)
+
+
+def _module(
+    ledger: FavaLedger,
+    loaded: list[str],
+    name: str,
+    dependencies: tuple[str, ...] = (),
+    *,
+    lazy: bool = False,
+) -> _Module:
+    cls = type(
+        "_Module", (_Module,), {"dependencies": dependencies, "lazy": lazy}
+    )
+    return cls(ledger, loaded, name)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_load_modules(example_ledger: FavaLedger, max_workers: int) -> None:
+    loaded: list[str] = []
+    modules = {
+        name: _module(example_ledger, loaded, name, deps)
+        for name, deps in [
+            ("attributes", ("accounts",)),
+            ("accounts", ("postings",)),
+            ("postings", ()),
+            ("budgets", ()),
+        ]
+    }
+    modules["ingest"] = _module(example_ledger, loaded, "ingest", lazy=True)
+
+    timings = load_modules(modules, max_workers)
+    assert set(timings) == {"_Module"}
+    assert sorted(loaded) == ["accounts", "attributes", "budgets", "postings"]
+    assert loaded.index("postings") < loaded.index("accounts")
+    assert loaded.index("accounts") < loaded.index("attributes")
+
+    modules["ingest"].ensure_loaded()
+    modules["ingest"].ensure_loaded()
+    assert loaded[4:] == ["ingest"]
+
+
+def test_ensure_loaded_marked_stale_while_loading(
+    example_ledger: FavaLedger,
+) -> None:
+    loaded: list[str] = []
+
+    class _MarkedWhileLoading(_Module):
+        lazy = True
+
+        def load_file(self) -> None:
+            super().load_file()
+            if len(self.loaded) == 1:
+                # Like a reload of the ledger that happens during the load.
+                self.mark_stale()
+
+    module = _MarkedWhileLoading(example_ledger, loaded, "ingest")
+    module.mark_stale()
+    module.ensure_loaded()
+    assert loaded == ["ingest"]
+    module.ensure_loaded()
+    assert loaded == ["ingest", "ingest"]
+    module.ensure_loaded()
+    assert loaded == ["ingest", "ingest"]
+
+
+def test_load_modules_cycle(example_ledger: FavaLedger) -> None:
+    loaded: list[str] = []
+    modules = {
+        "a": _module(example_ledger, loaded, "a", ("b",)),
+        "b": _module(example_ledger, loaded, "b", ("a",)),
+    }
+    with pytest.raises(ValueError, match="Cyclic"):
+        load_modules(modules, 2)
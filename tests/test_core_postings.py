@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from beancount.ops.summarize import clamp_opt
+
+from fava.beans import create
+from fava.core.inventory import CounterInventory
+from fava.core.inventory import ZERO
+from fava.core.postings import PostingColumns
+from fava.core.tree import Tree
+
+if TYPE_CHECKING:  # pragma: no cover
+    from collections.abc import Sequence
+
+    from fava.beans.abc import Directive
+    from fava.core import FavaLedger
+
+
+def _balances(entries: Sequence[Directive]) -> dict[str, CounterInventory]:
+    balances: dict[str, CounterInventory] = defaultdict(CounterInventory)
+    for entry in entries:
+        for posting in getattr(entry, "postings", []):
+            balances[posting.account].add_position(posting)
+    return dict(balances)
+
+
+def test_posting_columns() -> None:
+    txn = create.transaction(
+        {},
+        datetime.date(2017, 12, 12),
+        "*",
+        "",
+        "",
+        frozenset(),
+        frozenset(),
+        [
+            create.posting("Assets:Cash", "100.50 USD"),
+            create.posting("Assets:Cash", "-0.5 USD"),
+            create.posting("Expenses:Food", "-100 USD"),
+        ],
+    )
+    columns = PostingColumns([txn])
+    assert len(columns) == 3
+    assert columns.scales == [2]
+    assert list(columns.units) == [10050, -50, -10000]
+    assert list(columns.offsets) == [0, 3]
+
+    balances = columns.sum_by_account(range(3))
+    assert balances["Assets:Cash"] == {("USD", None): Decimal("100.00")}
+    assert balances["Assets:Cash"].to_strings() == ["100.00 USD"]
+    assert balances["Expenses:Food"].to_strings() == ["-100 USD"]
+
+
+def test_posting_store(example_ledger: FavaLedger) -> None:
+    entries = example_ledger.all_entries
+    store = example_ledger.postings
+    assert len(store.columns) == sum(
+        len(getattr(entry, "postings", [])) for entry in entries
+    )
+    assert store.columns is store.columns
+
+    clamped, _ = clamp_opt(
+        entries,
+        datetime.date(2015, 1, 1),
+        datetime.date(2016, 1, 1),
+        example_ledger.options,
+    )
+    for selection in (entries, entries[300:900], clamped):
+        assert store.account_balances(selection) == _balances(selection)
+
+        tree = Tree(selection)
+        store_tree = store.tree(selection)
+        assert list(store_tree) == list(tree)
+        for name, node in tree.items():
+            assert store_tree[name].balance == node.balance
+            assert store_tree[name].balance_children == node.balance_children
+            assert store_tree[name].has_txns == node.has_txns
+
+
+def test_journal_balances(example_ledger: FavaLedger) -> None:
+    entries = example_ledger.all_entries[:800]
+
+    def is_account(name: str) -> bool:
+        return name.startswith("Assets:US")
+
+    balances = example_ledger.postings.journal_balances(entries, is_account)
+    assert len(balances) == len(entries)
+    running: dict[str, Decimal] = {}
+    for entry, (change, balance) in zip(entries, balances, strict=True):
+        expected: dict[str, Decimal] = {}
+        for posting in getattr(entry, "postings", []):
+            if is_account(posting.account):
+                currency = posting.units.currency
+                number = posting.units.number
+                expected[currency] = expected.get(currency, ZERO) + number
+                running[currency] = running.get(currency, ZERO) + number
+        assert change == expected
+        assert balance == running
+
+
+def test_running_balances(example_ledger: FavaLedger) -> None:
+    entries = example_ledger.all_entries
+    balances = example_ledger.postings.balances
+
+    def expected(
+        account: str, end: int, *, with_children: bool = False
+    ) -> CounterInventory:
+        balance = CounterInventory()
+        for entry in entries[:end]:
+            for posting in getattr(entry, "postings", []):
+                if posting.account == account or (
+                    with_children and posting.account.startswith(account + ":")
+                ):
+                    balance.add_position(posting)
+        return balance
+
+    for position in (0, 1, 700, 701, 1500, len(entries)):
+        for account in ("Assets:US:BofA:Checking", "Assets:US:Vanguard"):
+            assert balances.balance(
+                account, position=position, with_children=True
+            ) == expected(account, position, with_children=True)
+        assert balances.balance(
+            "Assets:US:Vanguard:VBMPX", position=position
+        ) == expected("Assets:US:Vanguard:VBMPX", position)
+
+    date = datetime.date(2015, 6, 1)
+    end = next(i for i, entry in enumerate(entries) if entry.date >= date)
+    assert balances.balance(
+        "Assets", date=date, with_children=True
+    ) == expected("Assets", end, with_children=True)
+    assert not balances.balance("Assets:Not:An:Account")
+
+
+def test_running_balances_by_date(example_ledger: FavaLedger) -> None:
+    entries = example_ledger.all_entries
+    store = example_ledger.postings
+
+    def is_account(name: str) -> bool:
+        return name.startswith(("Assets:US", "Liabilities"))
+
+    def expected(
+        selection: Sequence[Directive],
+    ) -> list[tuple[datetime.date, CounterInventory]]:
+        result = []
+        balance = CounterInventory()
+        for entry in selection:
+            for posting in getattr(entry, "postings", []):
+                if is_account(posting.account):
+                    if result and result[-1][0] == entry.date:
+                        result.pop()
+                    balance.add_position(posting)
+                    result.append((entry.date, CounterInventory(balance)))
+        return result
+
+    clamped, _ = clamp_opt(
+        entries,
+        datetime.date(2015, 1, 1),
+        datetime.date(2016, 1, 1),
+        example_ledger.options,
+    )
+    for selection in (entries, clamped):
+        by_day = expected(selection)
+        assert store.running_balances(selection, is_account) == by_day
+
+        ends = [datetime.date(2015, 3, 1), datetime.date(2015, 7, 1)]
+        ends.append(by_day[-1][0] + datetime.timedelta(days=10))
+        at_ends = store.running_balances(selection, is_account, ends)
+        assert [date for date, _ in at_ends] == [
+            end - datetime.timedelta(days=1) for end in ends
+        ]
+        for end, (_, balance) in zip(ends, at_ends, strict=True):
+            last = [bal for date, bal in by_day if date < end]
+            assert balance == (last[-1] if last else CounterInventory())
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from fava.core.reload import GenerationNotifier
+
+
+def test_generation_notifier_publish() -> None:
+    notifier = GenerationNotifier(1)
+    assert notifier.wait(1, 0.01) == 1
+    assert notifier.wait(0, 10) == 1
+
+    def publish() -> None:
+        time.sleep(0.01)
+        notifier.publish(2)
+
+    thread = threading.Thread(target=publish)
+    thread.start()
+    assert notifier.wait(1, 10) == 2
+    thread.join()
+
+    # Older generations are ignored.
+    notifier.publish(1)
+    assert notifier.generation == 2
+
+
+def test_generation_notifier_check() -> None:
+    notifier = GenerationNotifier(1, check_interval=10)
+    checks: list[int] = []
+
+    def check() -> None:
+        checks.append(notifier.generation)
+
+    # Only one check per interval, however many threads wait.
+    threads = [
+        threading.Thread(target=notifier.wait, args=(1, 0.05, check))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert checks == [1]
+
+    # A poke runs the next check right away.
+    def check_and_publish() -> None:
+        check()
+        notifier.publish(2)
+
+    notifier.poke()
+    assert notifier.wait(1, 10, check_and_publish) == 2
+    assert checks == [1, 1]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 import time
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
@@ -71,6 +72,27 @@ def test_watcher_folder(watcher_paths: WatcherTestSet) -> None:
     assert watcher.check()
 
 
+def test_watcher_quiet_window(watcher_paths: WatcherTestSet) -> None:
+    watcher = Watcher(quiet_window=0.05)
+    watcher.update([watcher_paths.file1], [])
+    assert not watcher.check()
+
+    # A burst of writes is only reported once it has settled.
+    reported = 0
+    for index in range(20):
+        if index in {0, 2, 4}:
+            watcher_paths.file1.write_text(f"test{index}")
+        reported += watcher.check()
+        time.sleep(TEN_MILLISECONDS)
+    assert reported == 1
+    assert not watcher.check()
+
+    # Changes that the watcher is notified of are reported right away.
+    watcher_paths.file1.write_text("test-notified")
+    watcher.notify(watcher_paths.file1)
+    assert watcher.check()
+
+
 def _watcher_poll_check(watcher: WatchfilesWatcher) -> bool:
     for _ in range(200):
         if watcher.check():
@@ -139,3 +161,16 @@ def test_watchfiles_watcher_recognises_change_to_previously_deleted_file(
         watcher_paths.file1.write_text("test-value-2")
         assert _watcher_poll_check(watcher)
         assert not watcher.check()
+
+
+def test_watchfiles_watcher_listener(watcher_paths: WatcherTestSet) -> None:
+    changed = threading.Event()
+    watcher = WatchfilesWatcher()
+    watcher.subscribe(changed.set)
+
+    with watcher:
+        watcher.update([watcher_paths.file1], [])
+        assert not changed.is_set()
+        watcher_paths.file1.write_text("test2")
+        assert changed.wait(1)
+        assert watcher.check()
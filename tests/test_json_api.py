@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import datetime
+import json
 from difflib import Differ
 from http import HTTPStatus
 from io import BytesIO
 from pathlib import Path
+from threading import BoundedSemaphore
 from typing import Any
 from typing import TYPE_CHECKING
 
@@ -84,6 +86,54 @@ def test_api_changed(test_client: FlaskClient) -> None:
     assert_api_success(response, data=False)
 
 
+def test_api_changes(
+    app: Flask, test_client: FlaskClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    generation = app.config["LEDGERS"]["long-example"].generation
+    response = test_client.get("/long-example/api/changes")
+    assert response.status_code == HTTPStatus.OK
+    assert response.mimetype == "text/event-stream"
+    chunks = response.iter_encoded()
+    assert next(chunks) == b"retry: 1000\n\n"
+    event = next(chunks).decode()
+    assert event.startswith(f"id: {generation}\nevent: changed\ndata: ")
+    data = json.loads(event.split("data: ")[1])
+    assert data["generation"] == generation
+    response.close()
+
+    # No initial event for a client that is up to date.
+    monkeypatch.setattr("fava.json_api.CHANGE_STREAM_KEEPALIVE", 0.01)
+    response = test_client.get(
+        "/long-example/api/changes",
+        headers={"Last-Event-ID": str(generation)},
+    )
+    chunks = response.iter_encoded()
+    assert next(chunks) == b"retry: 1000\n\n"
+    assert next(chunks) == b": keep-alive\n\n"
+    response.close()
+
+    monkeypatch.setitem(app.config, "CHANGE_STREAMS", BoundedSemaphore(0))
+    response = test_client.get("/long-example/api/changes")
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+
+
+def test_api_metrics(test_client: FlaskClient) -> None:
+    response = test_client.get("/long-example/api/metrics")
+    data = assert_api_success(response)
+    assert data["fava_load_duration_seconds"]["type"] == "histogram"
+    stages = {
+        sample["labels"]["stage"]
+        for sample in data["fava_last_load_duration_seconds"]["samples"]
+    }
+    assert {"load", "analysis", "AccountDict"} <= stages
+    kinds = {
+        sample["labels"]["kind"]: sample["value"]
+        for sample in data["fava_ledger_size"]["samples"]
+        if sample["labels"]["ledger"].endswith("long-example.beancount")
+    }
+    assert kinds["entries"] > 0
+
+
 def test_api_add_document_and_move_and_delete(
     app: Flask,
     test_client: FlaskClient,
@@ -325,6 +375,26 @@ def test_api_payee_accounts(
     snapshot(data, json=True)
 
 
+def test_api_completions(test_client: FlaskClient) -> None:
+    url = "/long-example/api/completions"
+    response = test_client.get(url, query_string={"kind": "payees"})
+    assert_api_error(response, status=HTTPStatus.BAD_REQUEST)
+    response = test_client.get(
+        url, query_string={"kind": "currencies", "prefix": ""}
+    )
+    assert_api_error(response, status=HTTPStatus.BAD_REQUEST)
+
+    response = test_client.get(
+        url, query_string={"kind": "payees", "prefix": "edison"}
+    )
+    assert assert_api_success(response) == ["EDISON POWER"]
+
+    response = test_client.get(
+        url, query_string={"kind": "accounts", "prefix": "", "limit": "2"}
+    )
+    assert len(assert_api_success(response)) == 2
+
+
 def test_api_payee_transaction(
     test_client: FlaskClient,
     snapshot: SnapshotFunc,
@@ -337,6 +407,46 @@ def test_api_payee_transaction(
     snapshot(data, json=True)
 
 
+def test_api_account_journal(test_client: FlaskClient) -> None:
+    url = "/long-example/api/account_journal"
+    response = test_client.get(
+        url, query_string={"a": "Assets:US:BofA:Checking", "limit": "10"}
+    )
+    data = assert_api_success(response)
+    assert data["limit"] == 10
+    assert data["total"] > 10
+    assert data["offset"] == data["total"] - 10
+    assert "<fava-journal>" in data["journal"]
+
+    # The account report only contains the most recent page of the journal.
+    response = test_client.get(
+        "/long-example/api/account_report",
+        query_string={"a": "Assets:US:BofA:Checking"},
+    )
+    report = assert_api_success(response)
+    assert report["total"] == data["total"]
+    assert report["offset"] == max(report["total"] - report["limit"], 0)
+
+    response = test_client.get(
+        url,
+        query_string={
+            "a": "Assets:US:BofA:Checking",
+            "offset": "0",
+            "limit": "5",
+        },
+    )
+    assert assert_api_success(response)["offset"] == 0
+
+    response = test_client.get(
+        url, query_string={"a": "Assets:US:BofA", "offset": "asdf"}
+    )
+    assert_api_error(response, status=HTTPStatus.BAD_REQUEST)
+    response = test_client.get(
+        url, query_string={"a": "Assets:US:BofA", "date": "2016-13-01"}
+    )
+    assert_api_error(response, status=HTTPStatus.BAD_REQUEST)
+
+
 def test_api_imports(
     test_client: FlaskClient,
     snapshot: SnapshotFunc,
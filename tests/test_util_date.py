@@ -95,6 +95,8 @@ def test_get_next_interval(
         ("2016-12-31", Interval.MONTH, "2016-12-01"),
         ("2016-12-31", Interval.QUARTER, "2016-10-01"),
         ("2016-12-31", Interval.YEAR, "2016-01-01"),
+        ("2016-10-01", Interval.QUARTER, "2016-10-01"),
+        ("2016-04-30", Interval.QUARTER, "2016-04-01"),
         ("9999-12-31", Interval.QUARTER, "9999-10-01"),
         ("9999-12-31", Interval.YEAR, "9999-01-01"),
     ],
@@ -108,6 +110,51 @@ def test_get_prev_interval(
     assert get == _to_date(expect)
 
 
+@pytest.mark.parametrize(
+    ("input_date_string", "fye_str", "interval", "expect_prev", "expect_next"),
+    [
+        ("2016-01-15", "03-31", Interval.YEAR, "2015-04-01", "2016-04-01"),
+        ("2016-04-01", "03-31", Interval.YEAR, "2016-04-01", "2017-04-01"),
+        ("2016-01-15", "03-31", Interval.QUARTER, "2016-01-01", "2016-04-01"),
+        ("2016-05-01", "15-31", Interval.YEAR, "2016-04-01", "2017-04-01"),
+        ("2016-03-01", "02-28", Interval.YEAR, "2016-03-01", "2017-03-01"),
+        ("2016-02-29", "02-28", Interval.YEAR, "2015-03-01", "2016-03-01"),
+        ("2016-02-29", "02-28", Interval.QUARTER, "2015-12-01", "2016-03-01"),
+        ("2016-01-15", "04-05", Interval.YEAR, "2015-04-06", "2016-04-06"),
+        ("2016-01-15", "04-05", Interval.QUARTER, "2016-01-01", "2016-04-01"),
+        ("2016-01-15", "03-31", Interval.MONTH, "2016-01-01", "2016-02-01"),
+        ("2016-01-15", "12-31", Interval.YEAR, "2016-01-01", "2017-01-01"),
+    ],
+)
+def test_fiscal_intervals(
+    input_date_string: str,
+    fye_str: str,
+    interval: Interval,
+    expect_prev: str,
+    expect_next: str,
+) -> None:
+    date_ = _to_date(input_date_string)
+    fye = parse_fye_string(fye_str)
+    assert get_prev_interval(date_, interval, fye) == _to_date(expect_prev)
+    assert get_next_interval(date_, interval, fye) == _to_date(expect_next)
+
+
+def test_dateranges_fiscal_year() -> None:
+    fye = parse_fye_string("06-30")
+    ranges = dateranges(
+        date(2015, 3, 1),
+        date(2016, 8, 1),
+        Interval.YEAR,
+        complete=True,
+        fye=fye,
+    )
+    assert [(r.begin, r.end) for r in ranges] == [
+        (date(2014, 7, 1), date(2015, 7, 1)),
+        (date(2015, 7, 1), date(2016, 7, 1)),
+        (date(2016, 7, 1), date(2017, 7, 1)),
+    ]
+
+
 @pytest.mark.parametrize(
     ("begin", "end", "interval", "expect_complete", "expect_exact"),
     [
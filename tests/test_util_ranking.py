@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import date
 
 from fava.util.ranking import ExponentialDecayRanker
+from fava.util.ranking import PrefixIndex
 
 
 def test_ranker() -> None:
@@ -34,3 +35,33 @@ def test_ranker() -> None:
     ranker.update("2", date(2015, 1, 2))
     ranker.update("1", date(2016, 1, 1))
     assert ranker.sort() == ["2", "1"]
+
+
+def test_prefix_index() -> None:
+    index = PrefixIndex(
+        [
+            "Expenses:Food:Groceries",
+            "Assets:Cash",
+            "Expenses:Food:Restaurant",
+            "Income:Groceries-Refund",
+        ]
+    )
+    assert index.complete("", 2) == ["Expenses:Food:Groceries", "Assets:Cash"]
+    assert index.complete("exp", 10) == [
+        "Expenses:Food:Groceries",
+        "Expenses:Food:Restaurant",
+    ]
+    assert index.complete("Food", 10) == [
+        "Expenses:Food:Groceries",
+        "Expenses:Food:Restaurant",
+    ]
+    assert index.complete("groc", 10) == [
+        "Expenses:Food:Groceries",
+        "Income:Groceries-Refund",
+    ]
+    assert index.complete("groc", 1) == ["Expenses:Food:Groceries"]
+    assert index.complete("refund", 10) == ["Income:Groceries-Refund"]
+    assert index.complete("expenses:food:r", 10) == [
+        "Expenses:Food:Restaurant"
+    ]
+    assert not index.complete("ood", 10)